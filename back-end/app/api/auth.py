@@ -1,27 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import Optional
 import jwt
-from passlib.context import CryptContext
 import traceback
 import logging
+import math
 import os
+import time
 
-from app.core.database import get_db
+from app.core import login_guard
+from app.core.cache_versions import PRINCIPALS, current_version_async
+from app.core.database import get_async_db
+from app.core.logging_config import log_event
+from app.core.principal_cache import principal_cache, token_cache, cache_stats
 from app.models.citizen import Citizen
+from app.utils.security import verify_password_async, HashingPoolBusy
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Journalisation structurée (configurée dans app.core.logging_config)
 logger = logging.getLogger(__name__)
 
 # Create a router object
 router = APIRouter(tags=["authentication"])
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -30,20 +33,6 @@ SECRET_KEY = "your-secret-key-change-this-in-production"  # Better to get from e
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password verification
-def verify_password(plain_password, hashed_password):
-    try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception as e:
-        logger.error(f"Password verification error: {str(e)}")
-        # If the password is not hashed (plain text in DB), do direct comparison
-        # WARNING: This is for testing only - in production, always use hashed passwords
-        return plain_password == hashed_password
-
-# Password hashing
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
 # Create JWT token
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     try:
@@ -63,31 +52,43 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         )
 
 # Authentication function
-def authenticate_user(db: Session, email: str, password: str):
+def _credentials_query(email: str):
+    # Admins et citoyens en une seule requête : (rôle, id, email, hash)
+    from app.models.admin import Admin
+    return union_all(
+        select(literal("admin").label("role"), Admin.id, Admin.email, Admin.password_hash)
+        .where(Admin.email == email),
+        select(literal("citizen").label("role"), Citizen.id, Citizen.email, Citizen.password_hash)
+        .where(Citizen.email == email),
+    )
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
     try:
-        # Check if admin table exists, and if so, try to authenticate as admin
         try:
-            # Import at function level to avoid import errors if table doesn't exist
-            from app.models.admin import Admin
-            
-            admin = db.query(Admin).filter(Admin.email == email).first()
-            logger.info(f"Admin lookup result for {email}: {'Found' if admin else 'Not found'}")
-            
-            if admin and verify_password(password, admin.password_hash):
-                return {"user": admin, "role": "admin"}
+            rows = (await db.execute(_credentials_query(email))).all()
         except Exception as e:
+            # Table admin absente : authentification des citoyens seulement
             logger.warning(f"Admin authentication attempt failed: {str(e)}")
-            # Continue to citizen authentication
+            await db.rollback()
+            result = await db.execute(
+                select(literal("citizen").label("role"), Citizen.id, Citizen.email, Citizen.password_hash)
+                .where(Citizen.email == email))
+            rows = result.all()
+        log_event(logger, "credentials lookup", logging.DEBUG, email=email, found=len(rows))
         
-        # Try to authenticate as citizen
-        citizen = db.query(Citizen).filter(Citizen.email == email).first()
-        logger.info(f"Citizen lookup result for {email}: {'Found' if citizen else 'Not found'}")
+        if not rows:
+            login_guard.remember_unknown(email)
+            return None
         
-        if citizen and verify_password(password, citizen.password_hash):
-            return {"user": citizen, "role": "citizen"}
+        # Admin d'abord, comme avant : au plus une vérification bcrypt par table
+        rows.sort(key=lambda row: row.role != "admin")
+        for row in rows:
+            if await verify_password_async(password, row.password_hash):
+                return {"user": row, "role": row.role}
         
-        # If not found in either table
         return None
+    except HashingPoolBusy:
+        raise
     except Exception as e:
         logger.error(f"Authentication error: {str(e)}\n{traceback.format_exc()}")
         return None
@@ -95,16 +96,31 @@ def authenticate_user(db: Session, email: str, password: str):
 # Login endpoint
 @router.post("/login")
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        logger.info(f"Login attempt for email: {form_data.username}")
+        log_event(logger, "login attempt", logging.DEBUG, email=form_data.username)
+        
+        # Tentatives en excès refusées avant la base et bcrypt
+        client_ip = request.client.host if request.client else None
+        retry_after = login_guard.admit(client_ip, form_data.username)
+        if retry_after:
+            log_event(logger, "login throttled", logging.WARNING, email=form_data.username, ip=client_ip)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please retry later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
         
-        user_info = authenticate_user(db, form_data.username, form_data.password)
+        if login_guard.is_unknown(form_data.username):
+            user_info = None
+        else:
+            user_info = await authenticate_user(db, form_data.username, form_data.password)
         
         if not user_info:
-            logger.warning(f"Failed login attempt for: {form_data.username}")
+            log_event(logger, "login failed", logging.WARNING, email=form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -127,7 +143,8 @@ async def login_for_access_token(
             expires_delta=access_token_expires
         )
         
-        logger.info(f"Successful login for: {form_data.username} with role: {role}")
+        login_guard.succeeded(form_data.username)
+        log_event(logger, "login succeeded", logging.INFO, email=form_data.username, role=role)
         
         return {
             "access_token": access_token,
@@ -138,6 +155,13 @@ async def login_for_access_token(
         }
     except HTTPException:
         raise
+    except HashingPoolBusy:
+        log_event(logger, "login rejected, hashing pool saturated", logging.WARNING, email=form_data.username)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         error_msg = f"Login error: {str(e)}\n{traceback.format_exc()}"
         logger.error(error_msg)
@@ -147,7 +171,7 @@ async def login_for_access_token(
         )
 
 # Get current user based on token
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     try:
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -155,7 +179,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             headers={"WWW-Authenticate": "Bearer"},
         )
         
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Jetons déjà vérifiés : pas de nouveau décodage tant qu'ils sont valides
+        payload = token_cache.get(token)
+        if payload is None:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            exp = payload.get("exp")
+            ttl = token_cache.ttl if exp is None else min(token_cache.ttl, exp - time.time())
+            if ttl > 0:
+                token_cache.set(token, payload, ttl=ttl)
         email: str = payload.get("sub")
         user_id: int = payload.get("id")
         role: str = payload.get("role")
@@ -164,24 +195,37 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             logger.warning("Token missing email claim")
             raise credentials_exception
         
-        logger.info(f"Token validation for user: {email}, role: {role}")
+        log_event(logger, "token validation", logging.DEBUG, email=email, role=role)
         
-        if role == "admin":
-            try:
-                from app.models.admin import Admin
-                user = db.query(Admin).filter(Admin.id == user_id).first()
-            except Exception:
-                logger.warning("Admin table not available")
-                raise credentials_exception
-        else:
-            user = db.query(Citizen).filter(Citizen.id == user_id).first()
+        cache_key = ("admin" if role == "admin" else "citizen", user_id)
+        # Entrée servie seulement si aucun worker n'a modifié d'utilisateur depuis son chargement
+        version = await current_version_async(db, PRINCIPALS)
+        cached = principal_cache.get(cache_key)
+        user = cached[0] if cached is not None and cached[1] == version else None
+        if user is None:
+            # Génération relevée avant la lecture : une invalidation concurrente
+            # (modification ou suppression) empêche de remettre l'utilisateur en cache
+            generation = principal_cache.generation
+            if role == "admin":
+                try:
+                    from app.models.admin import Admin
+                    user = await db.get(Admin, user_id)
+                except Exception:
+                    logger.warning("Admin table not available")
+                    raise credentials_exception
+            else:
+                user = await db.get(Citizen, user_id)
+            if user is not None:
+                principal_cache.set(cache_key, (user, version), generation=generation)
             
         if user is None:
-            logger.warning(f"User not found: {email}, role: {role}")
+            log_event(logger, "user not found", logging.WARNING, email=email, role=role)
             raise credentials_exception
             
         return {"user": user, "role": role}
         
+    except HTTPException:
+        raise
     except jwt.PyJWTError as e:
         logger.error(f"JWT error: {str(e)}")
         raise credentials_exception
@@ -210,4 +254,23 @@ async def read_users_me(current_user: dict = Depends(get_current_user)):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error retrieving user information: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+# Dépendance des routes réservées aux administrateurs
+async def require_admin(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
+
+# Compteurs des caches d'authentification
+@router.get("/cache-stats", dependencies=[Depends(require_admin)])
+async def read_auth_cache_stats():
+    return cache_stats()
+
+# Compteurs du contrôle d'admission de /auth/login
+@router.get("/login-stats", dependencies=[Depends(require_admin)])
+async def read_login_stats():
+    return login_guard.login_stats()
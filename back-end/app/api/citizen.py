@@ -1,28 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List  # Ajout de l'import manquant
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db, get_async_read_db
+from app.models.citizen import Citizen
 from app.schemas.citizen import CitizenOut, CitizenCreate, CitizenUpdate
 from app.crud.citizen import (
-    get_all_citizens,
-    create_citizen,
-    update_citizen,
-    get_citizen_by_id,
-    get_citizen_by_email,
-    delete_citizen as crud_delete_citizen
+    get_all_citizens_async,
+    create_citizen_async,
+    update_citizen_async,
+    get_citizen_by_id_async,
+    get_citizen_by_email_async,
+    delete_citizen_async
 )
-from app.models.citizen import Citizen
+from app.utils.fast_json import FastJSONResponse, rows_to_dicts
 
 router = APIRouter(prefix="/citizens", tags=["Citizens"])
 
+# Champs de CitizenOut dans l'ordre du schéma (le hash du mot de passe n'est pas lu)
+_OUT_FIELDS = tuple(CitizenOut.model_fields)
+_OUT_COLUMNS = [getattr(Citizen, name) for name in _OUT_FIELDS]
+
 @router.get("/", response_model=List[CitizenOut], summary="List all citizens")
 async def list_citizens(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     skip: int = 0,
     limit: int = 100
 ):
     try:
-        return get_all_citizens(db, skip=skip, limit=limit)
+        if settings.FAST_JSON_LISTS:
+            rows = await get_all_citizens_async(db, skip=skip, limit=limit, columns=_OUT_COLUMNS)
+            return FastJSONResponse(rows_to_dicts(rows, _OUT_FIELDS))
+        return await get_all_citizens_async(db, skip=skip, limit=limit)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -32,15 +41,15 @@ async def list_citizens(
 @router.post("/", response_model=CitizenOut, status_code=status.HTTP_201_CREATED)
 async def create_new_citizen(
     citizen_data: CitizenCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    if get_citizen_by_email(db, citizen_data.email):
+    if await get_citizen_by_email_async(db, citizen_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     try:
-        return create_citizen(db, citizen_data)
+        return await create_citizen_async(db, citizen_data)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -50,9 +59,9 @@ async def create_new_citizen(
 @router.get("/{citizen_id}", response_model=CitizenOut)
 async def get_citizen(
     citizen_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    citizen = get_citizen_by_id(db, citizen_id)
+    citizen = await get_citizen_by_id_async(db, citizen_id)
     if not citizen:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,10 +73,10 @@ async def get_citizen(
 async def update_existing_citizen(
     citizen_id: int,
     citizen_data: CitizenUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        return update_citizen(db, citizen_id, citizen_data)
+        return await update_citizen_async(db, citizen_id, citizen_data)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -77,9 +86,9 @@ async def update_existing_citizen(
 @router.delete("/{citizen_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_existing_citizen(
     citizen_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    if not crud_delete_citizen(db, citizen_id):
+    if not await delete_citizen_async(db, citizen_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Citizen not found"
@@ -1,39 +1,215 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.core.database import get_db
-from app.schemas.signalement import SignalementOut, SignalementCreate, SignalementUpdate
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from app.api.auth import require_admin
+from app.core.config import settings
+from app.core.database import get_db, get_read_db, may_be_stale, SessionLocal
+from app.schemas.signalement import (
+    SignalementOut,
+    SignalementNearbyOut,
+    SignalementCreate,
+    SignalementUpdate,
+    SignalementStatsOut,
+    SignalementBulkResult,
+    SignalementBatchTarget,
+    SignalementBatchUpdate,
+    SignalementBatchResult,
+    signalement_partial_schema
+)
 from app.crud.signalement import (
-    get_all_signalements,
+    get_signalements_page,
+    get_signalement,
+    get_signalement_version,
+    get_collection_version,
+    SignalementConflict,
+    iter_signalements,
     create_signalement,
     update_signalement,
-    search_signalements
+    delete_signalement as crud_delete_signalement,
+    bulk_insert_signalements,
+    batch_update_signalements,
+    batch_delete_signalements,
+    BATCH_UPDATE_FIELDS,
+    search_signalements,
+    nearby_signalements,
+    signalements_in_box,
+    get_duplicates,
+    get_archived_signalement,
+    iter_export_batches,
+    EXPORT_COLUMNS
 )
+from app.core.signalement_stats import signalement_stats
+from app.core.spatial_index import spatial_index
+from app.core.gazetteer import gazetteer
+from app.core.event_hub import event_hub, RESYNC
+from app.core.cache_versions import SIGNALEMENTS, current_version
+from app.core.response_cache import response_cache, search_cache_key, cache_stats as response_cache_stats
 from app.models.signalement import Signalement
+from app.utils.export import EXPORT_MEDIA_TYPES, csv_chunks, ndjson_chunks, parquet_chunks, parquet_available
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.fast_json import dumps as fast_dumps, rows_to_dicts
+from app.utils.conditional import collection_etag, resource_etag, http_date, is_not_modified, etag_matches
 
 router = APIRouter()
 
-# GET : récupérer tous les signalements
-@router.get("/", response_model=list[SignalementOut])
-def get_signalements(db: Session = Depends(get_db)):
-    return get_all_signalements(db)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 1000
+MAX_BULK_BATCH_SIZE = 10000
+EXPORT_BATCH_SIZE = 5000
+DEFAULT_NEARBY_RADIUS = 500
+MAX_NEARBY_RADIUS = 50000
+# Délai de reconnexion suggéré aux clients EventSource (millisecondes)
+STREAM_RETRY_MS = 3000
 
-# GET : rechercher des signalements
-@router.get("/search", response_model=list[SignalementOut])
-def search_signalements_endpoint(
-    db: Session = Depends(get_db),
-    titre: Optional[str] = Query(None, description="Rechercher par titre"),
-    ville: Optional[str] = Query(None, description="Rechercher par ville"),
-    categorie: Optional[str] = Query(None, description="Filtrer par catégorie"),
-    status: Optional[str] = Query(None, description="Filtrer par status"),
-    gravite: Optional[str] = Query(None, description="Filtrer par gravité"),
-    citizen_id: Optional[int] = Query(None, description="Filtrer par ID citoyen"),
-    description: Optional[str] = Query(None, description="Rechercher dans la description")
+_signalement_list = TypeAdapter(List[SignalementOut])
+
+# Champs de SignalementOut dans l'ordre du schéma, et colonnes lues pour les listes
+_OUT_FIELDS = tuple(SignalementOut.model_fields)
+_OUT_COLUMNS = [getattr(Signalement, name) for name in _OUT_FIELDS]
+
+FIELDS_DESCRIPTION = "Champs à renvoyer, séparés par des virgules (ex. id,titre,ville,status)"
+ARCHIVED_DESCRIPTION = "Inclure les signalements résolus archivés"
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Champs demandés par ?fields=, dans l'ordre du schéma (None : tous les champs)."""
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(_OUT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Champs inconnus : {', '.join(sorted(unknown))}")
+    return tuple(name for name in _OUT_FIELDS if name in requested)
+
+def _list_columns(selected: Optional[Tuple[str, ...]] = None):
+    if selected is None:
+        # Chemin rapide (FAST_JSON_LISTS) : tuples de colonnes au lieu d'instances ORM
+        return _OUT_COLUMNS if settings.FAST_JSON_LISTS else None
+    # Colonnes demandées, suivies de id et created_at (curseur, ordre de pertinence)
+    # s'ils n'en font pas partie : ils ne sont pas renvoyés
+    extra = [name for name in ("id", "created_at") if name not in selected]
+    return [getattr(Signalement, name) for name in selected + tuple(extra)]
+
+@lru_cache(maxsize=128)
+def _partial_list(selected: Tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(List[signalement_partial_schema(selected)])
+
+def _serialize_signalements(rows, selected: Optional[Tuple[str, ...]] = None) -> bytes:
+    """
+    Corps JSON d'une liste, mis en cache tel quel. Par défaut, les lignes sont
+    validées par pydantic : SignalementOut (instances ORM), ou le schéma partiel
+    des champs demandés avec ?fields= (tuples de colonnes). Avec FAST_JSON_LISTS,
+    les dicts de colonnes sont encodés directement par orjson, sans validation.
+    """
+    if settings.FAST_JSON_LISTS:
+        return fast_dumps(rows_to_dicts(rows, selected or _OUT_FIELDS))
+    if selected is not None:
+        adapter = _partial_list(selected)
+        return adapter.dump_json(adapter.validate_python(rows_to_dicts(rows, selected)))
+    return _signalement_list.dump_json(_signalement_list.validate_python(rows, from_attributes=True))
+
+def _validator_headers(etag, last_modified):
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+def _conditional_collection(request, db, key, search_params, load, include_archived=False):
+    """
+    Réponse JSON d'une liste avec ETag et Last-Modified. Un succès du cache
+    répond sans requête ; sinon une requête d'agrégat (nombre de lignes,
+    max(id), somme des versions, max(updated_at)) suffit à répondre 304
+    avant de charger les lignes.
+    load() renvoie le corps sérialisé et les en-têtes propres à la réponse.
+    Une réponse lue sur un réplica juste après une écriture n'est pas mise en cache.
+    Une entrée n'est servie que si la version partagée des signalements, relue
+    dans la session de la requête, est celle de son chargement (écritures des
+    autres workers).
+    """
+    version = current_version(db, SIGNALEMENTS)
+    cached = response_cache.get(key)
+    if cached is not None and cached[4] != version:
+        cached = None
+    if cached is None:
+        generation = response_cache.generation
+        fingerprint, last_modified = get_collection_version(db, search_params, include_archived)
+        etag = collection_etag(key, fingerprint)
+        if is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=_validator_headers(etag, last_modified))
+        body, headers = load()
+        cached = (body, {**headers, **_validator_headers(etag, last_modified)}, etag, last_modified, version)
+        if not may_be_stale(db):
+            response_cache.set(key, cached, generation=generation)
+
+    body, headers, etag, last_modified, _ = cached
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _stream_signalements_ndjson(include_archived=False):
+    # Session dédiée : elle doit vivre aussi longtemps que le flux de réponse
+    db = SessionLocal()
+    try:
+        for signalement in iter_signalements(db, batch_size=STREAM_BATCH_SIZE, include_archived=include_archived):
+            yield SignalementOut.model_validate(signalement).model_dump_json() + "\n"
+    finally:
+        db.close()
+
+# GET : récupérer les signalements (pagination par curseur ou flux NDJSON)
+@router.get("/", response_model=list[SignalementOut])
+def get_signalements(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Taille de la page"),
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé dans l'en-tête X-Next-Cursor"),
+    stream: bool = Query(False, description="Renvoyer tous les signalements en NDJSON"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include_archived: bool = Query(False, description=ARCHIVED_DESCRIPTION)
 ):
     """
-    Rechercher des signalements selon différents critères.
-    Tous les paramètres sont optionnels et peuvent être combinés.
+    Liste paginée des signalements, du plus récent au plus ancien.
+    Le curseur de la page suivante est renvoyé dans l'en-tête X-Next-Cursor.
+    Avec stream=true, tous les signalements sont envoyés en NDJSON.
+    Les pages sont servies depuis le cache des réponses jusqu'à la prochaine écriture
+    et portent un ETag : If-None-Match / If-Modified-Since donnent un 304.
+    Avec fields, seules ces colonnes sont lues et renvoyées (ex. fields=id,titre,ville).
+    Les signalements résolus archivés ne sont inclus qu'avec include_archived=true.
     """
+    if stream:
+        return StreamingResponse(_stream_signalements_ndjson(include_archived), media_type="application/x-ndjson")
+
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    selected = _parse_fields(fields)
+
+    def load():
+        rows, has_more = get_signalements_page(db, limit=limit, cursor=position, columns=_list_columns(selected),
+                                               include_archived=include_archived)
+        body = _serialize_signalements(rows, selected)
+        if has_more:
+            return body, {"X-Next-Cursor": encode_cursor(rows[-1].created_at, rows[-1].id)}
+        return body, {}
+
+    return _conditional_collection(request, db, ("list", limit, cursor, selected, include_archived), None, load,
+                                   include_archived)
+
+# GET : statistiques agrégées (compteurs maintenus en mémoire)
+@router.get("/stats", response_model=SignalementStatsOut)
+def get_signalements_stats():
+    """
+    Nombre de signalements par status, catégorie, gravité et ville.
+    Les compteurs sont tenus à jour à chaque écriture : temps de réponse constant.
+    """
+    return signalement_stats.snapshot()
+
+def _build_search_params(titre, ville, categorie, status, gravite, citizen_id, description, q):
     # Filtrer les paramètres None ou vides avant de les passer
     search_params = {}
     
@@ -51,8 +227,217 @@ def search_signalements_endpoint(
         search_params["citizen_id"] = citizen_id
     if description and description.strip():
         search_params["description"] = description.strip()
-    
-    return search_signalements(db, search_params)
+    if q and q.strip():
+        search_params["q"] = q.strip()
+    return search_params
+
+# Compteurs du cache des réponses (taux de succès, invalidations), administrateurs seulement
+@router.get("/cache-stats", dependencies=[Depends(require_admin)])
+def get_response_cache_stats():
+    return response_cache_stats()
+
+# GET : rechercher des signalements
+@router.get("/search", response_model=list[SignalementOut])
+def search_signalements_endpoint(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    titre: Optional[str] = Query(None, description="Rechercher par titre"),
+    ville: Optional[str] = Query(None, description="Rechercher par ville"),
+    categorie: Optional[str] = Query(None, description="Filtrer par catégorie"),
+    status: Optional[str] = Query(None, description="Filtrer par status"),
+    gravite: Optional[str] = Query(None, description="Filtrer par gravité"),
+    citizen_id: Optional[int] = Query(None, description="Filtrer par ID citoyen"),
+    description: Optional[str] = Query(None, description="Rechercher dans la description"),
+    q: Optional[str] = Query(None, description="Recherche plein texte sur tous les champs"),
+    skip: int = Query(0, ge=0, description="Nombre de résultats à sauter"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Nombre maximum de résultats"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include_archived: bool = Query(False, description=ARCHIVED_DESCRIPTION)
+):
+    """
+    Rechercher des signalements selon différents critères.
+    Tous les paramètres sont optionnels et peuvent être combinés.
+    q cherche dans tous les champs ; titre, ville et description dans leur seul champ,
+    par préfixe de mot (ex. titre=tro trouve « Trou »), sans tenir compte des accents.
+    Avec un critère textuel, les résultats sont classés par pertinence ; sinon par date.
+    Les résultats sont servis depuis le cache des réponses jusqu'à la prochaine écriture
+    et portent un ETag : If-None-Match / If-Modified-Since donnent un 304.
+    Avec fields, seules ces colonnes sont lues et renvoyées (ex. fields=id,titre,ville).
+    Avec include_archived=true, les signalements archivés sont aussi cherchés
+    (en SQL, triés par date : l'index plein texte ne couvre que la table courante).
+    """
+    search_params = _build_search_params(titre, ville, categorie, status, gravite,
+                                         citizen_id, description, q)
+    selected = _parse_fields(fields)
+
+    def load():
+        rows = search_signalements(db, search_params, skip=skip, limit=limit, columns=_list_columns(selected),
+                                   include_archived=include_archived)
+        return _serialize_signalements(rows, selected), {}
+
+    return _conditional_collection(request, db,
+                                   search_cache_key(search_params, skip, limit, selected, include_archived),
+                                   search_params, load, include_archived)
+
+# GET : signalements proches d'un point, d'un lieu connu ou dans un rectangle
+@router.get("/nearby", response_model=list[SignalementNearbyOut])
+def nearby_signalements_endpoint(
+    db: Session = Depends(get_read_db),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude du centre"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Longitude du centre"),
+    place: Optional[str] = Query(None, description="Lieu connu (ou ville) servant de centre"),
+    ville: Optional[str] = Query(None, description="Ville du lieu"),
+    radius: float = Query(DEFAULT_NEARBY_RADIUS, gt=0, le=MAX_NEARBY_RADIUS, description="Rayon en mètres"),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Nombre maximum de résultats"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """
+    Rechercher les signalements géolocalisés :
+    - autour d'un centre (lat/lon, ou place et éventuellement ville) dans un rayon
+      en mètres, du plus proche au plus lointain, avec leur distance (distance_m) ;
+    - ou dans un rectangle (min_lat, min_lon, max_lat, max_lon), plus récents d'abord.
+    Le nombre total de signalements trouvés est renvoyé dans X-Total-Count.
+    """
+    box = (min_lat, min_lon, max_lat, max_lon)
+    if lat is None and lon is None and place is None and ville is not None:
+        # Ville seule : recherche autour du centre-ville
+        place = ""
+    if all(v is not None for v in box):
+        if min_lat > max_lat or min_lon > max_lon:
+            raise HTTPException(status_code=400, detail="Rectangle invalide : min_lat/min_lon doivent précéder max_lat/max_lon")
+    elif any(v is not None for v in box):
+        raise HTTPException(status_code=400, detail="Le rectangle demande min_lat, min_lon, max_lat et max_lon")
+    elif place is not None:
+        point = gazetteer.locate(place, ville)
+        if point is None:
+            raise HTTPException(status_code=404, detail="Lieu inconnu")
+        lat, lon = point
+    elif lat is None or lon is None:
+        raise HTTPException(status_code=400, detail="Indiquer lat et lon, place ou un rectangle")
+    if not spatial_index.ready:
+        raise HTTPException(status_code=503, detail="Index spatial en cours de construction")
+
+    selected = _parse_fields(fields)
+    names = selected or _OUT_FIELDS
+    columns = _list_columns(selected) or _OUT_COLUMNS
+    if box[0] is not None:
+        total, rows = signalements_in_box(db, *box, limit=limit, columns=columns)
+        items = rows_to_dicts(rows, names)
+    else:
+        total, matches = nearby_signalements(db, lat, lon, radius, limit=limit, columns=columns)
+        items = rows_to_dicts([row for row, _ in matches], names)
+        for item, (_, distance) in zip(items, matches):
+            item["distance_m"] = round(distance, 1)
+    return Response(content=fast_dumps(items), media_type="application/json",
+                    headers={"X-Total-Count": str(total)})
+
+def _split_values(value: Optional[str]) -> Optional[List[str]]:
+    values = [v.strip() for v in (value or "").split(",") if v.strip()]
+    return values or None
+
+async def _signalement_events(filters, last_event_id):
+    # Abonnement pris au démarrage du flux, libéré à la déconnexion du client
+    subscription, backlog = event_hub.subscribe(filters, last_event_id)
+    last_seq = 0
+    try:
+        # Délai de reconnexion, puis reprise (ou resync) et flux en direct
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        if backlog is None:
+            yield f"event: {RESYNC}\ndata: {{}}\n\n"
+        for event in backlog or ():
+            last_seq = event.seq
+            yield event_hub.sse_frame(event)
+        while True:
+            try:
+                item = await asyncio.wait_for(subscription.queue.get(), settings.STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Commentaire SSE : garde la connexion ouverte à travers les proxys
+                yield ": keepalive\n\n"
+                continue
+            if item is RESYNC:
+                yield f"event: {RESYNC}\ndata: {{}}\n\n"
+            elif item.seq > last_seq:
+                # Un événement de la reprise peut aussi arriver par la file
+                last_seq = item.seq
+                yield event_hub.sse_frame(item)
+    finally:
+        event_hub.unsubscribe(subscription)
+
+# GET : flux en direct des signalements créés, modifiés et supprimés (Server-Sent Events)
+@router.get("/stream")
+async def stream_signalements(
+    ville: Optional[str] = Query(None, description="Villes suivies, séparées par des virgules"),
+    categorie: Optional[str] = Query(None, description="Catégories suivies, séparées par des virgules"),
+    gravite: Optional[str] = Query(None, description="Gravités suivies, séparées par des virgules"),
+    last_event_id: Optional[str] = Header(None, description="Dernier événement reçu (reprise du flux)")
+):
+    """
+    Flux text/event-stream remplaçant le rafraîchissement périodique des listes.
+    Événements : created et updated (signalement complet), deleted (id, ville,
+    catégorie, gravité) et resync (des événements ont été perdus : recharger la liste).
+    Après une déconnexion, EventSource renvoie Last-Event-ID et les événements
+    manqués sont rejoués tant qu'ils sont encore gardés en mémoire.
+    """
+    filters = {"ville": _split_values(ville), "categorie": _split_values(categorie),
+               "gravite": _split_values(gravite)}
+    return StreamingResponse(
+        _signalement_events(filters, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _stream_export(search_params, export_format, include_archived=False):
+    # Session dédiée : elle doit vivre aussi longtemps que le flux de réponse
+    db = SessionLocal()
+    try:
+        batches = iter_export_batches(db, search_params, batch_size=EXPORT_BATCH_SIZE,
+                                      include_archived=include_archived)
+        if export_format == "parquet":
+            columns = [Signalement.__table__.c[name] for name in EXPORT_COLUMNS]
+            yield from parquet_chunks(batches, columns)
+        elif export_format == "ndjson":
+            yield from ndjson_chunks(batches, EXPORT_COLUMNS)
+        else:
+            yield from csv_chunks(batches, EXPORT_COLUMNS)
+    finally:
+        db.close()
+
+# GET : exporter les signalements (CSV, NDJSON ou Parquet) en flux
+@router.get("/export")
+def export_signalements(
+    format: str = Query("csv", description="csv, ndjson ou parquet"),
+    titre: Optional[str] = Query(None, description="Rechercher par titre"),
+    ville: Optional[str] = Query(None, description="Rechercher par ville"),
+    categorie: Optional[str] = Query(None, description="Filtrer par catégorie"),
+    status: Optional[str] = Query(None, description="Filtrer par status"),
+    gravite: Optional[str] = Query(None, description="Filtrer par gravité"),
+    citizen_id: Optional[int] = Query(None, description="Filtrer par ID citoyen"),
+    description: Optional[str] = Query(None, description="Rechercher dans la description"),
+    q: Optional[str] = Query(None, description="Recherche plein texte sur tous les champs"),
+    include_archived: bool = Query(False, description=ARCHIVED_DESCRIPTION)
+):
+    """
+    Exporter tous les signalements correspondant aux critères de /search,
+    du plus récent au plus ancien. Les lignes sont lues par lots via un curseur
+    côté serveur et envoyées en réponse chunked : mémoire constante quel que
+    soit le nombre de lignes.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Format d'export invalide (csv, ndjson ou parquet)")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Export Parquet indisponible : pyarrow n'est pas installé")
+
+    search_params = _build_search_params(titre, ville, categorie, status, gravite,
+                                         citizen_id, description, q)
+    return StreamingResponse(
+        _stream_export(search_params, format, include_archived),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="signalements.{format}"'}
+    )
 
 # POST : créer un signalement
 @router.post("/", response_model=SignalementOut)
@@ -68,25 +453,193 @@ def create_signalement_endpoint(
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
+async def _iter_bulk_items(request: Request):
+    """Éléments du corps : tableau JSON, ou une ligne JSON par élément (NDJSON)."""
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+        return
+    try:
+        items = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Corps JSON invalide")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Un tableau JSON de signalements est attendu")
+    for item in items:
+        yield item
+
+def _validate_bulk_item(item):
+    if isinstance(item, (bytes, str)):
+        # Analyse et validation en une passe pour les lignes NDJSON
+        signalement = SignalementCreate.model_validate_json(item)
+    else:
+        signalement = SignalementCreate.model_validate(item)
+    if signalement.citizen_id <= 0:
+        raise ValueError("citizen_id invalide")
+    return signalement.model_dump(mode="json")
+
+# POST : import en masse (tableau JSON ou flux NDJSON)
+@router.post("/bulk", response_model=SignalementBulkResult)
+async def bulk_create_signalements_endpoint(
+    request: Request,
+    db: Session = Depends(get_db),
+    batch_size: int = Query(None, ge=1, le=MAX_BULK_BATCH_SIZE, description="Lignes par transaction")
+):
+    """
+    Importer des signalements en masse. Le corps est un tableau JSON ou un flux
+    NDJSON (Content-Type: application/x-ndjson). Les lignes sont validées puis
+    insérées par lots ; les lignes invalides sont rapportées sans bloquer les autres.
+    """
+    batch_size = batch_size or settings.BULK_BATCH_SIZE
+    received = 0
+    inserted = 0
+    errors = []
+    batch = []
+
+    async for item in _iter_bulk_items(request):
+        index = received
+        received += 1
+        try:
+            batch.append((index, _validate_bulk_item(item)))
+        except ValidationError as e:
+            errors.append({"index": index, "errors": [
+                ": ".join(filter(None, (".".join(str(p) for p in err["loc"]), err["msg"])))
+                for err in e.errors()
+            ]})
+        except ValueError as e:
+            errors.append({"index": index, "errors": [str(e)]})
+        if len(batch) >= batch_size:
+            count, batch_errors = await run_in_threadpool(bulk_insert_signalements, db, batch)
+            inserted += count
+            errors.extend(batch_errors)
+            batch = []
+
+    if batch:
+        count, batch_errors = await run_in_threadpool(bulk_insert_signalements, db, batch)
+        inserted += count
+        errors.extend(batch_errors)
+
+    errors.sort(key=lambda e: e["index"])
+    return {"received": received, "inserted": inserted, "failed": len(errors), "errors": errors}
+
+def _batch_search_params(target: SignalementBatchTarget):
+    """Critères de recherche d'une opération groupée (None si la cible est une liste d'ids)."""
+    if target.ids is not None:
+        return None
+    search_params = _build_search_params(**target.filters.model_dump())
+    if not search_params:
+        raise HTTPException(status_code=400, detail="Au moins un critère de filtre est requis")
+    return search_params
+
+# PATCH : modifier le status et/ou la gravité de plusieurs signalements
+@router.patch("/batch", response_model=SignalementBatchResult, dependencies=[Depends(require_admin)])
+def batch_update_signalements_endpoint(batch: SignalementBatchUpdate, db: Session = Depends(get_db)):
+    """
+    Modifier status et/ou gravite des signalements listés (ids) ou
+    correspondant aux critères de recherche (filters), en une transaction.
+    Les lignes sont modifiées par tranches de BATCH_CHUNK_SIZE ids.
+    """
+    search_params = _batch_search_params(batch)
+    values = batch.model_dump(mode="json", include=set(BATCH_UPDATE_FIELDS), exclude_none=True)
+    affected, not_found = batch_update_signalements(db, values, ids=batch.ids, search_params=search_params)
+    return {"affected": affected, "not_found": not_found}
+
+# POST : supprimer plusieurs signalements
+@router.post("/batch-delete", response_model=SignalementBatchResult, dependencies=[Depends(require_admin)])
+def batch_delete_signalements_endpoint(target: SignalementBatchTarget, db: Session = Depends(get_db)):
+    """
+    Supprimer les signalements listés (ids) ou correspondant aux critères de
+    recherche (filters), en une transaction, par tranches de BATCH_CHUNK_SIZE ids.
+    """
+    search_params = _batch_search_params(target)
+    affected, not_found = batch_delete_signalements(db, ids=target.ids, search_params=search_params)
+    return {"affected": affected, "not_found": not_found}
+
 # DELETE : supprimer un signalement
 @router.delete("/{id}", response_model=dict)
 def delete_signalement(id: int, db: Session = Depends(get_db)):
-    signalement = db.query(Signalement).filter(Signalement.id == id).first()
+    if not crud_delete_signalement(db, id):
+        raise HTTPException(status_code=404, detail="Signalement non trouvé")
+    return {"message": f"Signalement avec ID {id} supprimé avec succès"}
+
+# GET : récupérer un signalement (requêtes conditionnelles)
+@router.get("/{id}", response_model=SignalementOut)
+def get_signalement_endpoint(
+    id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    include_archived: bool = Query(False, description=ARCHIVED_DESCRIPTION)
+):
+    """
+    Détail d'un signalement avec ETag et Last-Modified. Si le client a déjà
+    la version courante, le 304 est calculé sans charger la ligne.
+    Avec include_archived=true, un signalement archivé est lu dans l'archive.
+    """
+    version = get_signalement_version(db, id)
+    archived = None
+    if version is None and include_archived:
+        version = archived = get_archived_signalement(db, id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Signalement non trouvé")
+    etag = resource_etag(id, version.version)
+    if is_not_modified(request, etag, version.updated_at):
+        return Response(status_code=304, headers=_validator_headers(etag, version.updated_at))
+
+    signalement = archived or get_signalement(db, id)
     if not signalement:
         raise HTTPException(status_code=404, detail="Signalement non trouvé")
+    return Response(
+        content=SignalementOut.model_validate(signalement).model_dump_json(),
+        media_type="application/json",
+        headers=_validator_headers(resource_etag(id, signalement.version), signalement.updated_at)
+    )
 
-    db.delete(signalement)
-    db.commit()
-    return {"message": f"Signalement avec ID {id} supprimé avec succès"}
+# GET : doublons rattachés à un signalement
+@router.get("/{id}/duplicates", response_model=list[SignalementOut])
+def get_signalement_duplicates(
+    id: int,
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """
+    Signalements détectés à la création comme quasi-doublons de celui-ci
+    (même ville, même catégorie, texte proche), du plus ancien au plus récent.
+    """
+    if get_signalement_version(db, id) is None:
+        raise HTTPException(status_code=404, detail="Signalement non trouvé")
+    selected = _parse_fields(fields)
+    rows = get_duplicates(db, id, columns=_list_columns(selected))
+    return Response(content=_serialize_signalements(rows, selected), media_type="application/json")
 
 # PUT : mettre à jour un signalement
 @router.put("/{id}", response_model=SignalementOut)
 def update_signalement_endpoint(
     id: int,
     update_data: SignalementUpdate,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_db),
+    if_match: Optional[str] = Header(None, description="ETag attendu (concurrence optimiste)")
 ):
-    updated = update_signalement(db, id, update_data.dict(exclude_unset=True))
+    """
+    Mettre à jour un signalement. Avec If-Match, la modification n'est
+    appliquée que si l'ETag courant correspond (sinon 412).
+    """
+    precondition = None
+    if if_match is not None:
+        precondition = lambda current: etag_matches(if_match, resource_etag(current.id, current.version))
+    try:
+        updated = update_signalement(db, id, update_data.model_dump(exclude_unset=True), precondition=precondition)
+    except SignalementConflict:
+        raise HTTPException(status_code=412, detail="Le signalement a été modifié entre-temps")
     if not updated:
         raise HTTPException(status_code=404, detail="Signalement non trouvé")
+    response.headers["ETag"] = resource_etag(updated.id, updated.version)
     return updated
\ No newline at end of file
@@ -0,0 +1,67 @@
+# app/core/cache_versions.py
+"""
+Invalidation des caches locaux entre processus (plusieurs workers uvicorn).
+
+Chaque cache a une ligne dans cache_versions. Le processus qui écrit vide son
+cache puis incrémente la version, juste après le commit et avant de répondre ;
+une entrée est gardée avec la version lue avant le chargement des données, et
+un succès du cache n'est servi que si la version courante, relue dans la même
+session, n'a pas changé. Un succès coûte donc une lecture par clé primaire,
+au lieu des requêtes qu'il évite ; aucune écriture terminée n'est masquée par
+le cache d'un autre worker.
+"""
+
+from typing import Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import async_engine, engine
+from app.models.cache_version import CacheVersion
+
+SIGNALEMENTS = "signalements"
+PRINCIPALS = "principals"
+
+_table = CacheVersion.__table__
+
+
+def _version_query(name: str):
+    return select(_table.c.version).where(_table.c.name == name)
+
+
+def _bump_statement(name: str):
+    return update(_table).where(_table.c.name == name).values(version=_table.c.version + 1)
+
+
+def current_version(db: Session, name: str) -> Optional[int]:
+    return db.execute(_version_query(name)).scalar()
+
+
+async def current_version_async(db: AsyncSession, name: str) -> Optional[int]:
+    return (await db.execute(_version_query(name))).scalar()
+
+
+def bump(name: str):
+    """Incrémenter la version (transaction courte sur le primaire, après le commit de l'écriture)."""
+    with engine.begin() as connection:
+        if connection.execute(_bump_statement(name)).rowcount:
+            return
+        # Ligne absente (base créée sans la migration 0009)
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(_table).values(name=name, version=1))
+        except IntegrityError:
+            connection.execute(_bump_statement(name))
+
+
+async def bump_async(name: str):
+    async with async_engine.begin() as connection:
+        if (await connection.execute(_bump_statement(name))).rowcount:
+            return
+        try:
+            async with connection.begin_nested():
+                await connection.execute(insert(_table).values(name=name, version=1))
+        except IntegrityError:
+            await connection.execute(_bump_statement(name))
@@ -1,12 +1,28 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
 import os
 from pathlib import Path
+from typing import List, Optional
 
 # Chemin absolu vers le .env
 env_path = Path(__file__).resolve().parents[2] / ".env"
 load_dotenv(dotenv_path=env_path)
 
+# Pilote asynchrone correspondant à chaque pilote synchrone
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def async_url(database_url: str) -> str:
+    """URL équivalente avec le pilote asynchrone (aiomysql / aiosqlite)."""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
 class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: str
@@ -16,11 +32,121 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # URL complète optionnelle (ex. sqlite:///./local.db), prioritaire sur les DB_*
+    DB_URL: Optional[str] = None
+    # Pool de connexions de chaque moteur (primaire et réplicas)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_TIMEOUT: float = 30.0
+    # Connexions ouvertes d'avance au démarrage, par moteur (0 = ouverture à la demande)
+    DB_POOL_PREWARM: int = 2
+    # Démarrer les processus du pool bcrypt au démarrage plutôt qu'à la première connexion
+    HASH_POOL_PREWARM: bool = True
+    # Réplicas en lecture seule (URLs séparées par des virgules) pour les routes GET,
+    # et durée pendant laquelle un client qui vient d'écrire lit sur le primaire
+    DB_REPLICA_URLS: str = ""
+    REPLICA_STICKY_SECONDS: float = 5.0
+    # Pool de processus pour bcrypt (0 = nombre de CPU / 4 x la taille du pool)
+    HASH_POOL_SIZE: int = 0
+    HASH_MAX_PENDING: int = 0
+    HASH_QUEUE_TIMEOUT: float = 5.0
+    # Caches de get_current_user (taille max, durée de vie en secondes)
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL: float = 60.0
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: float = 300.0
+    # Admission de /auth/login avant la base et bcrypt : seaux à jetons par adresse IP
+    # et par email (rafale, tentatives par minute), nombre max de seaux gardés et
+    # fragments ; emails inconnus mémorisés (taille, durée de vie en secondes : un compte
+    # créé par un autre worker peut être refusé pendant cette durée, d'où sa brièveté)
+    LOGIN_ADMISSION: bool = True
+    LOGIN_IP_BURST: int = 20
+    LOGIN_IP_PER_MINUTE: float = 60.0
+    LOGIN_EMAIL_BURST: int = 10
+    LOGIN_EMAIL_PER_MINUTE: float = 10.0
+    LOGIN_BUCKETS_SIZE: int = 100000
+    LOGIN_BUCKET_SHARDS: int = 16
+    LOGIN_UNKNOWN_EMAIL_SIZE: int = 100000
+    LOGIN_UNKNOWN_EMAIL_TTL: float = 10.0
+    # Intervalle (secondes) de recalage des compteurs de /signalements/stats
+    STATS_RECONCILE_INTERVAL: float = 300.0
+    # Intervalle (secondes) de report dans les index en mémoire (plein texte,
+    # spatial, doublons) des écritures des autres workers ; 0 = désactivé (un seul worker)
+    INDEX_REFRESH_INTERVAL: float = 30.0
+    # Nombre de lignes par transaction pour POST /signalements/bulk
+    BULK_BATCH_SIZE: int = 1000
+    # Ids par UPDATE / DELETE de PATCH /signalements/batch et POST /signalements/batch-delete
+    BATCH_CHUNK_SIZE: int = 1000
+    # Cache des réponses de liste et de recherche des signalements
+    RESPONSE_CACHE_SIZE: int = 1000
+    RESPONSE_CACHE_TTL: float = 30.0
+    # Listes (signalements, recherche, citoyens) sérialisées sans pydantic : colonnes -> dicts -> orjson.
+    # Désactivé par défaut : les lignes sont validées par le response_model (ou le schéma
+    # partiel de ?fields=) ; à activer après comparaison des corps (benchmarks/list_serialization.py)
+    FAST_JSON_LISTS: bool = False
+    # Quasi-doublons à la création : similarité minimale (0-1) pour rattacher un
+    # signalement à un autre de la même ville et catégorie, signatures gardées en mémoire
+    DUPLICATE_DETECTION: bool = True
+    DUPLICATE_THRESHOLD: float = 0.6
+    DUPLICATE_INDEX_SIZE: int = 20000
+    # Flux /signalements/stream : événements gardés pour la reprise (Last-Event-ID),
+    # file maximale par abonné avant resync, intervalle des commentaires keepalive
+    STREAM_REPLAY_SIZE: int = 1000
+    STREAM_QUEUE_SIZE: int = 100
+    STREAM_KEEPALIVE_SECONDS: float = 15.0
+    # Tâches de fond (table jobs) : threads de traitement du processus (0 = aucun),
+    # tâches réclamées par lot, attente entre deux lectures de la file, bail d'une
+    # tâche réclamée, essais et délais de reprise (doublés à chaque échec)
+    JOB_WORKERS: int = 2
+    JOB_BATCH_SIZE: int = 20
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_LEASE_SECONDS: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_DELAY: float = 2.0
+    JOB_RETRY_MAX_DELAY: float = 600.0
+    # Conservation des tâches terminées, rafraîchissement des métriques de la file
+    JOB_RETENTION_SECONDS: float = 86400.0
+    JOB_METRICS_INTERVAL: float = 15.0
+    # Archivage des signalements résolus (tâche de fond) : âge en jours depuis la
+    # dernière modification, lignes déplacées par lot, pause entre deux lots pendant
+    # un rattrapage, intervalle (secondes) entre deux passages une fois à jour
+    ARCHIVE_ENABLED: bool = True
+    ARCHIVE_AFTER_DAYS: float = 365.0
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_BATCH_PAUSE: float = 1.0
+    ARCHIVE_INTERVAL: float = 3600.0
+    # Fichier CSV du géocodage hors ligne (défaut : back-end/data/gazetteer.csv)
+    GAZETTEER_PATH: Optional[str] = None
+    # Middleware de métriques et route /metrics (format Prometheus)
+    METRICS_ENABLED: bool = True
+    # Journalisation : niveau, format (text ou json), taille de la file d'écriture
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+    LOG_QUEUE_SIZE: int = 10000
+    # Journal SQL : echo SQLAlchemy (débogage uniquement), échantillonnage des
+    # requêtes normales, seuil des requêtes lentes et capture de leur EXPLAIN
+    SQL_ECHO: bool = False
+    SQL_LOG_SAMPLE_RATE: float = 0.01
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_EXPLAIN_SLOW_QUERIES: bool = True
+    SQL_EXPLAIN_INTERVAL: float = 60.0
+    SQL_LOG_PARAMETERS: bool = False
 
     @property
     def DATABASE_URL(self) -> str:
+        if self.DB_URL:
+            return self.DB_URL
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return async_url(self.DATABASE_URL)
+
+    @property
+    def REPLICA_URLS(self) -> List[str]:
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
     class Config:
         case_sensitive = True
 
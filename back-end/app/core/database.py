@@ -1,23 +1,295 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import settings
+from app.core.config import settings, async_url
+from app.core.logging_config import log_event
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=True,  # Définir sur False en production
-    pool_pre_ping=True  # Vérifie la connexion avant utilisation
-)
+logger = logging.getLogger(__name__)
+
+def _engine_options(url: str) -> dict:
+    options = {
+        "echo": settings.SQL_ECHO,  # Journal SQL : voir app.core.logging_config
+        "pool_pre_ping": True  # Vérifie la connexion avant utilisation
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # Base en mémoire : pool à connexion unique, rien à dimensionner
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+    return options
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Moteur asynchrone (aiomysql / aiosqlite) pour les routes async def
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    **_engine_options(settings.ASYNC_DATABASE_URL)
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Réplicas en lecture seule : un moteur synchrone et un asynchrone par URL.
+# session.info["replica"] porte l'indice du réplica.
+replica_engines = []
+async_replica_engines = []
+ReplicaSessionLocals = []
+AsyncReplicaSessionLocals = []
+for _index, _url in enumerate(settings.REPLICA_URLS):
+    replica_engines.append(create_engine(_url, **_engine_options(_url)))
+    async_replica_engines.append(create_async_engine(async_url(_url), **_engine_options(async_url(_url))))
+    ReplicaSessionLocals.append(sessionmaker(
+        autocommit=False, autoflush=False, bind=replica_engines[-1], info={"replica": _index}
+    ))
+    AsyncReplicaSessionLocals.append(async_sessionmaker(
+        bind=async_replica_engines[-1], class_=AsyncSession, autoflush=False,
+        expire_on_commit=False, info={"replica": _index}
+    ))
+
+# Un réplica injoignable est écarté pendant cet intervalle (secondes)
+REPLICA_RETRY_INTERVAL = 30.0
+STICKY_COOKIE = "db_primary_until"
+
+_replica_counter = itertools.count()
+_replica_down_until = [0.0] * len(replica_engines)
+_last_write = float("-inf")
+
 Base = declarative_base()
 
+
+class _RequestRouting:
+    __slots__ = ("sticky", "wrote")
+
+    def __init__(self, sticky: bool):
+        self.sticky = sticky
+        self.wrote = False
+
+
+# Routage de la requête HTTP en cours (partagé avec le pool de threads des
+# routes synchrones, comme les compteurs de app.core.metrics)
+_request_routing: ContextVar[Optional[_RequestRouting]] = ContextVar("request_routing", default=None)
+
+_WRITE_STATEMENTS = {"INSERT", "UPDATE", "DELETE", "REPLACE"}
+
+
+def record_write():
+    """Noter une écriture validée sur le primaire (processus et requête en cours)."""
+    global _last_write
+    _last_write = time.monotonic()
+    routing = _request_routing.get()
+    if routing is not None:
+        routing.wrote = True
+
+
+def _track_writes(sync_engine):
+    # Une transaction est une écriture si elle a exécuté un INSERT/UPDATE/DELETE
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        words = statement.split(None, 1)
+        if words and words[0].upper() in _WRITE_STATEMENTS:
+            conn.info["wrote"] = True
+
+    @event.listens_for(sync_engine, "commit")
+    def _commit(conn):
+        if conn.info.pop("wrote", False):
+            record_write()
+
+    @event.listens_for(sync_engine, "rollback")
+    def _rollback(conn):
+        conn.info.pop("wrote", None)
+
+
+if replica_engines:
+    _track_writes(engine)
+    _track_writes(async_engine.sync_engine)
+
+
+def may_be_stale(db) -> bool:
+    """
+    Vrai si db lit un réplica alors qu'une écriture de ce processus date de
+    moins de REPLICA_STICKY_SECONDS : le réplica ne l'a peut-être pas encore reçue.
+    """
+    if db.info.get("replica") is None:
+        return False
+    return time.monotonic() - _last_write < settings.REPLICA_STICKY_SECONDS
+
+
+def _pick_replica() -> Optional[int]:
+    """Réplica suivant (tourniquet), ou None si la lecture doit aller au primaire."""
+    if not replica_engines:
+        return None
+    routing = _request_routing.get()
+    if routing is not None and (routing.sticky or routing.wrote):
+        return None
+    now = time.monotonic()
+    start = next(_replica_counter)
+    for offset in range(len(replica_engines)):
+        index = (start + offset) % len(replica_engines)
+        if _replica_down_until[index] <= now:
+            return index
+    return None
+
+
+def _replica_unavailable(index: int, error: Exception):
+    _replica_down_until[index] = time.monotonic() + REPLICA_RETRY_INTERVAL
+    log_event(logger, "replica unavailable", logging.WARNING, replica=index, error=str(error))
+
+
 # Fonction utilitaire pour obtenir une session de base de données
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Équivalent asynchrone de get_db, à utiliser dans les routes async def
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _open_read_session():
+    # Un réplica injoignable est écarté : le suivant est essayé, puis le primaire
+    while (index := _pick_replica()) is not None:
+        db = ReplicaSessionLocals[index]()
+        try:
+            db.connection()
+            return db
+        except OperationalError as e:
+            db.close()
+            _replica_unavailable(index, e)
+    return SessionLocal()
+
+async def _open_async_read_session():
+    while (index := _pick_replica()) is not None:
+        db = AsyncReplicaSessionLocals[index]()
+        try:
+            await db.connection()
+            return db
+        except OperationalError as e:
+            await db.close()
+            _replica_unavailable(index, e)
+    return AsyncSessionLocal()
+
+# Session en lecture seule pour les routes GET : un réplica si configuré, sinon
+# le primaire (aussi pour un client qui vient d'écrire, ou si le réplica est injoignable)
+def get_read_db():
+    db = _open_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Équivalent asynchrone de get_read_db
+async def get_async_read_db():
+    db = await _open_async_read_session()
+    async with db:
+        yield db
+
+
+def _prewarm_count() -> int:
+    return max(0, min(settings.DB_POOL_PREWARM, settings.DB_POOL_SIZE))
+
+def prewarm_pools() -> int:
+    """
+    Ouvrir DB_POOL_PREWARM connexions sur le primaire et les réplicas synchrones
+    puis les rendre au pool. Retourne le nombre de connexions ouvertes.
+    """
+    opened = 0
+    for target in [engine] + replica_engines:
+        connections = []
+        try:
+            for _ in range(_prewarm_count()):
+                connections.append(target.connect())
+        except OperationalError as e:
+            log_event(logger, "pool prewarm failed", logging.WARNING, engine=str(target.url), error=str(e))
+        finally:
+            opened += len(connections)
+            for connection in connections:
+                connection.close()
+    return opened
+
+async def prewarm_async_pools() -> int:
+    """Équivalent de prewarm_pools pour les moteurs asynchrones."""
+    opened = 0
+    for target in [async_engine] + async_replica_engines:
+        connections = []
+        try:
+            for _ in range(_prewarm_count()):
+                connections.append(await target.connect())
+        except OperationalError as e:
+            log_event(logger, "pool prewarm failed", logging.WARNING, engine=str(target.url), error=str(e))
+        finally:
+            opened += len(connections)
+            for connection in connections:
+                await connection.close()
+    return opened
+
+
+def _sticky_from_cookie(scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name != b"cookie":
+            continue
+        for part in value.decode("latin-1").split(";"):
+            key, _, expires = part.strip().partition("=")
+            if key == STICKY_COOKIE:
+                try:
+                    return float(expires) > time.time()
+                except ValueError:
+                    return False
+    return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI de lecture de ses propres écritures : une réponse dont la
+    requête a écrit sur le primaire pose un cookie, et les lectures du client
+    qui le présente vont au primaire pendant REPLICA_STICKY_SECONDS.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        routing = _RequestRouting(_sticky_from_cookie(scope))
+        token = _request_routing.set(routing)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and routing.wrote:
+                window = settings.REPLICA_STICKY_SECONDS
+                cookie = (f"{STICKY_COOKIE}={time.time() + window:.3f}; Max-Age={max(1, round(window))}; "
+                          "Path=/; HttpOnly; SameSite=Lax")
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1"))
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_routing.reset(token)
@@ -0,0 +1,251 @@
+# app/core/duplicate_index.py
+"""
+Détection des quasi-doublons parmi les signalements.
+
+Chaque signalement est résumé par une signature MinHash de NUM_PERM valeurs,
+calculée sur les mots (raccourcis, sans mots vides) et les paires de mots
+consécutifs de titre, description et localisation. Les signatures sont
+rangées dans un index LSH de BANDS bandes cloisonné par (ville, catégorie) :
+seuls les signalements de la même ville et de la même catégorie qui
+partagent une bande sont comparés. La part de valeurs égales entre deux
+signatures estime l'indice de Jaccard de leurs textes.
+
+L'index garde les max_entries signatures les plus récentes (~1,5 Ko
+chacune) ; comme l'index plein texte, il est propre à chaque processus et
+rattrape périodiquement les signalements écrits par les autres.
+Si numpy est installé, les signatures d'un lot (reconstruction, import en
+masse) sont calculées en une seule opération vectorisée.
+"""
+
+import random
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from app.core.config import settings
+from app.core.search_index import strip_accents, tokenize
+
+try:
+    import numpy as np
+except ImportError:  # signatures calculées en Python pur
+    np = None
+
+TEXT_FIELDS = ("titre", "description", "localisation")
+
+NUM_PERM = 64
+# 16 bandes de 4 valeurs : deux textes de similarité 0,6 partagent une bande
+# dans 9 cas sur 10, de similarité 0,3 dans moins de 1 cas sur 8
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Premier supérieur à 2^32 : a * h + b tient sur 64 bits (a, b < 2^31, h < 2^32)
+PRIME = 4294967311
+MASK32 = 0xFFFFFFFF
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.randrange(1, 1 << 31), _rng.randrange(0, 1 << 31)) for _ in range(NUM_PERM)]
+
+# (clé de partition, signature) ; None pour un texte sans mot utile
+Signed = Optional[Tuple[int, bytes]]
+
+
+def _field(signalement: Any, name: str) -> Any:
+    if isinstance(signalement, dict):
+        return signalement.get(name)
+    return getattr(signalement, name, None)
+
+
+def partition_key(signalement: Any) -> int:
+    ville = strip_accents((_field(signalement, "ville") or "").lower()).strip()
+    categorie = _field(signalement, "categorie")
+    return hash((ville, getattr(categorie, "value", categorie)))
+
+
+def shingles(signalement: Any) -> List[int]:
+    """Empreintes (crc32) des mots et paires de mots du texte du signalement."""
+    tokens: List[str] = []
+    for name in TEXT_FIELDS:
+        tokens.extend(tokenize(_field(signalement, name)))
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return [zlib.crc32(gram.encode()) for gram in grams]
+
+
+def _minhash(hashes: Sequence[int]) -> bytes:
+    return array("I", [
+        min([(a * h + b) % PRIME for h in hashes]) & MASK32 for a, b in _PERMUTATIONS
+    ]).tobytes()
+
+
+def _minhash_many(groups: List[List[int]]) -> List[bytes]:
+    """Signatures de plusieurs textes non vides (vectorisé avec numpy)."""
+    if np is None:
+        return [_minhash(hashes) for hashes in groups]
+    a = np.array([p[0] for p in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    b = np.array([p[1] for p in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    flat = np.fromiter((h for hashes in groups for h in hashes), dtype=np.uint64)
+    starts = np.cumsum([0] + [len(hashes) for hashes in groups[:-1]])
+    values = (a * flat[None, :] + b) % np.uint64(PRIME)
+    minima = np.minimum.reduceat(values, starts, axis=1) & np.uint64(MASK32)
+    signatures = np.ascontiguousarray(minima.T.astype(np.uint32))
+    return [row.tobytes() for row in signatures]
+
+
+def sign(signalement: Any) -> Signed:
+    return sign_many([signalement])[0]
+
+
+def sign_many(signalements: Sequence[Any]) -> List[Signed]:
+    groups = [shingles(s) for s in signalements]
+    filled = [i for i, hashes in enumerate(groups) if hashes]
+    signed: List[Signed] = [None] * len(groups)
+    for i, signature in zip(filled, _minhash_many([groups[i] for i in filled])):
+        signed[i] = (partition_key(signalements[i]), signature)
+    return signed
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Part des valeurs égales entre deux signatures (estimation du Jaccard)."""
+    same = sum(x == y for x, y in zip(memoryview(first).cast("I"), memoryview(second).cast("I")))
+    return same / NUM_PERM
+
+
+def _band_keys(partition: int, signature: bytes) -> List[int]:
+    width = ROWS * 4
+    return [hash((partition, band, signature[band * width:(band + 1) * width])) for band in range(BANDS)]
+
+
+class DuplicateIndex:
+    def __init__(self, max_entries: int = 20000, threshold: float = 0.6):
+        self._lock = threading.RLock()
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._reset()
+        self.ready = False
+
+    def _reset(self):
+        # id -> (partition, signature, id du signalement d'origine), du plus ancien au plus récent
+        self._entries: "OrderedDict[int, Tuple[int, bytes, Optional[int]]]" = OrderedDict()
+        # bande -> id (ou liste d'ids : la plupart des bandes n'ont qu'un signalement)
+        self._buckets: Dict[int, Union[int, List[int]]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add(self, doc_id: int, signed: Signed, duplicate_of: Optional[int]):
+        self._remove(doc_id)
+        if signed is None:
+            return
+        partition, signature = signed
+        self._entries[doc_id] = (partition, signature, duplicate_of)
+        buckets = self._buckets
+        for key in _band_keys(partition, signature):
+            ids = buckets.get(key)
+            if ids is None:
+                buckets[key] = doc_id
+            elif isinstance(ids, list):
+                ids.append(doc_id)
+            else:
+                buckets[key] = [ids, doc_id]
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, doc_id: int):
+        entry = self._entries.pop(doc_id, None)
+        if entry is None:
+            return
+        buckets = self._buckets
+        for key in _band_keys(entry[0], entry[1]):
+            ids = buckets.get(key)
+            if isinstance(ids, list):
+                ids.remove(doc_id)
+                if len(ids) == 1:
+                    buckets[key] = ids[0]
+            elif ids == doc_id:
+                del buckets[key]
+
+    def _find(self, signed: Signed, exclude: Optional[int] = None) -> Optional[Tuple[int, float]]:
+        if signed is None:
+            return None
+        partition, signature = signed
+        candidates = set()
+        for key in _band_keys(partition, signature):
+            ids = self._buckets.get(key)
+            if isinstance(ids, list):
+                candidates.update(ids)
+            elif ids is not None:
+                candidates.add(ids)
+        candidates.discard(exclude)
+        best: Optional[Tuple[float, int]] = None
+        for candidate in candidates:
+            entry = self._entries[candidate]
+            if entry[0] != partition:
+                continue
+            score = similarity(signature, entry[1])
+            if score >= self.threshold and (best is None or (score, candidate) > best):
+                best = (score, candidate)
+        if best is None:
+            return None
+        score, candidate = best
+        # Les doublons sont rattachés au signalement d'origine s'il est encore indexé
+        original = self._entries[candidate][2]
+        return (original if original in self._entries else candidate), score
+
+    def find(self, signed: Signed) -> Optional[Tuple[int, float]]:
+        """Signalement d'origine du doublon le plus proche et similarité (None sinon)."""
+        with self._lock:
+            return self._find(signed)
+
+    def add(self, doc_id: int, signed: Signed, duplicate_of: Optional[int] = None):
+        """Indexer un signalement dont la signature est déjà calculée."""
+        with self._lock:
+            self._add(doc_id, signed, duplicate_of)
+
+    def index(self, signalement: Any):
+        """Ajouter ou réindexer un signalement (objet ORM ou ligne avec duplicate_of)."""
+        self.add(signalement.id, sign(signalement), signalement.duplicate_of)
+
+    def link_batch(self, rows: Sequence[Any]) -> Dict[int, int]:
+        """
+        Indexer un lot de nouvelles lignes (par id croissant) en les comparant
+        à l'index et aux lignes précédentes du lot. Retourne {id: id d'origine}
+        pour les doublons trouvés.
+        """
+        links: Dict[int, int] = {}
+        signed = sign_many(rows)
+        with self._lock:
+            for row, row_signed in zip(rows, signed):
+                duplicate_of = row.duplicate_of
+                if duplicate_of is None:
+                    match = self._find(row_signed, exclude=row.id)
+                    if match is not None:
+                        duplicate_of = links[row.id] = match[0]
+                self._add(row.id, row_signed, duplicate_of)
+        return links
+
+    def remove(self, signalement_id: int):
+        with self._lock:
+            self._remove(signalement_id)
+
+    def discard_missing(self, existing: Collection[int], max_id: int) -> int:
+        """Retirer les signatures d'id <= max_id absentes de existing."""
+        with self._lock:
+            missing = [doc_id for doc_id in self._entries if doc_id <= max_id and doc_id not in existing]
+            for doc_id in missing:
+                self._remove(doc_id)
+        return len(missing)
+
+    def rebuild(self, batches: Iterable[Sequence[Any]]):
+        """Reconstruire l'index à partir de lots de lignes, des plus anciennes aux plus récentes."""
+        fresh = DuplicateIndex(self.max_entries, self.threshold)
+        for rows in batches:
+            for row, row_signed in zip(rows, sign_many(rows)):
+                fresh._add(row.id, row_signed, row.duplicate_of)
+        with self._lock:
+            self._entries = fresh._entries
+            self._buckets = fresh._buckets
+            self.ready = True
+
+
+duplicate_index = DuplicateIndex(settings.DUPLICATE_INDEX_SIZE, settings.DUPLICATE_THRESHOLD)
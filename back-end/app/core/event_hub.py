@@ -0,0 +1,164 @@
+# app/core/event_hub.py
+"""
+Diffusion en direct des créations, modifications et suppressions de
+signalements (GET /signalements/stream, Server-Sent Events).
+
+Les fonctions CRUD publient depuis les threads du pool ; la distribution
+aux abonnés se fait dans la boucle asyncio (call_soon_threadsafe). Chaque
+abonné a une file bornée : si elle déborde, son contenu est abandonné et
+remplacé par un événement "resync" (le client recharge la liste). Les
+derniers événements sont gardés pour reprendre un flux après une
+déconnexion (en-tête Last-Event-ID). Le hub est propre à chaque processus.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import STREAM_RESYNCS, STREAM_SUBSCRIBERS
+from app.core.search_index import strip_accents
+from app.utils.fast_json import dumps
+
+# Champs sur lesquels un abonné peut filtrer
+FILTER_FIELDS = ("ville", "categorie", "gravite")
+
+RESYNC = "resync"
+
+
+def _filter_value(field: str, value: Any) -> str:
+    value = str(getattr(value, "value", value) or "")
+    # Ville comparée sans casse ni accents, comme la recherche
+    return strip_accents(value.lower()).strip() if field == "ville" else value
+
+
+class Event:
+    __slots__ = ("seq", "kind", "data", "dims", "frame")
+
+    def __init__(self, seq: int, kind: str, data: Dict[str, Any]):
+        self.seq = seq
+        self.kind = kind
+        self.data = data
+        self.dims = {field: _filter_value(field, data.get(field)) for field in FILTER_FIELDS}
+        # Trame SSE encodée une seule fois pour tous les abonnés
+        self.frame: Optional[str] = None
+
+
+# Filtres d'un abonné : ((champ, valeurs acceptées), ...) triés par champ
+Filters = Tuple[Tuple[str, FrozenSet[str]], ...]
+
+
+def _matches(filters: Filters, event: Event) -> bool:
+    return all(event.dims[field] in accepted for field, accepted in filters)
+
+
+class Subscription:
+    __slots__ = ("filters", "queue")
+
+    def __init__(self, filters: Filters, max_queue: int):
+        self.filters = filters
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_queue)
+
+
+class EventHub:
+    def __init__(self, replay_size: int = 1000, max_queue: int = 100):
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._replay: Deque[Event] = deque(maxlen=replay_size)
+        # Abonnés regroupés par filtres : un événement est comparé une fois par
+        # combinaison de filtres, pas une fois par abonné
+        self._subscribers: Dict[Filters, Set[Subscription]] = {}
+        self._count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.max_queue = max_queue
+        # Préfixe des identifiants : un Last-Event-ID d'un autre processus ou
+        # d'avant un redémarrage ne correspond à aucun événement gardé
+        self.epoch = format(int(time.time() * 1000), "x")
+
+    def __len__(self):
+        return self._count
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Boucle asyncio dans laquelle les événements sont distribués."""
+        self._loop = loop
+
+    def event_id(self, event: Event) -> str:
+        return f"{self.epoch}-{event.seq}"
+
+    def sse_frame(self, event: Event) -> str:
+        if event.frame is None:
+            event.frame = (f"id: {self.event_id(event)}\nevent: {event.kind}\n"
+                           f"data: {dumps(event.data).decode()}\n\n")
+        return event.frame
+
+    def publish(self, kind: str, data: Dict[str, Any]):
+        """Publier un événement (appelable depuis n'importe quel thread)."""
+        with self._lock:
+            event = Event(next(self._seq), kind, data)
+            self._replay.append(event)
+        loop = self._loop
+        if loop is None or not self._count:
+            return
+        try:
+            loop.call_soon_threadsafe(self._dispatch, event)
+        except RuntimeError:
+            # Boucle fermée (arrêt du processus)
+            self._loop = None
+
+    def _dispatch(self, event: Event):
+        for filters, subscriptions in self._subscribers.items():
+            if not _matches(filters, event):
+                continue
+            for subscription in subscriptions:
+                queue = subscription.queue
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Abonné trop lent : les événements en attente sont remplacés par un resync
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(RESYNC)
+                    STREAM_RESYNCS.inc()
+
+    def subscribe(self, filters: Dict[str, Optional[List[str]]],
+                  last_event_id: Optional[str] = None) -> Tuple[Subscription, Optional[List[Event]]]:
+        """
+        Abonner un client (depuis la boucle asyncio). Retourne l'abonnement et,
+        pour une reprise, les événements publiés depuis last_event_id ; None si
+        ceux-ci ne sont plus disponibles (le client doit se resynchroniser).
+        """
+        accepted = tuple(sorted(
+            (field, frozenset(_filter_value(field, value) for value in values))
+            for field, values in filters.items() if values
+        ))
+        subscription = Subscription(accepted, self.max_queue)
+        self._subscribers.setdefault(accepted, set()).add(subscription)
+        self._count += 1
+        STREAM_SUBSCRIBERS.set(self._count)
+        if last_event_id is None:
+            return subscription, []
+        with self._lock:
+            replay = list(self._replay)
+        epoch, _, seq = last_event_id.rpartition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return subscription, None
+        last = int(seq)
+        if replay and replay[0].seq > last + 1:
+            return subscription, None
+        return subscription, [e for e in replay if e.seq > last and _matches(accepted, e)]
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscribers.get(subscription.filters)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.filters]
+        self._count -= 1
+        STREAM_SUBSCRIBERS.set(self._count)
+
+
+event_hub = EventHub(settings.STREAM_REPLAY_SIZE, settings.STREAM_QUEUE_SIZE)
@@ -0,0 +1,100 @@
+# app/core/gazetteer.py
+"""
+Géocodage hors ligne des lieux connus, à partir d'un fichier CSV
+(ville, lieu, latitude, longitude). Une ligne dont le lieu est vide donne le
+centre de la ville.
+
+geocode() sert à géolocaliser un signalement : seul un lieu connu de la ville,
+cité dans sa localisation, est accepté (le centre-ville serait trop imprécis).
+locate() sert aux requêtes /nearby?place= : il accepte aussi une ville seule.
+Les noms sont comparés sans accents, sans casse ni ponctuation.
+"""
+
+import csv
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.search_index import strip_accents
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parents[2] / "data" / "gazetteer.csv"
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+Point = Tuple[float, float]
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join(_WORD_RE.findall(strip_accents((text or "").lower())))
+
+
+class Gazetteer:
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        # ville -> [(lieu, point)] triés du nom le plus long au plus court
+        self._places: Dict[str, List[Tuple[str, Point]]] = {}
+        self._centers: Dict[str, Point] = {}
+        # lieu -> points (toutes villes confondues)
+        self._by_name: Dict[str, List[Point]] = {}
+
+    def __len__(self):
+        return len(self._centers) + sum(len(places) for places in self._places.values())
+
+    def add(self, ville: str, place: str, lat: float, lon: float):
+        ville, place, point = normalize(ville), normalize(place), (float(lat), float(lon))
+        if not place:
+            self._centers[ville] = point
+            return
+        places = self._places.setdefault(ville, [])
+        places.append((place, point))
+        places.sort(key=lambda entry: len(entry[0]), reverse=True)
+        self._by_name.setdefault(place, []).append(point)
+
+    def load(self, path) -> int:
+        """Remplacer le contenu par celui du fichier CSV."""
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self._reset()
+        for row in rows:
+            self.add(row["ville"], row.get("lieu") or "", row["latitude"], row["longitude"])
+        return len(self)
+
+    def geocode(self, localisation: Optional[str], ville: Optional[str]) -> Optional[Point]:
+        """Coordonnées du lieu connu le plus précis cité dans la localisation (None sinon)."""
+        text = f" {normalize(localisation)} "
+        for place, point in self._places.get(normalize(ville), ()):
+            if f" {place} " in text:
+                return point
+        return None
+
+    def locate(self, place: str, ville: Optional[str] = None) -> Optional[Point]:
+        """Coordonnées d'un lieu (dans la ville donnée) ou du centre d'une ville."""
+        name = normalize(place)
+        if ville:
+            if not name:
+                return self._centers.get(normalize(ville))
+            return self.geocode(place, ville)
+        if name in self._centers:
+            return self._centers[name]
+        points = self._by_name.get(name, [])
+        # Nom porté par des lieux de plusieurs villes : ambigu sans la ville
+        return points[0] if len(points) == 1 else None
+
+
+gazetteer = Gazetteer()
+
+
+def load_gazetteer() -> int:
+    path = settings.GAZETTEER_PATH or DEFAULT_PATH
+    try:
+        return gazetteer.load(path)
+    except OSError as e:
+        # Sans fichier, seules les coordonnées fournies par les clients sont utilisées
+        logger.warning(f"Gazetteer not loaded ({path}): {str(e)}")
+        return 0
@@ -1,11 +1,77 @@
-from app.core.database import Base, engine
-from app.models.signalement import Signalement
-# Import other models if needed
+from contextlib import contextmanager
+from pathlib import Path
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+
+from app.core.database import engine
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Verrou MySQL (GET_LOCK) : un seul worker applique les migrations à la fois
+MIGRATION_LOCK = "signalement_migrations"
+MIGRATION_LOCK_TIMEOUT = 300
+
+
+def get_alembic_config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    # Ne pas reconfigurer le logging de l'application
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def init_db(revision: str = "head"):
+    """Appliquer les migrations Alembic jusqu'à la révision demandée."""
+    config = get_alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+def _current_heads(connection) -> set:
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+@contextmanager
+def _migration_lock(connection):
+    if connection.dialect.name != "mysql":
+        yield
+        return
+    acquired = connection.execute(
+        text("SELECT GET_LOCK(:name, :timeout)"), {"name": MIGRATION_LOCK, "timeout": MIGRATION_LOCK_TIMEOUT}
+    ).scalar()
+    if acquired != 1:
+        raise RuntimeError("Migration lock not acquired")
+    try:
+        yield
+    finally:
+        connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK})
+
+
+def ensure_schema() -> bool:
+    """
+    Comparer la révision de la base (table alembic_version) aux têtes des
+    scripts de migration, et ne lancer l'upgrade qu'en cas d'écart : un worker
+    qui démarre sur une base à jour ne lit qu'une ligne. Retourne True si des
+    migrations ont été appliquées.
+    """
+    config = get_alembic_config()
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with engine.connect() as connection:
+        if _current_heads(connection) == heads:
+            return False
+    with engine.begin() as connection, _migration_lock(connection):
+        # Un autre worker a pu migrer pendant l'attente du verrou
+        if _current_heads(connection) == heads:
+            return False
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    return True
 
 if __name__ == "__main__":
-    print("Creating database tables...")
+    print("Applying database migrations...")
     init_db()
-    print("Tables created successfully!")
\ No newline at end of file
+    print("Database schema is up to date!")
@@ -0,0 +1,230 @@
+# app/core/jobs.py
+"""
+File de tâches de fond durable (table jobs), traitée par un pool de threads
+du processus.
+
+Une tâche est ajoutée par enqueue() dans la session de l'appelant : elle est
+validée (ou annulée) avec la transaction qui l'a créée. Les workers
+réclament les tâches prêtes par lots : SELECT ... FOR UPDATE SKIP LOCKED
+sur MySQL, puis UPDATE conditionnel avec un jeton de réclamation (seul
+mécanisme sur SQLite, où les écritures sont sérialisées). Une tâche
+réclamée est louée JOB_LEASE_SECONDS : si son worker s'arrête, elle est
+reprise à l'expiration du bail. Un échec est retenté avec un délai doublé
+à chaque essai ; les gestionnaires doivent donc être idempotents.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, event, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import JOB_DURATION, JOB_LAG, JOB_QUEUE_DEPTH, JOB_QUEUE_LAG, JOBS_PROCESSED
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+STATUSES = (PENDING, RUNNING, DONE, FAILED)
+
+Handler = Callable[[Session, Dict[str, Any]], None]
+
+HANDLERS: Dict[str, Handler] = {}
+
+
+def utcnow() -> datetime:
+    # Dates naïves en UTC, posées et comparées uniquement par l'application
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def job_handler(kind: str):
+    """Déclarer le gestionnaire d'un type de tâche : handler(db, payload)."""
+    def register(handler: Handler) -> Handler:
+        HANDLERS[kind] = handler
+        return handler
+    return register
+
+
+def enqueue(db: Session, kind: str, payload: Dict[str, Any], delay: float = 0.0,
+            max_attempts: Optional[int] = None) -> Job:
+    """Ajouter une tâche à la transaction en cours (visible des workers après le commit)."""
+    now = utcnow()
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload),
+        status=PENDING,
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=now + timedelta(seconds=delay),
+        created_at=now,
+    )
+    db.add(job)
+    db.info["jobs_enqueued"] = True
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session):
+    # Les workers de ce processus n'attendent pas le prochain intervalle de lecture
+    if session.info.pop("jobs_enqueued", False):
+        job_queue.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued(session):
+    session.info.pop("jobs_enqueued", None)
+
+
+def retry_delay(attempts: int) -> float:
+    """Délai avant le prochain essai : doublé à chaque échec, plafonné, avec gigue."""
+    delay = min(settings.JOB_RETRY_MAX_DELAY, settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _ready(now: datetime):
+    # Tâches à exécuter, et tâches dont le worker a laissé expirer le bail
+    return or_(
+        and_(Job.status == PENDING, Job.run_at <= now),
+        and_(Job.status == RUNNING, Job.locked_until < now),
+    )
+
+
+def claim(db: Session, limit: int) -> List[Any]:
+    """Réclamer jusqu'à limit tâches prêtes ; retourne leurs lignes (id, kind, payload, ...)."""
+    now = utcnow()
+    ids = [job_id for (job_id,) in (
+        db.query(Job.id).filter(_ready(now)).order_by(Job.run_at).limit(limit)
+        .with_for_update(skip_locked=True)
+    )]
+    if not ids:
+        db.rollback()
+        return []
+    token = uuid.uuid4().hex
+    # La condition est revérifiée : un autre worker a pu réclamer ces tâches entre-temps
+    db.query(Job).filter(Job.id.in_(ids), _ready(now)).update({
+        Job.status: RUNNING,
+        Job.claim_token: token,
+        Job.locked_until: now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+        Job.attempts: Job.attempts + 1,
+    }, synchronize_session=False)
+    db.commit()
+    rows = (db.query(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.run_at, Job.claim_token)
+            .filter(Job.claim_token == token).order_by(Job.run_at).all())
+    db.rollback()
+    return rows
+
+
+def _finish(db: Session, job: Any, values: Dict[Any, Any]):
+    # Sans effet si la tâche a été reprise par un autre worker après l'expiration du bail
+    db.query(Job).filter(Job.id == job.id, Job.claim_token == job.claim_token).update(
+        {Job.claim_token: None, Job.locked_until: None, **values}, synchronize_session=False)
+    db.commit()
+
+
+def process(db: Session, job: Any) -> str:
+    """Exécuter une tâche réclamée et enregistrer son issue (done, retry ou failed)."""
+    JOB_LAG.observe(max(0.0, (utcnow() - job.run_at).total_seconds()), (job.kind,))
+    start = time.perf_counter()
+    try:
+        handler = HANDLERS.get(job.kind)
+        if handler is None:
+            raise LookupError(f"No handler for job kind {job.kind!r}")
+        handler(db, json.loads(job.payload))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        error = f"{type(e).__name__}: {e}"
+        if job.attempts >= job.max_attempts:
+            outcome = FAILED
+            _finish(db, job, {Job.status: FAILED, Job.last_error: error, Job.finished_at: utcnow()})
+            logger.error(f"Job {job.id} ({job.kind}) failed after {job.attempts} attempts: {error}")
+        else:
+            outcome = "retry"
+            run_at = utcnow() + timedelta(seconds=retry_delay(job.attempts))
+            _finish(db, job, {Job.status: PENDING, Job.last_error: error, Job.run_at: run_at})
+            logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed: {error}")
+    else:
+        outcome = DONE
+        _finish(db, job, {Job.status: DONE, Job.last_error: None, Job.finished_at: utcnow()})
+    JOB_DURATION.observe(time.perf_counter() - start, (job.kind,))
+    JOBS_PROCESSED.inc((job.kind, outcome))
+    return outcome
+
+
+def refresh_metrics(db: Session):
+    """Profondeur de la file par état, âge de la plus ancienne tâche prête ; purge des tâches terminées."""
+    now = utcnow()
+    counts = dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+    for status in STATUSES:
+        JOB_QUEUE_DEPTH.set(counts.get(status, 0), (status,))
+    oldest = db.query(func.min(Job.run_at)).filter(Job.status == PENDING, Job.run_at <= now).scalar()
+    JOB_QUEUE_LAG.set((now - oldest).total_seconds() if oldest else 0.0)
+    db.query(Job).filter(
+        Job.status == DONE, Job.finished_at < now - timedelta(seconds=settings.JOB_RETENTION_SECONDS)
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+class JobQueue:
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._session_factory: Optional[Callable[[], Session]] = None
+
+    def wake(self):
+        self._wake.set()
+
+    def start(self, session_factory: Callable[[], Session], workers: int):
+        self._session_factory = session_factory
+        self._stop.clear()
+        for index in range(workers):
+            thread = threading.Thread(target=self._run, args=(index,), name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_pending(self, db: Session, limit: Optional[int] = None) -> int:
+        """Réclamer et traiter un lot de tâches ; retourne le nombre de tâches traitées."""
+        jobs = claim(db, limit or settings.JOB_BATCH_SIZE)
+        for job in jobs:
+            process(db, job)
+        return len(jobs)
+
+    def _run(self, index: int):
+        next_metrics = 0.0
+        while not self._stop.is_set():
+            processed = 0
+            db = self._session_factory()
+            try:
+                # Un seul worker par processus rafraîchit les métriques de la file
+                if index == 0 and time.monotonic() >= next_metrics:
+                    refresh_metrics(db)
+                    next_metrics = time.monotonic() + settings.JOB_METRICS_INTERVAL
+                processed = self.run_pending(db)
+            except Exception as e:
+                logger.error(f"Job worker {index} error: {str(e)}")
+            finally:
+                db.close()
+            if not processed:
+                self._wake.wait(settings.JOB_POLL_INTERVAL)
+                self._wake.clear()
+
+
+job_queue = JobQueue()
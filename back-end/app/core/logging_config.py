@@ -0,0 +1,227 @@
+# app/core/logging_config.py
+"""
+Journalisation de l'application : enregistrements structurés écrits par un
+thread dédié (QueueHandler / QueueListener), et journal SQL échantillonné.
+
+Les requêtes SQL normales sont journalisées avec la probabilité
+SQL_LOG_SAMPLE_RATE ; celles qui dépassent SQL_SLOW_QUERY_MS le sont
+toujours, avec leur plan d'exécution (EXPLAIN) calculé hors du chemin de
+la requête, sur une connexion distincte.
+"""
+
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+sql_logger = logging.getLogger("app.sql")
+
+_listener: Optional[QueueListener] = None
+# Un thread d'EXPLAIN par moteur expliquant (primaire, chaque réplica), par id du moteur
+_explainers: Dict[int, "_ExplainWorker"] = {}
+_explainer_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler qui ne bloque jamais : si la file est pleine, l'enregistrement est abandonné."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging():
+    """Configurer le logger racine : file bornée vers un thread d'écriture."""
+    global _listener
+    if _listener is not None:
+        return
+    if settings.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    stream = logging.StreamHandler()
+    stream.setFormatter(formatter)
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+    # Journal SQL de SQLAlchemy (echo) remplacé par app.sql
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+    _listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Vider la file et arrêter les threads de journalisation."""
+    global _listener
+    with _explainer_lock:
+        explainers = list(_explainers.values())
+        _explainers.clear()
+    for explainer in explainers:
+        explainer.stop()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_event(logger: logging.Logger, message: str, level: int = logging.INFO, **fields: Any):
+    """Enregistrement structuré ; rien n'est formaté si le niveau est désactivé."""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"fields": fields})
+
+
+class _ExplainWorker(threading.Thread):
+    """Calcule les plans des requêtes lentes sur une connexion du moteur synchrone."""
+
+    def __init__(self, engine):
+        super().__init__(name="sql-explain", daemon=True)
+        self.engine = engine
+        self.queue: queue.Queue = queue.Queue(maxsize=100)
+        self._last_explained = {}
+
+    def submit(self, statement: str, parameters: Any, fields: dict) -> bool:
+        # Un même texte de requête n'est expliqué qu'une fois par intervalle
+        now = time.monotonic()
+        if now - self._last_explained.get(statement, float("-inf")) < settings.SQL_EXPLAIN_INTERVAL:
+            return False
+        if len(self._last_explained) >= 1000:
+            self._last_explained.clear()
+        self._last_explained[statement] = now
+        try:
+            self.queue.put_nowait((statement, parameters, fields))
+            return True
+        except queue.Full:
+            return False
+
+    def stop(self):
+        self.queue.put(None)
+        self.join(timeout=5)
+
+    def _explain(self, statement: str, parameters: Any) -> str:
+        prefix = "EXPLAIN QUERY PLAN " if self.engine.dialect.name == "sqlite" else "EXPLAIN "
+        # sql_log=False : les requêtes EXPLAIN ne sont pas elles-mêmes journalisées
+        with self.engine.connect().execution_options(sql_log=False) as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        return "\n".join(" | ".join(str(v) for v in row) for row in rows)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            statement, parameters, fields = item
+            try:
+                fields["plan"] = self._explain(statement, parameters)
+            except Exception as e:
+                fields["plan_error"] = str(e)
+            log_event(sql_logger, "slow query", logging.WARNING, **fields)
+
+
+def _get_explainer(explain_engine) -> Optional[_ExplainWorker]:
+    # Démarré à la première requête lente du moteur, et de nouveau après un arrêt
+    if not settings.SQL_EXPLAIN_SLOW_QUERIES:
+        return None
+    explainer = _explainers.get(id(explain_engine))
+    if explainer is None:
+        with _explainer_lock:
+            explainer = _explainers.get(id(explain_engine))
+            if explainer is None:
+                explainer = _ExplainWorker(explain_engine)
+                explainer.start()
+                _explainers[id(explain_engine)] = explainer
+    return explainer
+
+
+def _first_parameters(parameters: Any, executemany: bool) -> Any:
+    if executemany and parameters:
+        return parameters[0]
+    return parameters
+
+
+def instrument_sql_logging(engine, name: str, explain_engine=None):
+    """
+    Journaliser les requêtes d'un moteur synchrone (async_engine.sync_engine
+    pour le moteur asynchrone). explain_engine est le moteur synchrone
+    utilisé pour les EXPLAIN (par défaut engine lui-même) : une requête lente
+    d'un réplica est expliquée sur ce réplica.
+    """
+    explain_engine = explain_engine or engine
+
+    sample_rate = settings.SQL_LOG_SAMPLE_RATE
+    slow_seconds = settings.SQL_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._sql_log_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_sql_log_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        slow = elapsed >= slow_seconds
+        if not slow and (sample_rate <= 0 or random.random() >= sample_rate):
+            return
+        if not conn.get_execution_options().get("sql_log", True):
+            return
+        fields = {
+            "engine": name,
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": statement,
+            "rowcount": cursor.rowcount,
+            "executemany": executemany,
+        }
+        if not slow:
+            log_event(sql_logger, "sql", logging.INFO, **fields)
+            return
+        params = _first_parameters(parameters, executemany)
+        if settings.SQL_LOG_PARAMETERS:
+            fields["parameters"] = params
+        explainable = statement.lstrip()[:6].upper() == "SELECT" and not executemany
+        explainer = _get_explainer(explain_engine) if explainable else None
+        if not (explainer is not None and explainer.submit(statement, params, fields)):
+            log_event(sql_logger, "slow query", logging.WARNING, **fields)
@@ -0,0 +1,82 @@
+# app/core/login_guard.py
+"""
+Contrôle d'admission de POST /auth/login, avant toute requête SQL ou bcrypt.
+
+Chaque tentative consomme un jeton du seau de l'adresse IP du client puis
+de celui de l'email : au-delà, la connexion est refusée (429) sans rien
+coûter d'autre. Les emails inconnus des deux tables sont gardés
+LOGIN_UNKNOWN_EMAIL_TTL secondes : une nouvelle tentative sur l'un d'eux
+répond 401 sans interroger la base. Ils sont gardés tels que saisis, comme
+ils sont cherchés en base : un échec sur « Foo@x » ne bloque pas « foo@x ».
+
+L'état est propre à chaque processus. Un compte créé (ou un email modifié)
+n'est retiré des emails inconnus que dans le worker qui l'a écrit : sur les
+autres, la connexion peut répondre 401 pendant au plus LOGIN_UNKNOWN_EMAIL_TTL
+secondes, d'où une durée courte. L'adresse IP est celle de la connexion (un
+proxy en amont doit être configuré dans uvicorn, --forwarded-allow-ips, pour
+qu'elle soit celle du client).
+"""
+
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import LOGIN_ATTEMPTS
+from app.utils.cache import TTLCache
+from app.utils.rate_limit import TokenBuckets
+
+ip_buckets = TokenBuckets(settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE / 60.0,
+                          settings.LOGIN_BUCKETS_SIZE, settings.LOGIN_BUCKET_SHARDS)
+email_buckets = TokenBuckets(settings.LOGIN_EMAIL_BURST, settings.LOGIN_EMAIL_PER_MINUTE / 60.0,
+                             settings.LOGIN_BUCKETS_SIZE, settings.LOGIN_BUCKET_SHARDS)
+unknown_emails = TTLCache(maxsize=settings.LOGIN_UNKNOWN_EMAIL_SIZE, ttl=settings.LOGIN_UNKNOWN_EMAIL_TTL)
+
+
+def normalize_email(email: Optional[str]) -> str:
+    return (email or "").strip().lower()
+
+
+def admit(ip: Optional[str], email: str) -> float:
+    """Autoriser une tentative : 0.0 si admise, sinon secondes avant de réessayer."""
+    if settings.LOGIN_ADMISSION:
+        retry_after = ip_buckets.take(ip or "")
+        if retry_after:
+            LOGIN_ATTEMPTS.inc(("rejected_ip",))
+            return retry_after
+        retry_after = email_buckets.take(normalize_email(email))
+        if retry_after:
+            LOGIN_ATTEMPTS.inc(("rejected_email",))
+            return retry_after
+    LOGIN_ATTEMPTS.inc(("admitted",))
+    return 0.0
+
+
+def is_unknown(email: str) -> bool:
+    # Clé non normalisée : la recherche en base compare l'email tel quel
+    if unknown_emails.get(email) is None:
+        return False
+    LOGIN_ATTEMPTS.inc(("unknown_cached",))
+    return True
+
+
+def remember_unknown(email: str):
+    unknown_emails.set(email, True)
+
+
+def forget_unknown(email: Optional[str]):
+    """À appeler quand un compte est créé ou change d'email (dans ce processus seulement)."""
+    if email:
+        unknown_emails.invalidate(email)
+
+
+def succeeded(email: str):
+    # Une connexion réussie rend ses jetons à l'email (fautes de frappe précédentes)
+    email_buckets.reset(normalize_email(email))
+
+
+def login_stats() -> dict:
+    return {
+        "enabled": settings.LOGIN_ADMISSION,
+        "ip": ip_buckets.stats(),
+        "email": email_buckets.stats(),
+        "unknown_emails": unknown_emails.stats(),
+    }
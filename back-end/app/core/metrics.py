@@ -0,0 +1,257 @@
+# app/core/metrics.py
+"""
+Métriques de l'application au format texte Prometheus (GET /metrics).
+
+MetricsMiddleware mesure chaque requête HTTP (latence, taille de réponse,
+requêtes en cours) par route ; les événements before/after_cursor_execute
+des moteurs SQLAlchemy comptent les requêtes SQL et leur durée, attribuées
+à la requête HTTP en cours via une variable de contexte. Les métriques sont
+propres à chaque processus.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+JOB_LAG_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+# Libellé des requêtes qui ne correspondent à aucune route (évite une
+# cardinalité non bornée avec les chemins inconnus)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {value}" for labels, value in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def add(self, labels: Tuple[str, ...] = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set(self, value: float, labels: Tuple[str, ...] = ()):
+        with self._lock:
+            self._values[labels] = value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {value}" for labels, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [compteurs par intervalle (+Inf en dernier), somme]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        lines = self._header()
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket = _labels(self.labelnames, labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            cumulative += counts[-1]
+            bucket = _labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "Requêtes HTTP traitées", ("method", "route", "status"))
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Durée des requêtes HTTP",
+                             ("method", "route"), LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Taille du corps des réponses HTTP",
+                          ("method", "route"), SIZE_BUCKETS)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requêtes HTTP en cours de traitement", ("method",))
+REQUEST_STATEMENTS = Histogram("http_request_db_statements", "Requêtes SQL par requête HTTP",
+                               ("method", "route"), STATEMENT_BUCKETS)
+REQUEST_DB_TIME = Histogram("http_request_db_seconds", "Temps passé en base par requête HTTP",
+                            ("method", "route"), LATENCY_BUCKETS)
+DB_STATEMENTS = Counter("db_statements_total", "Requêtes SQL exécutées", ("engine",))
+DB_DURATION = Histogram("db_statement_duration_seconds", "Durée des requêtes SQL", ("engine",), DB_BUCKETS)
+STARTUP_PHASE = Gauge("app_startup_phase_seconds", "Durée des phases de démarrage du worker", ("phase",))
+STREAM_SUBSCRIBERS = Gauge("signalement_stream_subscribers", "Clients abonnés à /signalements/stream")
+JOB_QUEUE_DEPTH = Gauge("job_queue_depth", "Tâches de fond par état", ("status",))
+JOB_QUEUE_LAG = Gauge("job_queue_lag_seconds", "Âge de la plus ancienne tâche prête non réclamée")
+JOB_LAG = Histogram("job_lag_seconds", "Délai entre l'heure prévue d'une tâche et son traitement",
+                    ("kind",), JOB_LAG_BUCKETS)
+JOB_DURATION = Histogram("job_duration_seconds", "Durée de traitement des tâches", ("kind",))
+JOBS_PROCESSED = Counter("jobs_processed_total", "Tâches traitées", ("kind", "outcome"))
+STREAM_RESYNCS = Counter("signalement_stream_resyncs_total", "Files d'abonnés débordées (événements remplacés par un resync)")
+SIGNALEMENTS_ARCHIVED = Counter("signalements_archived_total", "Signalements résolus déplacés vers signalements_archive")
+LOGIN_ATTEMPTS = Counter("login_attempts_total", "Tentatives de connexion par issue de l'admission", ("outcome",))
+
+REGISTRY = [REQUESTS, REQUEST_DURATION, RESPONSE_SIZE, IN_FLIGHT,
+            REQUEST_STATEMENTS, REQUEST_DB_TIME, DB_STATEMENTS, DB_DURATION, STARTUP_PHASE,
+            STREAM_SUBSCRIBERS, STREAM_RESYNCS, LOGIN_ATTEMPTS, SIGNALEMENTS_ARCHIVED,
+            JOB_QUEUE_DEPTH, JOB_QUEUE_LAG, JOB_LAG, JOB_DURATION, JOBS_PROCESSED]
+
+
+class _RequestDBStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Compteurs SQL de la requête HTTP en cours (copiés avec le contexte dans
+# le pool de threads des routes synchrones : l'objet est partagé)
+_request_db_stats: ContextVar[Optional[_RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def instrument_engine(engine, name: str):
+    """Mesurer les requêtes SQL d'un moteur synchrone (async_engine.sync_engine pour l'asynchrone)."""
+    labels = (name,)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        DB_STATEMENTS.inc(labels)
+        DB_DURATION.observe(elapsed, labels)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+
+def _route_label(scope) -> str:
+    """Gabarit du chemin (ex. /signalements/{id}) à partir du chemin et des path_params."""
+    if scope.get("route") is None:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    params = scope.get("path_params")
+    if not params:
+        return path
+    names = {str(value): name for name, value in params.items()}
+    return "/".join("{%s}" % names[part] if part in names else part for part in path.split("/"))
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : latence, taille de réponse, requêtes en cours et SQL par route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        size = 0
+        stats = _RequestDBStats()
+        token = _request_db_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.add((method,), 1)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.add((method,), -1)
+            _request_db_stats.reset(token)
+            labels = (method, _route_label(scope))
+            REQUESTS.inc(labels + (str(status_code),))
+            REQUEST_DURATION.observe(elapsed, labels)
+            RESPONSE_SIZE.observe(size, labels)
+            REQUEST_STATEMENTS.observe(stats.statements, labels)
+            REQUEST_DB_TIME.observe(stats.seconds, labels)
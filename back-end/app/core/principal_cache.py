@@ -0,0 +1,35 @@
+# app/core/principal_cache.py
+"""
+Caches de get_current_user : utilisateurs par (rôle, id) et jetons JWT décodés.
+
+Les caches sont propres à chaque processus. Les modifications faites par ce
+processus les invalident immédiatement ; celles d'un autre worker passent par
+la version partagée "principals" (app/core/cache_versions.py), gardée avec
+chaque utilisateur en cache et relue avant de le servir. Le cache des jetons
+ne contient que des JWT décodés, indépendants de la base.
+"""
+
+from app.core.cache_versions import PRINCIPALS, bump, bump_async
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+principal_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL)
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL)
+
+
+def invalidate_principal(role: str, user_id: int):
+    """À appeler après le commit de la modification ou de la suppression d'un utilisateur."""
+    principal_cache.invalidate((role, user_id))
+    bump(PRINCIPALS)
+
+
+async def invalidate_principal_async(role: str, user_id: int):
+    principal_cache.invalidate((role, user_id))
+    await bump_async(PRINCIPALS)
+
+
+def cache_stats() -> dict:
+    return {
+        "principal": principal_cache.stats(),
+        "token": token_cache.stats(),
+    }
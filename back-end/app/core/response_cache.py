@@ -0,0 +1,40 @@
+# app/core/response_cache.py
+"""
+Cache des réponses de /signalements/ et /signalements/search.
+
+Les valeurs sont les corps JSON déjà sérialisés : un succès renvoie les bytes
+sans repasser par pydantic. Toute écriture sur les signalements (création,
+modification, suppression, import) vide le cache et incrémente sa génération,
+ce qui écarte aussi les remplissages commencés avant l'écriture. Le cache est
+propre à chaque processus ; les écritures des autres workers l'invalident par
+la version partagée "signalements" (app/core/cache_versions.py), relue avant
+de servir une entrée.
+"""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.cache_versions import SIGNALEMENTS, bump
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+response_cache = TTLCache(maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL)
+
+
+def search_cache_key(search_params: Dict[str, Any], skip: int, limit: int,
+                     fields: Optional[Tuple[str, ...]] = None, include_archived: bool = False) -> Hashable:
+    """Clé normalisée : l'ordre des paramètres et les espaces n'y entrent pas."""
+    normalized = tuple(sorted(
+        (key, value.strip() if isinstance(value, str) else value)
+        for key, value in search_params.items()
+    ))
+    return ("search", normalized, skip, limit, fields, include_archived)
+
+
+def invalidate_signalements():
+    """À appeler après le commit de toute écriture sur les signalements."""
+    response_cache.clear()
+    bump(SIGNALEMENTS)
+
+
+def cache_stats() -> dict:
+    return {"responses": response_cache.stats()}
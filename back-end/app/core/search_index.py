@@ -0,0 +1,254 @@
+# app/core/search_index.py
+"""
+Index inversé en mémoire pour la recherche plein texte des signalements.
+
+L'index est propre à chaque processus : il est reconstruit au démarrage
+puis tenu à jour par les fonctions CRUD (création, modification, suppression).
+Les écritures des autres processus (plusieurs workers uvicorn) y sont
+reportées toutes les INDEX_REFRESH_INTERVAL secondes par refresh_indexes.
+"""
+
+import bisect
+import math
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Champs indexés et leur poids dans le score
+FIELD_WEIGHTS = {
+    "titre": 3.0,
+    "ville": 2.0,
+    "localisation": 2.0,
+    "description": 1.0,
+    "commentaire": 1.0,
+}
+
+# Champs conservés pour les filtres exacts (status, catégorie, ...)
+FILTER_FIELDS = ("categorie", "status", "gravite", "citizen_id")
+
+INDEXED_COLUMNS = tuple(FIELD_WEIGHTS) + FILTER_FIELDS
+
+STOPWORDS = frozenset("""
+a au aux avec ce ces cet cette d dans de des du elle elles en est et il ils
+je l la le les leur leurs lui ma mais me mes mon n ne nous on ou par pas
+plus pour qu que qui s sa sans se ses son sont sur ta te tes ton tu un une
+vos votre vous y
+""".split())
+
+# Suffixes retirés par le raccourcisseur (plus longs en premier)
+SUFFIXES = (
+    "issements", "issement", "atrices", "atrice", "ateurs", "ateur",
+    "ations", "ation", "ements", "ement", "ments", "ment",
+    "euses", "euse", "ances", "ance", "ences", "ence", "ables", "able",
+    "istes", "iste", "ismes", "isme", "ites", "ite", "ives", "ive",
+    "eurs", "eur", "eux", "ifs", "if", "ees", "ee", "er", "ez",
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def strip_accents(text: str) -> str:
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+# Le vocabulaire est réduit : la mémoïsation évite de retester les suffixes
+# à chaque occurrence (import en masse, reconstruction de l'index)
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Raccourcisseur léger pour le français (pluriels et suffixes courants)."""
+    if len(word) > 4 and word.endswith("aux"):
+        word = word[:-3] + "al"
+    elif len(word) > 3 and word[-1] in "sx":
+        word = word[:-1]
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            break
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Minuscules, sans accents, sans mots vides, puis raccourcis."""
+    if not text:
+        return []
+    tokens = _TOKEN_RE.findall(strip_accents(text.lower()))
+    return [stem(t) for t in tokens if t not in STOPWORDS]
+
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+        self.ready = False
+
+    def _reset(self):
+        # champ -> terme -> {id: fréquence}
+        self._postings: Dict[str, Dict[str, Dict[int, int]]] = {f: {} for f in FIELD_WEIGHTS}
+        # champ -> {id: nombre de termes}
+        self._lengths: Dict[str, Dict[int, int]] = {f: {} for f in FIELD_WEIGHTS}
+        self._total_lengths: Dict[str, int] = {f: 0 for f in FIELD_WEIGHTS}
+        # id -> (termes par champ, valeurs des filtres)
+        self._docs: Dict[int, Tuple[Dict[str, Dict[str, int]], Dict[str, Any]]] = {}
+        # champ -> vocabulaire trié pour la recherche par préfixe (None : à recalculer)
+        self._vocabulary: Dict[str, Optional[List[str]]] = {f: None for f in FIELD_WEIGHTS}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _add(self, doc_id: int, values: Dict[str, Any]):
+        fields = {}
+        for field in FIELD_WEIGHTS:
+            counts: Dict[str, int] = {}
+            for token in tokenize(values.get(field)):
+                counts[token] = counts.get(token, 0) + 1
+            fields[field] = counts
+            postings = self._postings[field]
+            for token, tf in counts.items():
+                if token not in postings:
+                    postings[token] = {}
+                    self._vocabulary[field] = None
+                postings[token][doc_id] = tf
+            length = sum(counts.values())
+            self._lengths[field][doc_id] = length
+            self._total_lengths[field] += length
+        filters = {key: _filter_value(values.get(key)) for key in FILTER_FIELDS}
+        self._docs[doc_id] = (fields, filters)
+
+    def _remove(self, doc_id: int):
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        fields, _ = entry
+        for field, counts in fields.items():
+            postings = self._postings[field]
+            for token in counts:
+                docs = postings.get(token)
+                if docs is not None:
+                    docs.pop(doc_id, None)
+                    if not docs:
+                        del postings[token]
+                        self._vocabulary[field] = None
+            self._total_lengths[field] -= self._lengths[field].pop(doc_id, 0)
+
+    def index(self, signalement: Any):
+        """Ajouter ou réindexer un signalement (objet ORM ou ligne)."""
+        values = {column: getattr(signalement, column, None) for column in INDEXED_COLUMNS}
+        with self._lock:
+            self._remove(signalement.id)
+            self._add(signalement.id, values)
+
+    def remove(self, signalement_id: int):
+        with self._lock:
+            self._remove(signalement_id)
+
+    def discard_missing(self, existing: Collection[int], max_id: int) -> int:
+        """Retirer les signalements d'id <= max_id absents de existing (supprimés ailleurs)."""
+        with self._lock:
+            missing = [doc_id for doc_id in self._docs if doc_id <= max_id and doc_id not in existing]
+            for doc_id in missing:
+                self._remove(doc_id)
+        return len(missing)
+
+    def rebuild(self, rows: Iterable[Any]):
+        """Reconstruire entièrement l'index à partir d'un itérable de lignes."""
+        fresh = SearchIndex()
+        for row in rows:
+            fresh._add(row.id, {column: getattr(row, column, None) for column in INDEXED_COLUMNS})
+        with self._lock:
+            self._postings = fresh._postings
+            self._lengths = fresh._lengths
+            self._total_lengths = fresh._total_lengths
+            self._docs = fresh._docs
+            self._vocabulary = fresh._vocabulary
+            self.ready = True
+
+    def _terms(self, field: str, term: str, prefix: bool) -> List[str]:
+        """Termes indexés du champ égaux à term, ou qui commencent par term si prefix."""
+        if not prefix:
+            return [term] if term in self._postings[field] else []
+        vocabulary = self._vocabulary[field]
+        if vocabulary is None:
+            vocabulary = self._vocabulary[field] = sorted(self._postings[field])
+        start = bisect.bisect_left(vocabulary, term)
+        end = bisect.bisect_left(vocabulary, term + "\uffff", start)
+        return vocabulary[start:end]
+
+    def _score_clause(self, text: str, fields: Sequence[str], prefix: bool = False) -> Optional[Dict[int, float]]:
+        """
+        Score BM25 des documents contenant tous les termes de text dans fields
+        (avec prefix, un terme couvre aussi les termes indexés qu'il commence).
+        """
+        terms = tokenize(text)
+        if not terms:
+            return None
+        n_docs = max(len(self._docs), 1)
+        scores: Optional[Dict[int, float]] = None
+        for term in dict.fromkeys(terms):
+            term_scores: Dict[int, float] = {}
+            for field in fields:
+                avg_len = self._total_lengths[field] / n_docs or 1.0
+                lengths = self._lengths[field]
+                weight = FIELD_WEIGHTS[field]
+                for indexed in self._terms(field, term, prefix):
+                    docs = self._postings[field][indexed]
+                    idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for doc_id, tf in docs.items():
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / avg_len)
+                        score = weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+                        term_scores[doc_id] = term_scores.get(doc_id, 0.0) + score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return {}
+        return scores
+
+    def search(self, clauses: Sequence[Tuple[str, Optional[Sequence[str]]]],
+               filters: Optional[Dict[str, Any]] = None,
+               offset: int = 0, limit: Optional[int] = None) -> Tuple[int, List[int]]:
+        """
+        Rechercher les signalements correspondant à toutes les clauses (texte, champs).
+        Les termes d'une clause limitée à des champs sont des préfixes (titre=tro
+        trouve « Trou ») ; ceux d'une clause sur tous les champs (None) sont exacts.
+        Retourne le nombre total de résultats et les ids de la page, par pertinence.
+        """
+        wanted = {k: _filter_value(v) for k, v in (filters or {}).items() if v is not None}
+        with self._lock:
+            scores: Optional[Dict[int, float]] = None
+            for text, fields in clauses:
+                clause_scores = self._score_clause(text, fields or tuple(FIELD_WEIGHTS), prefix=bool(fields))
+                if clause_scores is None:
+                    continue
+                if scores is None:
+                    scores = clause_scores
+                else:
+                    scores = {d: s + clause_scores[d] for d, s in scores.items() if d in clause_scores}
+            if scores is None:
+                return 0, []
+            if wanted:
+                scores = {
+                    d: s for d, s in scores.items()
+                    if all(self._docs[d][1].get(k) == v for k, v in wanted.items())
+                }
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        end = None if limit is None else offset + limit
+        return len(ranked), [doc_id for doc_id, _ in ranked[offset:end]]
+
+
+def _filter_value(value: Any) -> Any:
+    # Les Enum pydantic et les chaînes brutes doivent être comparables
+    return getattr(value, "value", value)
+
+
+search_index = SearchIndex()
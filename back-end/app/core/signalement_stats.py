@@ -0,0 +1,120 @@
+# app/core/signalement_stats.py
+"""
+Compteurs agrégés des signalements (par status, catégorie, gravité et ville).
+
+Les compteurs sont mis à jour par delta dans les fonctions CRUD et recalés
+périodiquement sur un GROUP BY, ce qui corrige aussi les écritures faites
+par un autre worker ou directement en base.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.signalement import Signalement
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("status", "categorie", "gravite", "ville")
+
+# Nombre de tentatives si des deltas arrivent pendant le GROUP BY
+RECONCILE_ATTEMPTS = 3
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def dimensions_of(signalement: Any) -> Dict[str, Any]:
+    """Valeurs des dimensions comptées pour un signalement (objet ORM ou dict)."""
+    if isinstance(signalement, dict):
+        return {d: _value(signalement.get(d)) for d in DIMENSIONS}
+    return {d: _value(getattr(signalement, d, None)) for d in DIMENSIONS}
+
+
+class SignalementStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._total = 0
+        self._counts: Dict[str, Dict[Any, int]] = {d: {} for d in DIMENSIONS}
+        self._version = 0
+        self.reconciled_at: Optional[datetime] = None
+        self.last_drift = 0
+
+    def _add(self, values: Dict[str, Any], delta: int):
+        for dimension, value in values.items():
+            counts = self._counts[dimension]
+            count = counts.get(value, 0) + delta
+            if count:
+                counts[value] = count
+            else:
+                counts.pop(value, None)
+
+    def record_create(self, values: Dict[str, Any]):
+        with self._lock:
+            self._total += 1
+            self._add(values, 1)
+            self._version += 1
+
+    def record_update(self, before: Dict[str, Any], after: Dict[str, Any]):
+        if before == after:
+            return
+        with self._lock:
+            self._add(before, -1)
+            self._add(after, 1)
+            self._version += 1
+
+    def record_delete(self, values: Dict[str, Any]):
+        with self._lock:
+            self._total -= 1
+            self._add(values, -1)
+            self._version += 1
+
+    def reconcile(self, db: Session) -> bool:
+        """
+        Recaler les compteurs sur la base. Retourne False si des deltas
+        concurrents ont empêché un recalage cohérent.
+        """
+        for _ in range(RECONCILE_ATTEMPTS):
+            version = self._version
+            total = db.query(func.count(Signalement.id)).scalar() or 0
+            counts = {}
+            for dimension in DIMENSIONS:
+                column = getattr(Signalement, dimension)
+                rows = db.query(column, func.count(Signalement.id)).group_by(column).all()
+                counts[dimension] = {_value(value): count for value, count in rows if count}
+            db.rollback()
+            with self._lock:
+                if version != self._version:
+                    continue
+                drift = abs(self._total - total) + sum(
+                    abs(self._counts[d].get(k, 0) - counts[d].get(k, 0))
+                    for d in DIMENSIONS
+                    for k in set(self._counts[d]) | set(counts[d])
+                )
+                if drift and self.reconciled_at is not None:
+                    logger.warning(f"Signalement stats drifted by {drift}, counters reset from database")
+                self.last_drift = drift
+                self._total = total
+                self._counts = counts
+                self.reconciled_at = datetime.utcnow()
+                return True
+        logger.info("Signalement stats reconcile skipped: concurrent writes")
+        return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data = {"total": self._total}
+            for dimension in DIMENSIONS:
+                data[dimension] = {
+                    str(k) if k is not None else "": v for k, v in self._counts[dimension].items()
+                }
+            data["reconciled_at"] = self.reconciled_at
+            return data
+
+
+signalement_stats = SignalementStats()
@@ -0,0 +1,145 @@
+# app/core/spatial_index.py
+"""
+Index spatial en mémoire des signalements géolocalisés (latitude, longitude).
+
+Les points sont rangés dans une grille de cellules de CELL_DEGREES degrés :
+une recherche par rayon ou par rectangle ne parcourt que les cellules qui
+recouvrent la zone, puis filtre les candidats par distance (haversine), sans
+requête SQL. Comme l'index plein texte, l'index est propre à chaque
+processus : reconstruit au démarrage, tenu à jour par les fonctions CRUD et
+recalé périodiquement sur les modifications faites par les autres workers.
+Les zones qui traversent l'antiméridien (±180°) ne sont pas gérées.
+"""
+
+import math
+import threading
+from typing import Any, Collection, Dict, Iterable, List, Optional, Tuple
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+# ~1,1 km en latitude : un rayon de quelques centaines de mètres couvre 4 à 9 cellules
+CELL_DEGREES = 0.01
+
+Point = Tuple[float, float]
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance orthodromique en mètres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialIndex:
+    def __init__(self, cell_degrees: float = CELL_DEGREES):
+        self._lock = threading.RLock()
+        self.cell_degrees = cell_degrees
+        self._reset()
+        self.ready = False
+
+    def _reset(self):
+        # cellule (ligne, colonne) -> {id: (lat, lon)}, et id -> (lat, lon)
+        self._cells: Dict[Tuple[int, int], Dict[int, Point]] = {}
+        self._points: Dict[int, Point] = {}
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def _add(self, doc_id: int, lat: Optional[float], lon: Optional[float]):
+        self._remove(doc_id)
+        if lat is None or lon is None:
+            return
+        point = (float(lat), float(lon))
+        self._points[doc_id] = point
+        self._cells.setdefault(self._cell(*point), {})[doc_id] = point
+
+    def _remove(self, doc_id: int):
+        point = self._points.pop(doc_id, None)
+        if point is None:
+            return
+        key = self._cell(*point)
+        cell = self._cells.get(key)
+        if cell is not None:
+            cell.pop(doc_id, None)
+            if not cell:
+                del self._cells[key]
+
+    def index(self, signalement: Any):
+        """Ajouter ou déplacer un signalement (objet avec id, latitude, longitude)."""
+        with self._lock:
+            self._add(signalement.id, signalement.latitude, signalement.longitude)
+
+    def remove(self, signalement_id: int):
+        with self._lock:
+            self._remove(signalement_id)
+
+    def discard_missing(self, existing: Collection[int], max_id: int) -> int:
+        """Retirer les points d'id <= max_id absents de existing."""
+        with self._lock:
+            missing = [doc_id for doc_id in self._points if doc_id <= max_id and doc_id not in existing]
+            for doc_id in missing:
+                self._remove(doc_id)
+        return len(missing)
+
+    def rebuild(self, rows: Iterable[Any]):
+        """Reconstruire entièrement l'index à partir de lignes (id, latitude, longitude)."""
+        fresh = SpatialIndex(self.cell_degrees)
+        for row in rows:
+            fresh._add(row.id, row.latitude, row.longitude)
+        with self._lock:
+            self._cells = fresh._cells
+            self._points = fresh._points
+            self.ready = True
+
+    def _candidates(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> Iterable[Tuple[int, Point]]:
+        row_min, col_min = self._cell(min_lat, min_lon)
+        row_max, col_max = self._cell(max_lat, max_lon)
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._cells):
+            # Zone plus grande que l'ensemble des cellules occupées : on parcourt celles-ci
+            cells = [
+                cell for (row, col), cell in self._cells.items()
+                if row_min <= row <= row_max and col_min <= col <= col_max
+            ]
+        else:
+            cells = [
+                self._cells[(row, col)]
+                for row in range(row_min, row_max + 1)
+                for col in range(col_min, col_max + 1)
+                if (row, col) in self._cells
+            ]
+        for cell in cells:
+            yield from cell.items()
+
+    def within_box(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                   limit: Optional[int] = None) -> Tuple[int, List[int]]:
+        """Ids des points du rectangle, triés par id décroissant (plus récents d'abord)."""
+        with self._lock:
+            ids = [
+                doc_id for doc_id, (lat, lon) in self._candidates(min_lat, min_lon, max_lat, max_lon)
+                if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+            ]
+        ids.sort(reverse=True)
+        return len(ids), ids[:limit] if limit is not None else ids
+
+    def nearby(self, lat: float, lon: float, radius_m: float,
+               limit: Optional[int] = None) -> Tuple[int, List[Tuple[int, float]]]:
+        """Couples (id, distance en mètres) à moins de radius_m, du plus proche au plus lointain."""
+        dlat = radius_m / METERS_PER_DEGREE
+        dlon = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        with self._lock:
+            matches = []
+            for doc_id, (plat, plon) in self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon):
+                distance = haversine_m(lat, lon, plat, plon)
+                if distance <= radius_m:
+                    matches.append((doc_id, distance))
+        matches.sort(key=lambda match: (match[1], -match[0]))
+        return len(matches), matches[:limit] if limit is not None else matches
+
+
+spatial_index = SpatialIndex()
@@ -0,0 +1,37 @@
+# app/core/startup.py
+"""
+Durée des phases de démarrage d'un worker (schéma, index, pools, hachage...).
+
+Chaque phase est journalisée à sa fin et exposée dans /metrics
+(app_startup_phase_seconds) ; startup_report() donne le récapitulatif
+journalisé une fois le démarrage terminé.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from app.core.logging_config import log_event
+from app.core.metrics import STARTUP_PHASE
+
+logger = logging.getLogger("app.startup")
+
+_phases: Dict[str, float] = {}
+
+
+@contextmanager
+def startup_phase(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _phases[name] = elapsed
+        STARTUP_PHASE.set(elapsed, (name,))
+        log_event(logger, "startup phase", phase=name, duration_ms=round(elapsed * 1000, 1))
+
+
+def startup_report() -> dict:
+    phases = {name: round(seconds * 1000, 1) for name, seconds in _phases.items()}
+    return {"total_ms": round(sum(phases.values()), 1), "phases_ms": phases}
@@ -1,3 +1,3 @@
-from .signalement import get_all_signalements, create_signalement
+from .signalement import get_all_signalements, get_signalements_page, iter_signalements, create_signalement
 
-__all__ = ["get_all_signalements", "create_signalement"]
\ No newline at end of file
+__all__ = ["get_all_signalements", "get_signalements_page", "iter_signalements", "create_signalement"]
\ No newline at end of file
@@ -1,5 +1,10 @@
+from typing import Any, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.citizen import Citizen
+from app.core.login_guard import forget_unknown
+from app.core.principal_cache import invalidate_principal, invalidate_principal_async
 from app.schemas.citizen import CitizenCreate, CitizenUpdate
 
 def get_all_citizens(db: Session, skip: int = 0, limit: int = 100):
@@ -15,6 +20,7 @@ def create_citizen(db: Session, citizen: CitizenCreate):
     db_citizen = Citizen(**citizen.dict())
     db.add(db_citizen)
     db.commit()
+    forget_unknown(db_citizen.email)
     db.refresh(db_citizen)
     return db_citizen
 
@@ -25,6 +31,8 @@ def update_citizen(db: Session, citizen_id: int, citizen: CitizenUpdate):
         for key, value in update_data.items():
             setattr(db_citizen, key, value)
         db.commit()
+        invalidate_principal("citizen", citizen_id)
+        forget_unknown(update_data.get("email"))
         db.refresh(db_citizen)
     return db_citizen
 
@@ -33,4 +41,51 @@ def delete_citizen(db: Session, citizen_id: int):
     if db_citizen:
         db.delete(db_citizen)
         db.commit()
-    return db_citizen
\ No newline at end of file
+        invalidate_principal("citizen", citizen_id)
+    return db_citizen
+
+# Versions asynchrones, pour les routes async def (AsyncSession)
+
+async def get_all_citizens_async(db: AsyncSession, skip: int = 0, limit: int = 100,
+                                 columns: Optional[Sequence[Any]] = None):
+    # Avec columns : tuples de ces colonnes, sans instance ORM
+    if columns:
+        result = await db.execute(select(*columns).offset(skip).limit(limit))
+        return result.all()
+    result = await db.execute(select(Citizen).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_citizen_by_id_async(db: AsyncSession, citizen_id: int):
+    return await db.get(Citizen, citizen_id)
+
+async def get_citizen_by_email_async(db: AsyncSession, email: str):
+    result = await db.execute(select(Citizen).where(Citizen.email == email))
+    return result.scalars().first()
+
+async def create_citizen_async(db: AsyncSession, citizen: CitizenCreate):
+    db_citizen = Citizen(**citizen.model_dump())
+    db.add(db_citizen)
+    await db.commit()
+    forget_unknown(db_citizen.email)
+    await db.refresh(db_citizen)
+    return db_citizen
+
+async def update_citizen_async(db: AsyncSession, citizen_id: int, citizen: CitizenUpdate):
+    db_citizen = await get_citizen_by_id_async(db, citizen_id)
+    if db_citizen:
+        update_data = citizen.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_citizen, key, value)
+        await db.commit()
+        await invalidate_principal_async("citizen", citizen_id)
+        forget_unknown(update_data.get("email"))
+        await db.refresh(db_citizen)
+    return db_citizen
+
+async def delete_citizen_async(db: AsyncSession, citizen_id: int):
+    db_citizen = await get_citizen_by_id_async(db, citizen_id)
+    if db_citizen:
+        await db.delete(db_citizen)
+        await db.commit()
+        await invalidate_principal_async("citizen", citizen_id)
+    return db_citizen
@@ -1,135 +1,744 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+import uuid
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, bindparam, exists, func, insert, select, union_all, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from app.models.signalement import Signalement
-from app.schemas.signalement import SignalementCreate
-from typing import Dict, Any, Optional
+from app.models.signalement_archive import SignalementArchive
+from app.schemas.signalement import SignalementCreate, SignalementOut
+from app.core.search_index import search_index, INDEXED_COLUMNS
+from app.core.spatial_index import spatial_index
+from app.core.gazetteer import gazetteer
+from app.core.duplicate_index import duplicate_index, TEXT_FIELDS as DUPLICATE_TEXT_FIELDS
+from app.core.config import settings
+from app.core.event_hub import event_hub
+from app.core.jobs import enqueue, job_handler, PENDING
+from app.core.metrics import SIGNALEMENTS_ARCHIVED
+from app.models.job import Job
+from app.core.signalement_stats import signalement_stats, dimensions_of, DIMENSIONS
+from app.core.response_cache import invalidate_signalements
+from typing import Callable, Dict, Any, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+
+# Colonnes internes : ni exportées ni archivées
+INTERNAL_COLUMNS = ("bulk_token",)
+
+# Colonnes copiées dans signalements_archive (et lues par include_archived)
+ARCHIVED_COLUMNS = tuple(c.name for c in Signalement.__table__.columns if c.name not in INTERNAL_COLUMNS)
+
+# Colonnes exportées par /signalements/export, dans l'ordre des fichiers produits
+EXPORT_COLUMNS = tuple(name for name in ARCHIVED_COLUMNS if name != "version")
+
+# Incrément du compteur de modifications, pour les UPDATE hors unité de travail de l'ORM
+NEXT_VERSION = {Signalement.version: Signalement.version + 1}
+
+# Tâche de fond de recherche des doublons après une création
+LINK_DUPLICATES_JOB = "signalements.link_duplicates"
+
+# Champs des événements created / updated de /signalements/stream
+EVENT_FIELDS = tuple(SignalementOut.model_fields)
+
+# Tâche de fond d'archivage des signalements résolus (se reprogramme elle-même)
+ARCHIVE_JOB = "signalements.archive"
+ARCHIVED_STATUS = "résolu"
+
+# Signalements et signalements archivés (UNION ALL) vus comme une seule entité,
+# pour include_archived=true : à interroger par colonnes (tuples), pas par instances
+ALL_SIGNALEMENTS = aliased(Signalement, union_all(
+    select(*[Signalement.__table__.c[name] for name in ARCHIVED_COLUMNS]),
+    select(*[SignalementArchive.__table__.c[name] for name in ARCHIVED_COLUMNS]),
+).subquery("signalements_all"), name="signalements_all")
+
+def signalement_source(include_archived: bool = False):
+    return ALL_SIGNALEMENTS if include_archived else Signalement
+
+def _source_columns(source, columns: Optional[Sequence[Any]]):
+    """Colonnes demandées (attributs de Signalement) prises sur source ; toutes pour l'union."""
+    if source is Signalement:
+        return columns
+    return [getattr(source, column.key) for column in columns] if columns else [
+        getattr(source, name) for name in EXPORT_COLUMNS]
+
+def _publish(kind: str, signalement: Any, **overrides):
+    data = {name: getattr(signalement, name, None) for name in EVENT_FIELDS}
+    data.update(overrides)
+    event_hub.publish(kind, data)
 
 def get_all_signalements(db: Session):
     return db.query(Signalement).all()
 
+def _keyset_order(query, source=Signalement):
+    # Ordre stable : plus récent en premier, id pour départager les égalités
+    return query.order_by(source.created_at.desc(), source.id.desc())
+
+# Format commun des instants comparés sous SQLite (millisecondes)
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%f"
+
+def _comparable_timestamp(db: Session, column, value: datetime):
+    """
+    Colonne et valeur d'horodatage comparables entre elles. SQLite stocke les
+    TIMESTAMP en texte, au format du défaut serveur ('AAAA-MM-JJ HH:MM:SS')
+    alors qu'un datetime lié est rendu avec ses microsecondes : les deux
+    côtés sont ramenés au même format. Les autres bases comparent directement.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.strftime(SQLITE_TIMESTAMP_FORMAT, column),
+                func.strftime(SQLITE_TIMESTAMP_FORMAT, value.isoformat(" ")))
+    return column, value
+
+def _after_cursor(query, cursor: Tuple[Optional[datetime], int], source=Signalement):
+    created_at, last_id = cursor
+    if created_at is None:
+        # Les created_at NULL sont placés en fin de tri descendant
+        return query.filter(and_(source.created_at.is_(None), source.id < last_id))
+    column, value = _comparable_timestamp(query.session, source.created_at, created_at)
+    return query.filter(or_(
+        column < value,
+        and_(column == value, source.id < last_id),
+        source.created_at.is_(None),
+    ))
+
+def get_signalements_page(db: Session, limit: int,
+                          cursor: Optional[Tuple[Optional[datetime], int]] = None,
+                          columns: Optional[Sequence[Any]] = None,
+                          include_archived: bool = False) -> Tuple[List[Signalement], bool]:
+    """
+    Récupérer une page de signalements triée sur (created_at, id).
+    Retourne les lignes et un booléen indiquant s'il reste des lignes après la page.
+    Avec columns, les lignes sont des tuples de ces colonnes (sans instance ORM).
+    Avec include_archived, les signalements archivés sont inclus (tuples).
+    """
+    source = signalement_source(include_archived)
+    columns = _source_columns(source, columns)
+    query = _keyset_order(db.query(*columns) if columns else db.query(Signalement), source)
+    if cursor is not None:
+        query = _after_cursor(query, cursor, source)
+    rows = query.limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+def iter_signalements(db: Session, batch_size: int = 1000, include_archived: bool = False) -> Iterator[Signalement]:
+    """
+    Parcourir tous les signalements via un curseur côté serveur,
+    sans charger la table entière en mémoire.
+    """
+    source = signalement_source(include_archived)
+    columns = _source_columns(source, None)
+    query = _keyset_order(db.query(*columns) if columns else db.query(Signalement), source)
+    return query.execution_options(stream_results=True).yield_per(batch_size)
+
+def _geocode(values: Dict[str, Any]) -> Dict[str, Any]:
+    # Sans coordonnées fournies, celles d'un lieu connu cité dans la localisation
+    if values.get("latitude") is None:
+        point = gazetteer.geocode(values.get("localisation"), values.get("ville"))
+        if point is not None:
+            values["latitude"], values["longitude"] = point
+    return values
+
 def create_signalement(db: Session, signalement: SignalementCreate):
-    db_signalement = Signalement(**signalement.model_dump())
+    db_signalement = Signalement(**_geocode(signalement.model_dump()))
     db.add(db_signalement)
+    if settings.DUPLICATE_DETECTION:
+        # Recherche des doublons en tâche de fond, validée avec le signalement
+        db.flush()
+        enqueue(db, LINK_DUPLICATES_JOB, {"ids": [db_signalement.id]})
     db.commit()
     db.refresh(db_signalement)
+    search_index.index(db_signalement)
+    spatial_index.index(db_signalement)
+    signalement_stats.record_create(dimensions_of(db_signalement))
+    invalidate_signalements()
+    _publish("created", db_signalement)
     return db_signalement
 
-def update_signalement(db: Session, signalement_id: int, signalement_data: dict):
-    signalement = db.query(Signalement).filter(Signalement.id == signalement_id).first()
+class SignalementConflict(Exception):
+    """La version courante du signalement ne satisfait pas la précondition (If-Match)."""
+
+def get_signalement(db: Session, signalement_id: int) -> Optional[Signalement]:
+    return db.query(Signalement).filter(Signalement.id == signalement_id).first()
+
+def get_signalement_version(db: Session, signalement_id: int):
+    """Version et date de dernière modification d'un signalement, sans charger la ligne (None si absent)."""
+    return (db.query(Signalement.version, Signalement.updated_at)
+            .filter(Signalement.id == signalement_id).first())
+
+def get_collection_version(db: Session, search_params: Optional[Dict[str, Any]] = None,
+                           include_archived: bool = False) -> Tuple[Tuple[Any, ...], Optional[datetime]]:
+    """
+    Empreinte (nombre de lignes, max(id), somme des versions) et
+    max(updated_at) des signalements correspondant aux filtres exacts, en une
+    requête d'agrégat. Toute modification incrémente une version, toute
+    création augmente max(id) et toute suppression change le nombre de
+    lignes : l'empreinte change même pour des écritures dans la même seconde.
+    Les critères textuels sont ignorés : l'ensemble mesuré contient toujours
+    les résultats de la recherche.
+    """
+    exact_params = {k: v for k, v in (search_params or {}).items() if k not in TEXT_SEARCH_FIELDS}
+    source = signalement_source(include_archived)
+    query = db.query(func.count(source.id), func.max(source.id), func.sum(source.version),
+                     func.max(source.updated_at))
+    conditions = _search_conditions(exact_params, source)
+    if conditions:
+        query = query.filter(and_(*conditions))
+    count, last_id, versions, last_modified = query.one()
+    return (count, last_id, int(versions or 0)), last_modified
+
+def update_signalement(db: Session, signalement_id: int, signalement_data: dict,
+                       precondition: Optional[Callable[[Signalement], bool]] = None):
+    """
+    Modifier un signalement. Si precondition est fournie, elle est vérifiée
+    sur la ligne lue, puis l'UPDATE ... WHERE version = :lue la rend atomique :
+    SignalementConflict est levée si elle n'est pas satisfaite ou si la ligne
+    a changé entre-temps. Sans precondition, la ligne est verrouillée
+    (SELECT ... FOR UPDATE) et la dernière écriture l'emporte.
+    """
+    query = db.query(Signalement).filter(Signalement.id == signalement_id)
+    if precondition is None:
+        query = query.with_for_update()
+    signalement = query.first()
     if not signalement:
         return None
+    if precondition is not None and not precondition(signalement):
+        db.rollback()
+        raise SignalementConflict(signalement_id)
+    before = dimensions_of(signalement)
+    place_changed = any(key in signalement_data and signalement_data[key] != getattr(signalement, key)
+                         for key in ("localisation", "ville"))
     for key, value in signalement_data.items():
         setattr(signalement, key, value)
-    db.commit()
+    if place_changed and "latitude" not in signalement_data:
+        # Lieu modifié sans coordonnées : elles sont recalculées, et gardées si le lieu est inconnu
+        point = gazetteer.geocode(signalement.localisation, signalement.ville)
+        if point is not None:
+            signalement.latitude, signalement.longitude = point
+    try:
+        db.commit()
+    except StaleDataError:
+        # Version changée depuis la lecture : l'UPDATE n'a modifié aucune ligne
+        db.rollback()
+        if precondition is not None:
+            raise SignalementConflict(signalement_id)
+        return update_signalement(db, signalement_id, signalement_data)
     db.refresh(signalement)
+    search_index.index(signalement)
+    spatial_index.index(signalement)
+    if settings.DUPLICATE_DETECTION:
+        duplicate_index.index(signalement)
+    signalement_stats.record_update(before, dimensions_of(signalement))
+    invalidate_signalements()
+    _publish("updated", signalement)
+    return signalement
+
+def delete_signalement(db: Session, signalement_id: int):
+    signalement = db.query(Signalement).filter(Signalement.id == signalement_id).first()
+    if signalement:
+        values = dimensions_of(signalement)
+        deleted = {"id": signalement_id, "ville": signalement.ville,
+                   "categorie": signalement.categorie, "gravite": signalement.gravite}
+        # Ses doublons ne sont plus rattachés (ON DELETE SET NULL, appliqué ici aussi pour SQLite)
+        db.query(Signalement).filter(Signalement.duplicate_of == signalement_id).update(
+            {Signalement.duplicate_of: None, **NEXT_VERSION}, synchronize_session=False)
+        db.delete(signalement)
+        db.commit()
+        search_index.remove(signalement_id)
+        spatial_index.remove(signalement_id)
+        duplicate_index.remove(signalement_id)
+        signalement_stats.record_delete(values)
+        invalidate_signalements()
+        event_hub.publish("deleted", deleted)
     return signalement
 
-def search_signalements(db: Session, search_params: Dict[str, Any]):
+# Champs modifiables par PATCH /signalements/batch
+BATCH_UPDATE_FIELDS = ("status", "gravite")
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _batch_targets(db: Session, ids: Optional[Sequence[int]], search_params: Optional[Dict[str, Any]],
+                   chunk_size: int) -> Iterator[List[Any]]:
+    """
+    Lignes (id et dimensions des compteurs) visées par une opération groupée,
+    verrouillées (SELECT ... FOR UPDATE) par tranches de chunk_size : les ids
+    donnés, ou les signalements correspondant aux critères de recherche.
+    Les critères textuels sont résolus en ids comme dans search_signalements
+    (index plein texte s'il est prêt) : la cible est celle que /search affiche.
+    """
+    columns = [Signalement.id] + [getattr(Signalement, d) for d in DIMENSIONS]
+    search_params = search_params or {}
+    conditions = []
+    if ids is None and _text_clauses(search_params) and search_index.ready:
+        ids = [row.id for row in search_signalements(db, search_params, columns=[Signalement.id])]
+        # Filtres exacts revérifiés au verrouillage : une ligne modifiée entre-temps est écartée
+        conditions = _search_conditions(_exact_filters(search_params))
+    if ids is not None:
+        for chunk in _chunks(sorted(set(ids)), chunk_size):
+            yield db.query(*columns).filter(Signalement.id.in_(chunk), *conditions).with_for_update().all()
+        return
+    conditions = _search_conditions(search_params)
+    last_id = 0
+    while True:
+        # Parcours par id croissant : une tranche modifiée ou supprimée n'est pas relue
+        rows = (db.query(*columns).filter(*conditions, Signalement.id > last_id)
+                .order_by(Signalement.id).limit(chunk_size).with_for_update().all())
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+def batch_update_signalements(db: Session, values: Dict[str, Any], ids: Optional[Sequence[int]] = None,
+                              search_params: Optional[Dict[str, Any]] = None,
+                              chunk_size: Optional[int] = None) -> Tuple[int, List[int]]:
+    """
+    Modifier status et/ou gravite de plusieurs signalements en une transaction,
+    avec un UPDATE ... WHERE id IN (...) par tranche. Retourne le nombre de
+    signalements modifiés et les ids demandés introuvables.
+    """
+    chunk_size = chunk_size or settings.BATCH_CHUNK_SIZE
+    assignments = {**{getattr(Signalement, key): value for key, value in values.items()}, **NEXT_VERSION}
+    changed = []
+    try:
+        for rows in _batch_targets(db, ids, search_params, chunk_size):
+            if not rows:
+                continue
+            db.query(Signalement).filter(Signalement.id.in_([row.id for row in rows])).update(
+                assignments, synchronize_session=False)
+            changed.extend((row.id, dimensions_of(row)) for row in rows)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    for _, before in changed:
+        signalement_stats.record_update(before, {**before, **values})
+    if changed:
+        invalidate_signalements()
+    # Lignes relues après le commit (updated_at) pour l'index et les événements
+    columns = [getattr(Signalement, name) for name in EVENT_FIELDS]
+    for chunk in _chunks([i for i, _ in changed], chunk_size):
+        for row in db.query(*columns).filter(Signalement.id.in_(chunk)).order_by(Signalement.id):
+            search_index.index(row)
+            _publish("updated", row)
+    db.rollback()
+    found = {i for i, _ in changed}
+    not_found = sorted(set(ids) - found) if ids is not None else []
+    return len(changed), not_found
+
+def batch_delete_signalements(db: Session, ids: Optional[Sequence[int]] = None,
+                              search_params: Optional[Dict[str, Any]] = None,
+                              chunk_size: Optional[int] = None) -> Tuple[int, List[int]]:
+    """
+    Supprimer plusieurs signalements en une transaction, avec un
+    DELETE ... WHERE id IN (...) par tranche. Retourne le nombre de
+    signalements supprimés et les ids demandés introuvables.
+    """
+    chunk_size = chunk_size or settings.BATCH_CHUNK_SIZE
+    deleted = []
+    try:
+        for rows in _batch_targets(db, ids, search_params, chunk_size):
+            if not rows:
+                continue
+            chunk = [row.id for row in rows]
+            # Leurs doublons ne sont plus rattachés (ON DELETE SET NULL, appliqué ici aussi pour SQLite)
+            db.query(Signalement).filter(Signalement.duplicate_of.in_(chunk)).update(
+                {Signalement.duplicate_of: None, **NEXT_VERSION}, synchronize_session=False)
+            db.query(Signalement).filter(Signalement.id.in_(chunk)).delete(synchronize_session=False)
+            deleted.extend(rows)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    for row in deleted:
+        search_index.remove(row.id)
+        spatial_index.remove(row.id)
+        duplicate_index.remove(row.id)
+        signalement_stats.record_delete(dimensions_of(row))
+    if deleted:
+        invalidate_signalements()
+    for row in deleted:
+        event_hub.publish("deleted", {"id": row.id, "ville": row.ville,
+                                      "categorie": row.categorie, "gravite": row.gravite})
+    found = {row.id for row in deleted}
+    not_found = sorted(set(ids) - found) if ids is not None else []
+    return len(deleted), not_found
+
+def bulk_insert_signalements(db: Session, rows: List[Tuple[int, Dict[str, Any]]]) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Insérer un lot de signalements déjà validés en une seule transaction
+    (INSERT multi-lignes via executemany).
+
+    rows contient des couples (position dans la requête, valeurs). Si le lot
+    échoue (ex. citizen_id inconnu), il est rejoué ligne par ligne pour
+    n'écarter que les lignes fautives. Retourne le nombre de lignes insérées
+    et les erreurs par ligne.
+
+    executemany ne renvoie pas les ids sur MySQL : les lignes du lot portent
+    un jeton (bulk_token) qui permet de les relire sans confondre celles
+    insérées en même temps par une autre requête.
+    """
+    if not rows:
+        return 0, []
+    errors = []
+    token = uuid.uuid4().hex
+    for _, values in rows:
+        _geocode(values)
+        values["bulk_token"] = token
+
+    def enqueue_link_duplicates():
+        # Tâche validée dans la même transaction que les lignes du lot
+        if settings.DUPLICATE_DETECTION:
+            ids = [i for (i,) in db.query(Signalement.id).filter(Signalement.bulk_token == token)
+                   .order_by(Signalement.id)]
+            if ids:
+                enqueue(db, LINK_DUPLICATES_JOB, {"ids": ids})
+
+    try:
+        db.execute(insert(Signalement.__table__), [values for _, values in rows])
+        enqueue_link_duplicates()
+        db.commit()
+        inserted = [values for _, values in rows]
+    except SQLAlchemyError:
+        db.rollback()
+        inserted = []
+        for index, values in rows:
+            savepoint = db.begin_nested()
+            try:
+                db.execute(insert(Signalement.__table__), [values])
+                savepoint.commit()
+                inserted.append(values)
+            except SQLAlchemyError as e:
+                savepoint.rollback()
+                errors.append({"index": index, "errors": [str(e.orig if hasattr(e, "orig") else e)]})
+        enqueue_link_duplicates()
+        db.commit()
+
+    for values in inserted:
+        signalement_stats.record_create(dimensions_of(values))
+    # Lignes du lot relues par leur jeton pour les index et les événements
+    columns = ([Signalement.id] + [getattr(Signalement, c) for c in INDEXED_COLUMNS]
+               + [Signalement.latitude, Signalement.longitude, Signalement.duplicate_of,
+                  Signalement.created_at, Signalement.updated_at])
+    added = db.query(*columns).filter(Signalement.bulk_token == token).order_by(Signalement.id).all()
+    for row in added:
+        search_index.index(row)
+        spatial_index.index(row)
+    db.rollback()
+    if inserted:
+        invalidate_signalements()
+    for row in added:
+        _publish("created", row)
+    return len(inserted), errors
+
+@job_handler(LINK_DUPLICATES_JOB)
+def link_duplicates_job(db: Session, payload: Dict[str, Any]):
+    """
+    Tâche de fond : rattacher les signalements payload["ids"] à leur original
+    (index des doublons, puis lignes précédentes du lot) et les indexer.
+    Idempotente : une ligne déjà rattachée est seulement réindexée.
+    """
+    columns = [getattr(Signalement, name) for name in EVENT_FIELDS]
+    rows = db.query(*columns).filter(Signalement.id.in_(payload["ids"])).order_by(Signalement.id).all()
+    links = duplicate_index.link_batch(rows)
+    if not links:
+        return
+    table = Signalement.__table__
+    db.execute(
+        update(table).where(table.c.id == bindparam("link_id"))
+        .values(duplicate_of=bindparam("link_duplicate_of"), version=table.c.version + 1),
+        [{"link_id": i, "link_duplicate_of": o} for i, o in links.items()])
+    db.commit()
+    invalidate_signalements()
+    for row in rows:
+        if row.id in links:
+            _publish("updated", row, duplicate_of=links[row.id])
+
+def get_archived_signalement(db: Session, signalement_id: int) -> Optional[SignalementArchive]:
+    return db.get(SignalementArchive, signalement_id)
+
+def archive_signalements(db: Session, older_than: datetime, batch_size: int) -> int:
+    """
+    Déplacer au plus batch_size signalements résolus non modifiés depuis
+    older_than vers signalements_archive (INSERT ... SELECT puis DELETE, en
+    une transaction). Les originaux encore désignés par un doublon de la
+    table courante restent en place. Retourne le nombre de signalements archivés.
+    """
+    duplicate = aliased(Signalement)
+    columns = [Signalement.id] + [getattr(Signalement, d) for d in DIMENSIONS]
+    try:
+        rows = (db.query(*columns)
+                .filter(Signalement.status == ARCHIVED_STATUS, Signalement.updated_at < older_than,
+                        ~exists().where(duplicate.duplicate_of == Signalement.id))
+                .order_by(Signalement.updated_at).limit(batch_size)
+                .with_for_update(skip_locked=True).all())
+        if not rows:
+            db.rollback()
+            return 0
+        ids = [row.id for row in rows]
+        table = Signalement.__table__
+        db.execute(insert(SignalementArchive.__table__).from_select(
+            list(ARCHIVED_COLUMNS), select(*[table.c[name] for name in ARCHIVED_COLUMNS]).where(table.c.id.in_(ids))))
+        db.query(Signalement).filter(Signalement.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    # Hors de la table courante : plus dans les index, les compteurs ni les listes par défaut
+    for row in rows:
+        search_index.remove(row.id)
+        spatial_index.remove(row.id)
+        duplicate_index.remove(row.id)
+        signalement_stats.record_delete(dimensions_of(row))
+    invalidate_signalements()
+    for row in rows:
+        event_hub.publish("archived", {"id": row.id, "ville": row.ville,
+                                       "categorie": row.categorie, "gravite": row.gravite})
+    SIGNALEMENTS_ARCHIVED.inc(amount=len(rows))
+    return len(rows)
+
+def schedule_archive_job(db: Session, delay: float = 0.0):
+    """Programmer l'archivage s'il n'est pas déjà en attente (démarrage, fin d'un lot)."""
+    pending = db.query(Job.id).filter(Job.kind == ARCHIVE_JOB, Job.status == PENDING).first()
+    if pending is None:
+        enqueue(db, ARCHIVE_JOB, {}, delay=delay)
+
+@job_handler(ARCHIVE_JOB)
+def archive_job(db: Session, payload: Dict[str, Any]):
+    """
+    Tâche de fond : archiver un lot, puis se reprogrammer après
+    ARCHIVE_BATCH_PAUSE si le lot était plein (rattrapage limité en débit),
+    après ARCHIVE_INTERVAL sinon.
+    """
+    if not settings.ARCHIVE_ENABLED:
+        return
+    older_than = datetime.utcnow() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    archived = archive_signalements(db, older_than, settings.ARCHIVE_BATCH_SIZE)
+    full = archived >= settings.ARCHIVE_BATCH_SIZE
+    schedule_archive_job(db, settings.ARCHIVE_BATCH_PAUSE if full else settings.ARCHIVE_INTERVAL)
+
+def rebuild_search_index(db: Session, batch_size: int = 1000):
+    """
+    Reconstruire l'index plein texte à partir de la table, par lots.
+    """
+    columns = [Signalement.id] + [getattr(Signalement, c) for c in INDEXED_COLUMNS]
+    rows = db.query(*columns).execution_options(stream_results=True).yield_per(batch_size)
+    search_index.rebuild(rows)
+    return len(search_index)
+
+def rebuild_spatial_index(db: Session, batch_size: int = 1000):
+    """
+    Reconstruire l'index spatial à partir des signalements géolocalisés.
+    """
+    rows = (db.query(Signalement.id, Signalement.latitude, Signalement.longitude)
+            .filter(Signalement.latitude.isnot(None), Signalement.longitude.isnot(None))
+            .execution_options(stream_results=True).yield_per(batch_size))
+    spatial_index.rebuild(rows)
+    return len(spatial_index)
+
+def rebuild_duplicate_index(db: Session, batch_size: int = 1000):
     """
-    Rechercher des signalements selon différents critères
+    Reconstruire l'index des doublons à partir des signalements les plus
+    récents (au plus DUPLICATE_INDEX_SIZE), par lots.
     """
-    query = db.query(Signalement)
+    columns = [Signalement.id, Signalement.ville, Signalement.categorie, Signalement.duplicate_of]
+    stmt = select(*columns, *[getattr(Signalement, c) for c in DUPLICATE_TEXT_FIELDS]).order_by(Signalement.id)
+    oldest = (db.query(Signalement.id).order_by(Signalement.id.desc())
+              .offset(duplicate_index.max_entries - 1).limit(1).scalar())
+    if oldest is not None:
+        stmt = stmt.where(Signalement.id >= oldest)
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    duplicate_index.rebuild(result.partitions())
+    return len(duplicate_index)
+
+# Marge de relecture : une écriture validée après la lecture du filigrane
+# peut porter un updated_at (pris à l'exécution) légèrement antérieur
+INDEX_REFRESH_OVERLAP = timedelta(seconds=5)
+
+# Colonnes lues pour réindexer une ligne dans les trois index
+_REFRESH_COLUMNS = tuple(dict.fromkeys(
+    ("id",) + INDEXED_COLUMNS + ("latitude", "longitude", "duplicate_of") + DUPLICATE_TEXT_FIELDS
+))
+
+def refresh_indexes(db: Session, since: Optional[datetime], batch_size: int = 1000) -> Optional[datetime]:
+    """
+    Reporter dans les index en mémoire les écritures des autres processus.
+    Les signalements modifiés depuis since (moins INDEX_REFRESH_OVERLAP) sont
+    réindexés ; si les index ne comptent plus autant de lignes que la table,
+    les ids supprimés ou archivés ailleurs en sont retirés. Retourne le
+    filigrane (max(updated_at)) à passer à l'appel suivant ; sans since,
+    se contente de le lire.
+    """
+    watermark = db.query(func.max(Signalement.updated_at)).scalar()
+    if since is None:
+        db.rollback()
+        return watermark
+    column, value = _comparable_timestamp(db, Signalement.updated_at, since - INDEX_REFRESH_OVERLAP)
+    rows = (db.query(*[getattr(Signalement, c) for c in _REFRESH_COLUMNS])
+            .filter(column >= value)
+            .execution_options(stream_results=True).yield_per(batch_size))
+    for row in rows:
+        search_index.index(row)
+        spatial_index.index(row)
+        if settings.DUPLICATE_DETECTION:
+            duplicate_index.index(row)
+
+    total = db.query(func.count(Signalement.id)).scalar() or 0
+    located = (db.query(func.count(Signalement.id))
+               .filter(Signalement.latitude.isnot(None), Signalement.longitude.isnot(None)).scalar() or 0)
+    if len(search_index) != total or len(spatial_index) != located:
+        existing = {signalement_id for (signalement_id,) in db.query(Signalement.id)}
+        # Les ids créés ici après cette lecture sont plus grands : ils sont gardés
+        max_id = max(existing, default=0)
+        for index in (search_index, spatial_index, duplicate_index):
+            index.discard_missing(existing, max_id)
+    db.rollback()
+    return watermark or since
+
+def get_duplicates(db: Session, signalement_id: int, columns: Optional[Sequence[Any]] = None):
+    """Signalements rattachés à signalement_id comme doublons, du plus ancien au plus récent."""
+    query = db.query(*columns) if columns is not None else db.query(Signalement)
+    return query.filter(Signalement.duplicate_of == signalement_id).order_by(Signalement.id).all()
+
+def _get_by_ranked_ids(db: Session, ids: List[int], columns: Optional[Sequence[Any]] = None):
+    # Recharger uniquement la page demandée, dans l'ordre de pertinence
+    # (columns doit contenir Signalement.id)
+    if not ids:
+        return []
+    query = db.query(*columns) if columns else db.query(Signalement)
+    rows = query.filter(Signalement.id.in_(ids)).all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+# Paramètres de recherche textuelle, servis par l'index plein texte (en SQL,
+# ILIKE, pour les archives et tant que l'index n'est pas construit)
+TEXT_SEARCH_FIELDS = ("q", "titre", "ville", "description")
+
+def _text_clauses(search_params: Dict[str, Any]) -> List[Tuple[str, Optional[Tuple[str, ...]]]]:
+    """Clauses de l'index plein texte : q sur tous les champs, les autres sur leur seul champ."""
+    clauses = []
+    for key in TEXT_SEARCH_FIELDS:
+        value = search_params.get(key)
+        if value and value.strip():
+            clauses.append((value.strip(), None if key == "q" else (key,)))
+    return clauses
+
+def _exact_filters(search_params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: search_params[key].strip() if isinstance(search_params[key], str) else search_params[key]
+        for key in ("categorie", "status", "gravite", "citizen_id")
+        if search_params.get(key)
+    }
+
+def _search_conditions(search_params: Dict[str, Any], source=Signalement) -> list:
+    """Conditions SQL (ILIKE et filtres exacts) correspondant aux critères de recherche."""
     conditions = []
     
     # Recherche par titre (insensible à la casse, recherche partielle)
     if search_params.get("titre") and search_params["titre"].strip():
-        conditions.append(Signalement.titre.ilike(f"%{search_params['titre'].strip()}%"))
+        conditions.append(source.titre.ilike(f"%{search_params['titre'].strip()}%"))
     
     # Recherche par ville (insensible à la casse, recherche partielle)
     if search_params.get("ville") and search_params["ville"].strip():
-        conditions.append(Signalement.ville.ilike(f"%{search_params['ville'].strip()}%"))
+        conditions.append(source.ville.ilike(f"%{search_params['ville'].strip()}%"))
     
     # Filtre par catégorie (exact)
     if search_params.get("categorie") and search_params["categorie"].strip():
-        conditions.append(Signalement.categorie == search_params["categorie"].strip())
+        conditions.append(source.categorie == search_params["categorie"].strip())
     
     # Filtre par status (exact)
     if search_params.get("status") and search_params["status"].strip():
-        conditions.append(Signalement.status == search_params["status"].strip())
+        conditions.append(source.status == search_params["status"].strip())
     
     # Filtre par gravité (exact)
     if search_params.get("gravite") and search_params["gravite"].strip():
-        conditions.append(Signalement.gravite == search_params["gravite"].strip())
+        conditions.append(source.gravite == search_params["gravite"].strip())
     
     # Filtre par citizen_id (exact)
     if search_params.get("citizen_id") and search_params["citizen_id"] > 0:
-        conditions.append(Signalement.citizen_id == search_params["citizen_id"])
+        conditions.append(source.citizen_id == search_params["citizen_id"])
     
     # Recherche dans la description (insensible à la casse, recherche partielle)
     if search_params.get("description") and search_params["description"].strip():
-        conditions.append(Signalement.description.ilike(f"%{search_params['description'].strip()}%"))
+        conditions.append(source.description.ilike(f"%{search_params['description'].strip()}%"))
+    
+    # Recherche libre sur tous les champs texte (export, ou index pas encore prêt)
+    if search_params.get("q") and search_params["q"].strip():
+        term = f"%{search_params['q'].strip()}%"
+        conditions.append(or_(
+            source.titre.ilike(term),
+            source.description.ilike(term),
+            source.commentaire.ilike(term),
+            source.ville.ilike(term),
+            source.localisation.ilike(term)
+        ))
+    return conditions
+
+def search_signalements(db: Session, search_params: Dict[str, Any],
+                        skip: int = 0, limit: Optional[int] = None,
+                        columns: Optional[Sequence[Any]] = None,
+                        include_archived: bool = False):
+    """
+    Rechercher des signalements selon différents critères.
+    Les critères textuels (q, titre, ville, description) passent par l'index
+    plein texte : q sur tous les champs, les autres limités à leur champ (par
+    préfixe) ; les résultats sont classés par pertinence, filtres exacts compris.
+    Sans critère textuel, ou si l'index n'est pas prêt, la recherche est un
+    filtre SQL (ILIKE et égalité) trié par date.
+    Avec columns, les lignes sont des tuples de ces colonnes (sans instance ORM).
+    Avec include_archived, la recherche porte aussi sur les signalements
+    archivés, en SQL (l'index ne contient que la table courante).
+    """
+    clauses = _text_clauses(search_params)
+    if clauses and search_index.ready and not include_archived:
+        _, ids = search_index.search(clauses, filters=_exact_filters(search_params), offset=skip, limit=limit)
+        return _get_by_ranked_ids(db, ids, columns)
+
+    source = signalement_source(include_archived)
+    columns = _source_columns(source, columns)
+    query = db.query(*columns) if columns else db.query(Signalement)
+    conditions = _search_conditions(search_params, source)
     
     # Appliquer tous les filtres avec AND
     if conditions:
         query = query.filter(and_(*conditions))
     
     # Ordonner par date de création (plus récent en premier)
-    return query.order_by(Signalement.created_at.desc()).all()
+    query = query.order_by(source.created_at.desc())
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
 
-def search_signalements_advanced(db: Session, 
-                               titre: Optional[str] = None,
-                               ville: Optional[str] = None,
-                               localisation: Optional[str] = None,
-                               categories: Optional[list] = None,
-                               statuses: Optional[list] = None,
-                               gravites: Optional[list] = None,
-                               citizen_id: Optional[int] = None,
-                               text_search: Optional[str] = None):
+def nearby_signalements(db: Session, lat: float, lon: float, radius_m: float,
+                        limit: Optional[int] = None, columns: Optional[Sequence[Any]] = None):
     """
-    Recherche avancée avec plus d'options
+    Signalements à moins de radius_m mètres du point, du plus proche au plus
+    lointain, trouvés par l'index spatial. Retourne le nombre total de
+    signalements dans le rayon et les couples (ligne, distance en mètres).
     """
-    query = db.query(Signalement)
-    conditions = []
-    
-    # Recherche textuelle dans titre, description et commentaire
-    if text_search and text_search.strip():
-        text_search = text_search.strip()
-        text_conditions = [
-            Signalement.titre.ilike(f"%{text_search}%"),
-            Signalement.description.ilike(f"%{text_search}%"),
-            Signalement.commentaire.ilike(f"%{text_search}%")
-        ]
-        conditions.append(or_(*text_conditions))
-    
-    # Recherche par titre spécifique
-    if titre and titre.strip():
-        conditions.append(Signalement.titre.ilike(f"%{titre.strip()}%"))
-    
-    # Recherche par ville
-    if ville and ville.strip():
-        conditions.append(Signalement.ville.ilike(f"%{ville.strip()}%"))
-    
-    # Recherche par localisation
-    if localisation and localisation.strip():
-        conditions.append(Signalement.localisation.ilike(f"%{localisation.strip()}%"))
-    
-    # Filtre par multiples catégories
-    if categories and len(categories) > 0:
-        # Nettoyer les catégories vides
-        clean_categories = [cat.strip() for cat in categories if cat and cat.strip()]
-        if clean_categories:
-            conditions.append(Signalement.categorie.in_(clean_categories))
-    
-    # Filtre par multiples statuts
-    if statuses and len(statuses) > 0:
-        # Nettoyer les statuts vides
-        clean_statuses = [status.strip() for status in statuses if status and status.strip()]
-        if clean_statuses:
-            conditions.append(Signalement.status.in_(clean_statuses))
-    
-    # Filtre par multiples gravités
-    if gravites and len(gravites) > 0:
-        # Nettoyer les gravités vides
-        clean_gravites = [gravite.strip() for gravite in gravites if gravite and gravite.strip()]
-        if clean_gravites:
-            conditions.append(Signalement.gravite.in_(clean_gravites))
-    
-    # Filtre par citizen_id
-    if citizen_id and citizen_id > 0:
-        conditions.append(Signalement.citizen_id == citizen_id)
-    
-    # Appliquer tous les filtres
+    total, matches = spatial_index.nearby(lat, lon, radius_m, limit=limit)
+    distances = dict(matches)
+    rows = _get_by_ranked_ids(db, [doc_id for doc_id, _ in matches], columns)
+    return total, [(row, distances[row.id]) for row in rows]
+
+def signalements_in_box(db: Session, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                        limit: Optional[int] = None, columns: Optional[Sequence[Any]] = None):
+    """Signalements du rectangle (plus récents d'abord) et leur nombre total."""
+    total, ids = spatial_index.within_box(min_lat, min_lon, max_lat, max_lon, limit=limit)
+    return total, _get_by_ranked_ids(db, ids, columns)
+
+def iter_export_batches(db: Session, search_params: Dict[str, Any],
+                        batch_size: int = 1000, include_archived: bool = False) -> Iterator[List[Any]]:
+    """
+    Parcourir les signalements correspondant aux critères de recherche par
+    lots de batch_size lignes (tuples dans l'ordre de EXPORT_COLUMNS), via un
+    curseur côté serveur. Les critères textuels sont appliqués en SQL : l'export
+    suit l'ordre chronologique inverse, pas la pertinence.
+    """
+    source = signalement_source(include_archived)
+    conditions = _search_conditions(search_params, source)
+    stmt = select(*[getattr(source, c) for c in EXPORT_COLUMNS])
     if conditions:
-        query = query.filter(and_(*conditions))
-    
-    return query.order_by(Signalement.created_at.desc()).all()
\ No newline at end of file
+        stmt = stmt.where(and_(*conditions))
+    stmt = stmt.order_by(source.created_at.desc(), source.id.desc())
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    for partition in result.partitions():
+        yield partition
@@ -1,13 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.citizen import router as citizen_router
 from app.api.signalement import router as signalement_router
 from app.api.auth import router as auth_router
-from app.core.database import engine
+from app.core.config import settings
+from app.core.database import (
+    SessionLocal, engine, async_engine, replica_engines, async_replica_engines, ReadYourWritesMiddleware
+)
+from app.core.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from app.core.logging_config import setup_logging, shutdown_logging, instrument_sql_logging, log_event
+from app.core.startup import startup_phase, startup_report
+from fastapi.concurrency import run_in_threadpool
+import asyncio
 import logging
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
@@ -19,8 +28,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag", "Last-Modified"],
 )
 
+if replica_engines:
+    # Lectures GET sur les réplicas, sauf pour un client qui vient d'écrire
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.METRICS_ENABLED:
+    # Ajouté en dernier : englobe les autres middlewares et mesure toute la requête
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine, "sync")
+    instrument_engine(async_engine.sync_engine, "async")
+    for index, (replica, async_replica) in enumerate(zip(replica_engines, async_replica_engines)):
+        instrument_engine(replica, f"replica{index}")
+        instrument_engine(async_replica.sync_engine, f"replica{index}-async")
+
+instrument_sql_logging(engine, "sync")
+instrument_sql_logging(async_engine.sync_engine, "async", explain_engine=engine)
+for index, (replica, async_replica) in enumerate(zip(replica_engines, async_replica_engines)):
+    instrument_sql_logging(replica, f"replica{index}", explain_engine=replica)
+    instrument_sql_logging(async_replica.sync_engine, f"replica{index}-async", explain_engine=replica)
+
 # Add a simple test endpoint
 @app.get("/")
 def read_root():
@@ -30,11 +59,202 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("startup")
+def start_logging():
+    # Sans effet au premier démarrage ; relance l'écriture après un arrêt
+    setup_logging()
+
+@app.on_event("startup")
+def run_migrations():
+    # Comparaison de révisions Alembic : l'upgrade n'est lancé que si la base est en retard
+    from app.core.init_db import ensure_schema
+    with startup_phase("schema"):
+        if ensure_schema():
+            logger.info("Database migrations applied")
+
+@app.on_event("startup")
+async def start_event_hub():
+    # Les fonctions CRUD publient depuis le pool de threads : distribution dans cette boucle
+    from app.core.event_hub import event_hub
+    event_hub.bind(asyncio.get_running_loop())
+
+@app.on_event("startup")
+def build_search_index():
+    from app.crud.signalement import rebuild_search_index
+    db = SessionLocal()
+    try:
+        with startup_phase("search_index"):
+            count = rebuild_search_index(db)
+        logger.info(f"Search index built with {count} signalements")
+    except Exception as e:
+        # La recherche retombe sur les filtres SQL tant que l'index n'est pas prêt
+        logger.error(f"Search index build failed: {str(e)}")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def build_spatial_index():
+    from app.core.gazetteer import load_gazetteer
+    from app.crud.signalement import rebuild_spatial_index
+    db = SessionLocal()
+    try:
+        with startup_phase("spatial_index"):
+            places = load_gazetteer()
+            count = rebuild_spatial_index(db)
+        logger.info(f"Spatial index built with {count} signalements ({places} known places)")
+    except Exception as e:
+        # /signalements/nearby répond 503 tant que l'index n'est pas prêt
+        logger.error(f"Spatial index build failed: {str(e)}")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def build_duplicate_index():
+    if not settings.DUPLICATE_DETECTION:
+        return
+    from app.crud.signalement import rebuild_duplicate_index
+    db = SessionLocal()
+    try:
+        with startup_phase("duplicate_index"):
+            count = rebuild_duplicate_index(db)
+        logger.info(f"Duplicate index built with {count} signalements")
+    except Exception as e:
+        # Les doublons ne sont cherchés que parmi les signalements créés depuis le démarrage
+        logger.error(f"Duplicate index build failed: {str(e)}")
+    finally:
+        db.close()
+
+def refresh_indexes(since):
+    from app.crud.signalement import refresh_indexes as refresh
+    db = SessionLocal()
+    try:
+        return refresh(db, since)
+    finally:
+        db.close()
+
+async def index_refresh_loop():
+    # Écritures des autres workers reportées dans les index en mémoire de ce processus
+    since = None
+    while True:
+        try:
+            since = await run_in_threadpool(refresh_indexes, since)
+        except Exception as e:
+            logger.error(f"Index refresh failed: {str(e)}")
+        await asyncio.sleep(settings.INDEX_REFRESH_INTERVAL)
+
+@app.on_event("startup")
+async def start_index_refresh():
+    if settings.INDEX_REFRESH_INTERVAL > 0:
+        app.state.index_refresh_task = asyncio.create_task(index_refresh_loop())
+
+def reconcile_stats():
+    from app.core.signalement_stats import signalement_stats
+    db = SessionLocal()
+    try:
+        signalement_stats.reconcile(db)
+    finally:
+        db.close()
+
+async def stats_reconcile_loop():
+    # Recalage périodique des compteurs de /signalements/stats sur un GROUP BY
+    while True:
+        await asyncio.sleep(settings.STATS_RECONCILE_INTERVAL)
+        try:
+            await run_in_threadpool(reconcile_stats)
+        except Exception as e:
+            logger.error(f"Stats reconcile failed: {str(e)}")
+
+@app.on_event("startup")
+async def start_stats_counters():
+    try:
+        with startup_phase("stats"):
+            await run_in_threadpool(reconcile_stats)
+    except Exception as e:
+        logger.error(f"Initial stats load failed: {str(e)}")
+    app.state.stats_task = asyncio.create_task(stats_reconcile_loop())
+
+@app.on_event("startup")
+async def prewarm_connections():
+    # Les premières requêtes n'ouvrent pas leurs connexions
+    from app.core.database import prewarm_pools, prewarm_async_pools
+    with startup_phase("pool_prewarm"):
+        await run_in_threadpool(prewarm_pools)
+        await prewarm_async_pools()
+
+@app.on_event("startup")
+async def warm_hashing():
+    if not settings.HASH_POOL_PREWARM:
+        return
+    from app.utils.security import warm_hash_pool
+    try:
+        with startup_phase("hash_pool"):
+            await run_in_threadpool(warm_hash_pool)
+    except Exception as e:
+        logger.error(f"Hash pool warm-up failed: {str(e)}")
+
+@app.on_event("startup")
+def warm_schemas():
+    # Génération du schéma OpenAPI (sinon faite au premier /docs ou /openapi.json)
+    with startup_phase("schemas"):
+        app.openapi()
+
+@app.on_event("startup")
+def start_job_workers():
+    # Après la construction des index : les tâches de doublons utilisent l'index des doublons
+    if settings.JOB_WORKERS > 0:
+        from app.core.jobs import job_queue
+        job_queue.start(SessionLocal, settings.JOB_WORKERS)
+
+@app.on_event("startup")
+def schedule_archival():
+    # Tâche durable : traitée par les workers de n'importe quel processus
+    if not settings.ARCHIVE_ENABLED:
+        return
+    from app.crud.signalement import schedule_archive_job
+    db = SessionLocal()
+    try:
+        schedule_archive_job(db)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Archive job scheduling failed: {str(e)}")
+    finally:
+        db.close()
+
 @app.on_event("startup")
-def create_tables():
-    from app.models import Base
-    Base.metadata.create_all(bind=engine)
+def report_startup():
+    log_event(logging.getLogger("app.startup"), "startup complete", **startup_report())
+
+@app.on_event("shutdown")
+async def stop_stats_counters():
+    task = getattr(app.state, "stats_task", None)
+    if task is not None:
+        task.cancel()
+
+@app.on_event("shutdown")
+async def stop_index_refresh():
+    task = getattr(app.state, "index_refresh_task", None)
+    if task is not None:
+        task.cancel()
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    # Une tâche interrompue est reprise à l'expiration de son bail
+    from app.core.jobs import job_queue
+    job_queue.stop()
+
+@app.on_event("shutdown")
+def stop_hash_pool():
+    from app.utils.security import shutdown_hash_pool
+    shutdown_hash_pool()
+
+@app.on_event("shutdown")
+def stop_logging():
+    shutdown_logging()
 
 app.include_router(auth_router, prefix="/auth")
 app.include_router(citizen_router)
-app.include_router(signalement_router, prefix="/signalements")
\ No newline at end of file
+app.include_router(signalement_router, prefix="/signalements")
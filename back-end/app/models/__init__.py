@@ -2,4 +2,7 @@
 from app.core.database import Base
 from app.models.citizen import Citizen
 from app.models.signalement import Signalement
-from app.models.admin import Admin
\ No newline at end of file
+from app.models.admin import Admin
+from app.models.job import Job
+from app.models.signalement_archive import SignalementArchive
+from app.models.cache_version import CacheVersion
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+from app.core.database import Base
+
+class CacheVersion(Base):
+    """
+    Version partagée d'un cache local aux processus, voir
+    app/core/cache_versions.py. Incrémentée après chaque écriture.
+    """
+    __tablename__ = "cache_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
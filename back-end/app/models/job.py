@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.core.database import Base
+
+class Job(Base):
+    """Tâche de fond durable, voir app/core/jobs.py."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    # Dates UTC posées par l'application : prochaine exécution, fin du bail d'un worker
+    run_at = Column(DateTime, nullable=False)
+    locked_until = Column(DateTime)
+    claim_token = Column(String(32))
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Réclamation : tâches prêtes (status, run_at) ; relecture d'un lot par jeton
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+        Index("ix_jobs_claim_token", "claim_token"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Enum, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Enum, Float, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -15,5 +15,32 @@ class Signalement(Base):
     categorie = Column(String(50), nullable=False)  # Simplifié pour le test
     gravite = Column(String(50), default='mineur')
     status = Column(String(50), default='nouveau')
+    # Coordonnées WGS 84 (optionnelles), voir app/core/spatial_index.py
+    latitude = Column(Float)
+    longitude = Column(Float)
+    # Signalement d'origine d'un quasi-doublon, voir app/core/duplicate_index.py
+    duplicate_of = Column(Integer, ForeignKey("signalements.id", ondelete="SET NULL", name="fk_signalements_duplicate_of"))
+    # Lot de POST /signalements/bulk qui a inséré la ligne (relecture des ids)
+    bulk_token = Column(String(32))
     created_at = Column(TIMESTAMP, server_default=func.now())
-    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    # Compteur de modifications (ETag) : chaque UPDATE de l'ORM est conditionné
+    # par WHERE version = :lue et l'incrémente ; les UPDATE groupés l'incrémentent aussi
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    # Index composites (filtre exact puis tri created_at DESC), voir migrations/versions/0002
+    __table_args__ = (
+        Index("ix_signalements_created_at_id", "created_at", "id"),
+        Index("ix_signalements_status_created_at", "status", "created_at", "id"),
+        Index("ix_signalements_categorie_created_at", "categorie", "created_at", "id"),
+        Index("ix_signalements_gravite_created_at", "gravite", "created_at", "id"),
+        Index("ix_signalements_citizen_created_at", "citizen_id", "created_at", "id"),
+        Index("ix_signalements_status_gravite_created_at", "status", "gravite", "created_at", "id"),
+        Index("ix_signalements_latitude_longitude", "latitude", "longitude"),
+        Index("ix_signalements_duplicate_of", "duplicate_of"),
+        Index("ix_signalements_bulk_token", "bulk_token"),
+        # Signalements résolus anciens à archiver, voir archive_signalements (app/crud/signalement.py)
+        Index("ix_signalements_status_updated_at", "status", "updated_at"),
+    )
\ No newline at end of file
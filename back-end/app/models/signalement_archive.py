@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Text, Float, TIMESTAMP, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class SignalementArchive(Base):
+    """
+    Signalements résolus déplacés hors de la table signalements (voir
+    archive_signalements dans app/crud/signalement.py). Mêmes colonnes et
+    mêmes ids ; duplicate_of n'est
+    pas contraint, l'original pouvant être dans l'une ou l'autre table.
+    """
+    __tablename__ = "signalements_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    citizen_id = Column(Integer, ForeignKey("citizen.id"), nullable=False)
+    titre = Column(String(255), nullable=False)
+    localisation = Column(String(255), nullable=False)
+    ville = Column(String(100), nullable=False)
+    description = Column(Text, nullable=False)
+    commentaire = Column(Text)
+    categorie = Column(String(50), nullable=False)
+    gravite = Column(String(50))
+    status = Column(String(50))
+    latitude = Column(Float)
+    longitude = Column(Float)
+    duplicate_of = Column(Integer)
+    created_at = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP)
+    version = Column(Integer, nullable=False, server_default="1")
+    archived_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_signalements_archive_created_at_id", "created_at", "id"),
+        Index("ix_signalements_archive_citizen_created_at", "citizen_id", "created_at", "id"),
+    )
@@ -1,6 +1,7 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, create_model, model_validator
 from enum import Enum
 
 
@@ -29,18 +30,112 @@ class SignalementBase(BaseModel):
     gravite: GraviteEnum = GraviteEnum.mineur
     status: StatusEnum = StatusEnum.nouveau
     commentaire: Optional[str] = None
+    # Coordonnées WGS 84 ; à défaut, géocodées depuis localisation et ville (gazetteer)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+
+def _check_coordinates(model):
+    if (model.latitude is None) != (model.longitude is None):
+        raise ValueError("latitude et longitude doivent être fournies ensemble")
+    return model
+
 
 class SignalementCreate(SignalementBase):
-    pass
+    @model_validator(mode="after")
+    def check_coordinates(self):
+        return _check_coordinates(self)
 
 class SignalementOut(SignalementBase):
     id: int
+    # Signalement d'origine si celui-ci a été détecté comme doublon
+    duplicate_of: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
-        
+
+
+class SignalementNearbyOut(SignalementOut):
+    # Distance au centre de la recherche (absente pour une recherche par rectangle)
+    distance_m: Optional[float] = None
+
+
+@lru_cache(maxsize=128)
+def signalement_partial_schema(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Sous-ensemble de SignalementOut renvoyé avec ?fields= (champs dans l'ordre du schéma)."""
+    return create_model(
+        "SignalementPartialOut",
+        **{name: (SignalementOut.model_fields[name].annotation, SignalementOut.model_fields[name])
+           for name in fields}
+    )
+
+
+class SignalementStatsOut(BaseModel):
+    total: int
+    status: Dict[str, int]
+    categorie: Dict[str, int]
+    gravite: Dict[str, int]
+    ville: Dict[str, int]
+    reconciled_at: Optional[datetime] = None
+
+
+class BulkRowError(BaseModel):
+    index: int
+    errors: List[str]
+
+
+class SignalementBulkResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkRowError]
+
+
+class SignalementBatchFilter(BaseModel):
+    # Mêmes critères que GET /signalements/search, résolus de la même façon (index plein texte)
+    titre: Optional[str] = None
+    ville: Optional[str] = None
+    categorie: Optional[str] = None
+    status: Optional[str] = None
+    gravite: Optional[str] = None
+    citizen_id: Optional[int] = None
+    description: Optional[str] = None
+    q: Optional[str] = None
+
+    class Config:
+        # Un critère mal orthographié élargirait la cible au lieu d'échouer
+        extra = "forbid"
+
+
+class SignalementBatchTarget(BaseModel):
+    ids: Optional[List[int]] = None
+    filters: Optional[SignalementBatchFilter] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("ids ou filters doit être fourni (un seul des deux)")
+        return self
+
+
+class SignalementBatchUpdate(SignalementBatchTarget):
+    status: Optional[StatusEnum] = None
+    gravite: Optional[GraviteEnum] = None
+
+    @model_validator(mode="after")
+    def check_values(self):
+        if self.status is None and self.gravite is None:
+            raise ValueError("status ou gravite doit être fourni")
+        return self
+
+
+class SignalementBatchResult(BaseModel):
+    affected: int
+    # Ids demandés qui ne correspondent à aucun signalement
+    not_found: List[int] = []
+
 
 class SignalementUpdate(BaseModel):
     titre: Optional[str]
@@ -51,6 +146,12 @@ class SignalementUpdate(BaseModel):
     gravite: Optional[GraviteEnum]
     status: Optional[StatusEnum]
     commentaire: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def check_coordinates(self):
+        return _check_coordinates(self)
 
     class Config:
         from_attributes = True
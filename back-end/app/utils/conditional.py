@@ -0,0 +1,75 @@
+# app/utils/conditional.py
+"""
+Validateurs HTTP (ETag, Last-Modified) et évaluation des requêtes conditionnelles.
+
+Les ETags sont dérivés du compteur de modifications (colonne version) et
+changent à chaque écriture ; Last-Modified vient de updated_at et n'a que la
+résolution de la colonne (la seconde pour un TIMESTAMP MySQL).
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Les TIMESTAMP sont relus sans fuseau : ils sont considérés comme UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def resource_etag(signalement_id: int, version: Optional[int]) -> str:
+    """ETag fort d'un signalement : son id et sa version."""
+    return f'"{signalement_id}-{version or 0}"'
+
+
+def collection_etag(*parts: Any) -> str:
+    """ETag faible d'une liste : empreinte des critères et de la version de la collection."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_list(header: str):
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _weak_equal(a: str, b: str) -> bool:
+    return a.removeprefix("W/") == b.removeprefix("W/")
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Vrai si la requête GET peut recevoir un 304. If-None-Match est prioritaire ;
+    If-Modified-Since n'est consulté qu'en son absence (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return any(_weak_equal(tag, etag) for tag in _etag_list(if_none_match))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def etag_matches(if_match: str, etag: str) -> bool:
+    """Évaluation de If-Match : comparaison forte, les ETags faibles ne correspondent jamais."""
+    if if_match.strip() == "*":
+        return True
+    return any(tag == etag and not tag.startswith("W/") for tag in _etag_list(if_match))
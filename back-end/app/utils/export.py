@@ -0,0 +1,121 @@
+# app/utils/export.py
+"""
+Sérialisation par lots des exports (CSV, NDJSON, Parquet).
+
+Chaque fonction reçoit un itérable de lots de lignes (tuples dans l'ordre de
+columns) et produit un morceau de bytes par lot : la mémoire utilisée ne
+dépend que de la taille d'un lot, pas du nombre total de lignes.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Sequence
+
+from sqlalchemy import Column, DateTime, Float, Integer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # export Parquet indisponible sans pyarrow
+    pa = None
+    pq = None
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def csv_chunks(batches: Iterable[Sequence[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([_cell(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(batches: Iterable[Sequence[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = [
+            json.dumps(dict(zip(columns, [_cell(v) for v in row])), ensure_ascii=False)
+            for row in batch
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _arrow_type(column: Column):
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+class _DrainableSink:
+    """Fichier en écriture seule vidé après chaque groupe de lignes Parquet."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Les offsets du pied de fichier Parquet sont calculés à partir de tell()
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_chunks(batches: Iterable[Sequence[tuple]], columns: Sequence[Column]) -> Iterator[bytes]:
+    """Un groupe de lignes Parquet (record batch en colonnes) par lot."""
+    if pa is None:
+        raise RuntimeError("pyarrow n'est pas installé")
+    schema = pa.schema([(c.name, _arrow_type(c)) for c in columns])
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="snappy")
+    try:
+        for batch in batches:
+            arrays = [
+                pa.array([row[i] for row in batch], type=field.type)
+                for i, field in enumerate(schema)
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,42 @@
+# app/utils/fast_json.py
+"""
+Sérialisation rapide des listes : lignes (tuples de colonnes) converties en
+dicts puis encodées par orjson, sans instance ORM ni validation pydantic.
+Chemin optionnel, activé par FAST_JSON_LISTS (désactivé par défaut).
+
+Le JSON produit est identique à celui du response_model (même ordre des
+champs, dates ISO 8601 sans fuseau) ; les routes gardent leur response_model
+pour le schéma OpenAPI. Sans orjson, l'encodeur de pydantic-core est utilisé.
+"""
+
+from typing import Any, Iterable, List, Sequence
+
+from fastapi import Response
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # repli sur pydantic-core
+    orjson = None
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return to_json(content)
+
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> List[dict]:
+    """Lignes dans l'ordre de fields -> dicts (ordre des champs conservé)."""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,23 @@
+# app/utils/pagination.py
+
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(created_at: Optional[datetime], id: int) -> str:
+    """Encode la position (created_at, id) du dernier élément d'une page."""
+    created = created_at.isoformat() if created_at else ""
+    raw = f"{created}|{id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Décode un curseur produit par encode_cursor. Lève ValueError si invalide."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created, _, id_part = raw.partition("|")
+        return (datetime.fromisoformat(created) if created else None), int(id_part)
+    except Exception:
+        raise ValueError("Curseur invalide")
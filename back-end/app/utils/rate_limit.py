@@ -0,0 +1,83 @@
+# app/utils/rate_limit.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Tuple
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # clé -> (jetons restants, instant de la dernière mise à jour)
+        self.buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+
+class TokenBuckets:
+    """
+    Seaux à jetons par clé (adresse IP, email...), sûrs entre threads.
+
+    Chaque seau contient au plus capacity jetons et en regagne rate par
+    seconde ; une tentative en consomme un. Les clés sont réparties sur
+    plusieurs fragments, chacun avec son verrou et au plus maxsize / shards
+    seaux (les moins récemment utilisés sont oubliés, ce qui les remplit).
+    """
+
+    def __init__(self, capacity: float, rate: float, maxsize: int, shards: int = 16):
+        self.capacity = capacity
+        self.rate = rate
+        self.shard_size = max(1, maxsize // shards)
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def _shard(self, key: Hashable) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def take(self, key: Hashable) -> float:
+        """Consommer un jeton : 0.0 si accordé, sinon secondes avant le prochain jeton."""
+        shard = self._shard(key)
+        now = time.monotonic()
+        with shard.lock:
+            buckets = shard.buckets
+            tokens, last = buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            buckets[key] = (tokens, now)
+            buckets.move_to_end(key)
+            while len(buckets) > self.shard_size:
+                buckets.popitem(last=False)
+                self.evictions += 1
+        if allowed:
+            self.allowed += 1
+            return 0.0
+        self.rejected += 1
+        return (1.0 - tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def reset(self, key: Hashable):
+        shard = self._shard(key)
+        with shard.lock:
+            shard.buckets.pop(key, None)
+
+    def clear(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+    def __len__(self):
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self),
+            "capacity": self.capacity,
+            "rate_per_second": self.rate,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+        }
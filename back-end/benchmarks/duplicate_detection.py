@@ -0,0 +1,104 @@
+"""
+Détection des quasi-doublons (MinHash + LSH, app/core/duplicate_index.py).
+
+Génère des signalements synthétiques dont une part sont des reprises
+légèrement modifiées d'un signalement antérieur (mots retirés ou ajoutés),
+puis mesure :
+  - la reconstruction de l'index par lots (signatures numpy si disponible,
+    sinon Python pur) et la mémoire occupée par signalement indexé ;
+  - le coût ajouté à une création (signature, recherche, indexation) ;
+  - le rappel sur les reprises et le taux de faux positifs sur les autres.
+
+Usage (depuis back-end/) :
+    python -m benchmarks.duplicate_detection --rows 20000 --duplicates 0.1
+"""
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000, help="signalements indexés")
+    parser.add_argument("--probes", type=int, default=2_000, help="créations mesurées")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="part de reprises parmi les créations")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    from app.core import duplicate_index as module
+    from app.core.duplicate_index import DuplicateIndex, sign
+    from benchmarks.endpoints import CATEGORIES, CITIES
+
+    rng = random.Random(args.seed)
+    syllables = ["ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru", "sa", "te", "vi", "zo"]
+    vocabulary = list({"".join(rng.choices(syllables, k=3)) for _ in range(3000)})
+
+    def report(doc_id):
+        return SimpleNamespace(
+            id=doc_id, duplicate_of=None,
+            titre=" ".join(rng.sample(vocabulary, 3)),
+            description=" ".join(rng.choices(vocabulary, k=rng.randint(10, 30))),
+            localisation=f"Rue {rng.randint(1, 400)}",
+            ville=rng.choice(CITIES), categorie=rng.choice(CATEGORIES),
+        )
+
+    def reprise(original, doc_id):
+        words = original.description.split()
+        for _ in range(max(1, len(words) // 10)):
+            words.pop(rng.randrange(len(words)))
+        words.insert(rng.randrange(len(words) + 1), rng.choice(vocabulary))
+        return SimpleNamespace(**{**vars(original), "id": doc_id, "description": " ".join(words)})
+
+    rows = [report(i) for i in range(args.rows)]
+    batches = [rows[i:i + 1000] for i in range(0, len(rows), 1000)]
+
+    available = module.np
+    for label, numpy_module in (("numpy", available), ("python", None)):
+        if label == "numpy" and numpy_module is None:
+            continue
+        module.np = numpy_module
+        index = DuplicateIndex(max_entries=args.rows)
+        start = time.perf_counter()
+        index.rebuild(batches)
+        print(f"reconstruction ({label}) : {time.perf_counter() - start:.2f} s pour {len(index)} signalements")
+    module.np = available
+
+    tracemalloc.start()
+    index = DuplicateIndex(max_entries=args.rows)
+    index.rebuild(batches)
+    print(f"mémoire : {tracemalloc.get_traced_memory()[0] / len(index):.0f} octets par signalement")
+    tracemalloc.stop()
+
+    timings, found, expected, false_positives = [], 0, 0, 0
+    for doc_id in range(args.rows, args.rows + args.probes):
+        original = None
+        if rng.random() < args.duplicates:
+            original = rng.choice(rows)
+            probe, expected = reprise(original, doc_id), expected + 1
+        else:
+            probe = report(doc_id)
+        start = time.perf_counter()
+        signed = sign(probe)
+        match = index.find(signed)
+        index.add(probe.id, signed, match[0] if match else None)
+        timings.append(time.perf_counter() - start)
+        if match is not None and original is not None and match[0] == original.id:
+            found += 1
+        elif match is not None:
+            false_positives += 1
+
+    timings.sort()
+    print(f"création : médiane {statistics.median(timings) * 1000:.2f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1000:.2f} ms")
+    print(f"rappel : {found}/{expected}, faux positifs : {false_positives}/{args.probes - expected}")
+
+
+if __name__ == "__main__":
+    main()
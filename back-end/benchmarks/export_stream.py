@@ -0,0 +1,141 @@
+"""
+Benchmark de GET /signalements/export : débit (lignes/s) et mémoire du serveur.
+
+Remplit la base avec --rows signalements, puis pour chaque format démarre un
+serveur uvicorn neuf, télécharge l'export en flux et relève le pic de RSS du
+processus serveur (VmHWM, Linux). La différence avec le RSS avant la requête
+doit rester stable quand --rows augmente.
+
+Usage (depuis back-end/) :
+    python -m benchmarks.export_stream --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+FORMATS = ("csv", "ndjson", "parquet")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url",
+                        default="sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_export.db"))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--output", default="export_stream_results.json")
+    return parser.parse_args()
+
+
+def seed(total):
+    from sqlalchemy import func, insert, select
+
+    from app.core.database import engine
+    from app.core.init_db import init_db
+    from app.models.citizen import Citizen
+    from app.models.signalement import Signalement
+
+    engine.echo = False
+    init_db()
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count(Signalement.id))).scalar()
+        if existing >= total:
+            return
+        if conn.execute(select(Citizen.id).where(Citizen.id == 1)).first() is None:
+            conn.execute(insert(Citizen.__table__), [{"id": 1, "email": "export@example.com", "password_hash": "x"}])
+        rng = random.Random(42)
+        start = datetime(2024, 1, 1)
+        for offset in range(existing, total, 10_000):
+            conn.execute(insert(Signalement.__table__), [
+                {
+                    "citizen_id": 1,
+                    "titre": f"Signalement {i}",
+                    "localisation": f"Rue {i % 500}",
+                    "ville": rng.choice(["Rabat", "Casablanca", "Fès", "Tanger"]),
+                    "description": "Description détaillée du problème constaté sur place.",
+                    "categorie": rng.choice(["police", "hopital", "admin"]),
+                    "gravite": rng.choice(["mineur", "majeur", "urgent"]),
+                    "status": rng.choice(["nouveau", "en_cours", "resolu"]),
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + 10_000, total))
+            ])
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _memory_kb(pid, field):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def run_format(export_format):
+    import httpx
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        for _ in range(600):
+            try:
+                httpx.get(base_url + "/health")
+                break
+            except httpx.TransportError:
+                time.sleep(0.5)
+        rss_before = _memory_kb(server.pid, "VmRSS")
+        size = 0
+        t0 = time.perf_counter()
+        with httpx.stream("GET", base_url + "/signalements/export",
+                          params={"format": export_format}, timeout=None) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                size += len(chunk)
+        seconds = time.perf_counter() - t0
+        peak = _memory_kb(server.pid, "VmHWM")
+        return {"seconds": round(seconds, 3), "bytes": size,
+                "rss_before_mb": round(rss_before / 1024, 1),
+                "peak_rss_mb": round(peak / 1024, 1),
+                "peak_delta_mb": round((peak - rss_before) / 1024, 1)}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    args = parse_args()
+    # La configuration est lue à l'import de l'application (serveur compris)
+    os.environ["DB_URL"] = args.database_url
+
+    seed(args.rows)
+    results = {"rows": args.rows, "formats": {}}
+    for export_format in args.formats.split(","):
+        r = run_format(export_format)
+        r["rows_per_second"] = round(args.rows / r["seconds"], 1)
+        results["formats"][export_format] = r
+        print(f"  {export_format:<8} {r['rows_per_second']:>10} lignes/s  "
+              f"{r['bytes'] / 1e6:>8.1f} Mo  pic RSS +{r['peak_delta_mb']} Mo")
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Coût de la sérialisation des listes de signalements, par tranche de 10 000 lignes.
+
+Compare trois chemins pour produire le corps JSON de GET /signalements :
+  - orm+jsonable : instances ORM, jsonable_encoder puis json.dumps
+    (chemin historique de FastAPI pour un response_model) ;
+  - orm+pydantic : instances ORM validées par SignalementOut (from_attributes)
+    puis dump_json de pydantic-core ;
+  - colonnes+orjson : tuples des seules colonnes de SignalementOut, dicts,
+    orjson (FAST_JSON_LISTS).
+
+Le chargement (requête et construction des lignes) et la sérialisation sont
+mesurés séparément ; le script vérifie que les trois corps sont identiques
+une fois décodés.
+
+Usage (depuis back-end/) :
+    python -m benchmarks.list_serialization --rows 10000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="lignes par liste")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def timed(fn, repeat):
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    args = parse_args()
+    path = os.path.join(tempfile.gettempdir(), "bench_list_serialization.db")
+    if os.path.exists(path):
+        os.remove(path)
+    os.environ["DB_URL"] = "sqlite:///" + path
+
+    import logging
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from app.core.database import SessionLocal
+    from app.crud.signalement import get_signalements_page
+    from app.models.signalement import Signalement
+    from app.schemas.signalement import SignalementOut
+    from app.utils.fast_json import dumps, orjson_available, rows_to_dicts
+    from benchmarks.endpoints import seed
+
+    logging.disable(logging.WARNING)
+    seed(argparse.Namespace(signalements=args.rows, citizens=100, seed=args.seed))
+
+    adapter = TypeAdapter(list[SignalementOut])
+    fields = tuple(SignalementOut.model_fields)
+    columns = [getattr(Signalement, name) for name in fields]
+    scale = 10_000 / args.rows
+
+    def load_orm():
+        db = SessionLocal()
+        try:
+            return get_signalements_page(db, limit=args.rows)[0]
+        finally:
+            db.close()
+
+    def load_columns():
+        db = SessionLocal()
+        try:
+            return get_signalements_page(db, limit=args.rows, columns=columns)[0]
+        finally:
+            db.close()
+
+    paths = {
+        "orm+jsonable": (load_orm, lambda rows: json.dumps(
+            jsonable_encoder(adapter.validate_python(rows, from_attributes=True))).encode()),
+        "orm+pydantic": (load_orm, lambda rows: adapter.dump_json(
+            adapter.validate_python(rows, from_attributes=True))),
+        "colonnes+orjson": (load_columns, lambda rows: dumps(rows_to_dicts(rows, fields))),
+    }
+
+    print(f"{args.rows} lignes, médiane de {args.repeat} essais, ms par 10 000 lignes "
+          f"(orjson {'disponible' if orjson_available() else 'absent : repli pydantic-core'})")
+    bodies = {}
+    reference = None
+    for name, (load, serialize) in paths.items():
+        load_seconds, rows = timed(load, args.repeat)
+        serialize_seconds, body = timed(lambda: serialize(rows), args.repeat)
+        bodies[name] = json.loads(body)
+        total = (load_seconds + serialize_seconds) * 1000 * scale
+        reference = reference or total
+        print(f"  {name:<16} chargement={load_seconds * 1000 * scale:>8.1f}  "
+              f"sérialisation={serialize_seconds * 1000 * scale:>8.1f}  total={total:>8.1f}  "
+              f"x{reference / total:.1f}")
+
+    first = next(iter(bodies.values()))
+    print("Corps identiques :", all(body == first for body in bodies.values()))
+
+
+if __name__ == "__main__":
+    main()
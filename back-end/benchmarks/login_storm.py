@@ -0,0 +1,144 @@
+"""
+Test de charge : rafale de connexions et latence des autres routes.
+
+Compare la vérification bcrypt exécutée dans la route (ancien comportement,
+qui bloque la boucle d'événements) et le pool de processus de
+app.utils.security. Pendant la rafale, une sonde appelle /health en continu
+pour mesurer l'impact sur les routes sans rapport avec l'authentification.
+
+Usage (depuis back-end/) :
+    python -m benchmarks.login_storm --logins 200 --concurrency 20 --pool-size 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url",
+                        default="sqlite:///" + os.path.join(tempfile.gettempdir(), "bench_login.db"))
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=0, help="0 = nombre de CPU")
+    parser.add_argument("--probe-interval-ms", type=float, default=10.0)
+    parser.add_argument("--output", default=os.path.join(tempfile.gettempdir(), "login_storm_results.json"))
+    return parser.parse_args()
+
+
+def percentile(sorted_values, fraction):
+    return round(sorted_values[int(fraction * (len(sorted_values) - 1))], 3)
+
+
+async def storm(client, login_path, total, concurrency, probe_interval):
+    counter = iter(range(total))
+    statuses = {}
+    probe_latencies = []
+    done = asyncio.Event()
+
+    async def login_worker():
+        for _ in counter:
+            response = await client.post(login_path, data={"username": "storm@example.com", "password": "secret"})
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async def probe():
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await client.get("/health")
+            probe_latencies.append((time.perf_counter() - t0) * 1000)
+            await asyncio.sleep(probe_interval)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    probe_latencies.sort()
+    return {
+        "logins": total,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(total / elapsed, 1),
+        "statuses": statuses,
+        "health_probes": len(probe_latencies),
+        "health_p50_ms": percentile(probe_latencies, 0.5),
+        "health_p99_ms": percentile(probe_latencies, 0.99),
+        "health_max_ms": round(probe_latencies[-1], 3),
+    }
+
+
+def main():
+    args = parse_args()
+    # La configuration est lue à l'import de l'application
+    os.environ["DB_URL"] = args.database_url
+    os.environ["HASH_POOL_SIZE"] = str(args.pool_size)
+
+    import logging
+    import httpx
+    from fastapi import Depends, HTTPException
+    from fastapi.security import OAuth2PasswordRequestForm
+    from sqlalchemy import delete, insert, select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.core.database import engine, async_engine, get_async_db
+    from app.core.init_db import init_db
+    from app.main import app
+    from app.models.citizen import Citizen
+    from app.utils.security import get_password_hash, get_hash_pool, shutdown_hash_pool, verify_password
+
+    logging.disable(logging.WARNING)
+    engine.echo = False
+    async_engine.echo = False
+
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(delete(Citizen.__table__).where(Citizen.email == "storm@example.com"))
+        conn.execute(insert(Citizen.__table__), [
+            {"email": "storm@example.com", "password_hash": get_password_hash("secret")}
+        ])
+
+    # Reproduction de l'ancienne route : bcrypt exécuté dans la boucle d'événements
+    @app.post("/_bench/inline-login")
+    async def inline_login(form_data: OAuth2PasswordRequestForm = Depends(),
+                           db: AsyncSession = Depends(get_async_db)):
+        result = await db.execute(select(Citizen).where(Citizen.email == form_data.username))
+        citizen = result.scalars().first()
+        if not citizen or not verify_password(form_data.password, citizen.password_hash):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            results = {}
+            for name, path in (("inline", "/_bench/inline-login"), ("process_pool", "/auth/login")):
+                results[name] = await storm(client, path, args.logins, args.concurrency,
+                                            args.probe_interval_ms / 1000)
+                r = results[name]
+                print(f"  {name:<13} {r['logins_per_second']:>7} logins/s  "
+                      f"/health p50={r['health_p50_ms']} ms p99={r['health_p99_ms']} ms")
+            return results
+
+    get_hash_pool().submit(verify_password, "warm", get_password_hash("warm")).result()  # démarre les processus
+    try:
+        results = asyncio.run(run())
+    finally:
+        shutdown_hash_pool()
+
+    report = {
+        "cpu_count": os.cpu_count(),
+        "pool_size": args.pool_size or os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
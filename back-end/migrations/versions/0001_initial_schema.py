@@ -0,0 +1,73 @@
+"""Schéma initial : admin, citizen, signalements
+
+Les bases créées avant Alembic (data.sql ou create_all) ont déjà ces tables :
+elles ne sont créées que si elles n'existent pas.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "admin" not in existing:
+        op.create_table(
+            "admin",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(255), nullable=False),
+            sa.Column("password_hash", sa.String(255), nullable=False),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+        op.create_index("ix_admin_id", "admin", ["id"])
+        op.create_index("ix_admin_email", "admin", ["email"], unique=True)
+
+    if "citizen" not in existing:
+        op.create_table(
+            "citizen",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(255), nullable=False, unique=True),
+            sa.Column("password_hash", sa.String(255), nullable=False),
+            sa.Column("numero_telephone", sa.String(20)),
+            sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP")),
+        )
+        op.create_index("ix_citizen_id", "citizen", ["id"])
+
+    if "signalements" not in existing:
+        op.create_table(
+            "signalements",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("citizen_id", sa.Integer(), sa.ForeignKey("citizen.id"), nullable=False),
+            sa.Column("titre", sa.String(255), nullable=False),
+            sa.Column("localisation", sa.String(255), nullable=False),
+            sa.Column("ville", sa.String(100), nullable=False),
+            sa.Column("description", sa.Text(), nullable=False),
+            sa.Column("commentaire", sa.Text()),
+            sa.Column("categorie", sa.String(50), nullable=False),
+            sa.Column("gravite", sa.String(50)),
+            sa.Column("status", sa.String(50)),
+            sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+        )
+        op.create_index("ix_signalements_id", "signalements", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("signalements")
+    op.drop_table("citizen")
+    op.drop_table("admin")
@@ -0,0 +1,46 @@
+"""Index composites pour les filtres de recherche des signalements
+
+Chaque filtre exact de search_signalements (status, categorie, gravite,
+citizen_id) est suivi du tri ORDER BY created_at DESC : l'index couvre
+le filtre puis le tri, et id départage les égalités pour la pagination
+par curseur.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_signalements_created_at_id": ["created_at", "id"],
+    "ix_signalements_status_created_at": ["status", "created_at", "id"],
+    "ix_signalements_categorie_created_at": ["categorie", "created_at", "id"],
+    "ix_signalements_gravite_created_at": ["gravite", "created_at", "id"],
+    "ix_signalements_citizen_created_at": ["citizen_id", "created_at", "id"],
+    "ix_signalements_status_gravite_created_at": ["status", "gravite", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("signalements")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "signalements", columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in INDEXES:
+        op.drop_index(name, table_name="signalements")
@@ -0,0 +1,45 @@
+"""Coordonnées géographiques des signalements
+
+latitude et longitude (degrés WGS 84) sont optionnelles : renseignées à la
+création ou par le géocodage hors ligne (gazetteer). L'index sert la lecture
+des signalements géolocalisés au démarrage (index spatial en mémoire).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_signalements_latitude_longitude"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    existing = {column["name"] for column in inspector.get_columns("signalements")}
+    with op.batch_alter_table("signalements") as batch:
+        if "latitude" not in existing:
+            batch.add_column(sa.Column("latitude", sa.Float(), nullable=True))
+        if "longitude" not in existing:
+            batch.add_column(sa.Column("longitude", sa.Float(), nullable=True))
+    if INDEX not in {ix["name"] for ix in inspector.get_indexes("signalements")}:
+        op.create_index(INDEX, "signalements", ["latitude", "longitude"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(INDEX, table_name="signalements")
+    with op.batch_alter_table("signalements") as batch:
+        batch.drop_column("longitude")
+        batch.drop_column("latitude")
@@ -0,0 +1,44 @@
+"""Rattachement des signalements en double
+
+duplicate_of désigne le signalement d'origine d'un quasi-doublon détecté à la
+création (app/core/duplicate_index.py) ; il est remis à NULL si l'original
+est supprimé.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_signalements_duplicate_of"
+FOREIGN_KEY = "fk_signalements_duplicate_of"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if "duplicate_of" not in {column["name"] for column in inspector.get_columns("signalements")}:
+        with op.batch_alter_table("signalements") as batch:
+            batch.add_column(sa.Column("duplicate_of", sa.Integer(), nullable=True))
+            batch.create_foreign_key(FOREIGN_KEY, "signalements", ["duplicate_of"], ["id"], ondelete="SET NULL")
+    if INDEX not in {ix["name"] for ix in inspector.get_indexes("signalements")}:
+        op.create_index(INDEX, "signalements", ["duplicate_of"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(INDEX, table_name="signalements")
+    with op.batch_alter_table("signalements") as batch:
+        batch.drop_constraint(FOREIGN_KEY, type_="foreignkey")
+        batch.drop_column("duplicate_of")
@@ -0,0 +1,59 @@
+"""File de tâches de fond
+
+Table jobs lue par les workers de app/core/jobs.py : les tâches prêtes sont
+réclamées par lots (status, run_at), puis relues par jeton de réclamation.
+Table et index déjà créés (create_all) sont conservés.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_jobs_status_run_at": ["status", "run_at"],
+    "ix_jobs_claim_token": ["claim_token"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("jobs"):
+        op.create_table(
+            "jobs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("kind", sa.String(100), nullable=False),
+            sa.Column("payload", sa.Text(), nullable=False),
+            sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"),
+            sa.Column("run_at", sa.DateTime(), nullable=False),
+            sa.Column("locked_until", sa.DateTime(), nullable=True),
+            sa.Column("claim_token", sa.String(32), nullable=True),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+        )
+    existing = {ix["name"] for ix in inspector.get_indexes("jobs")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "jobs", columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in INDEXES:
+        op.drop_index(name, table_name="jobs")
+    op.drop_table("jobs")
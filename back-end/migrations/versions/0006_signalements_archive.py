@@ -0,0 +1,69 @@
+"""Archive des signalements résolus
+
+Table signalements_archive (mêmes colonnes et mêmes ids que signalements,
+plus archived_at) alimentée par archive_signalements
+(app/crud/signalement.py), et index (status, updated_at) pour y trouver les
+signalements résolus anciens. Tables et index déjà créés (create_all) sont
+conservés.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUS_INDEX = "ix_signalements_status_updated_at"
+ARCHIVE_INDEXES = {
+    "ix_signalements_archive_created_at_id": ["created_at", "id"],
+    "ix_signalements_archive_citizen_created_at": ["citizen_id", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("signalements_archive"):
+        op.create_table(
+            "signalements_archive",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("citizen_id", sa.Integer(), sa.ForeignKey("citizen.id"), nullable=False),
+            sa.Column("titre", sa.String(255), nullable=False),
+            sa.Column("localisation", sa.String(255), nullable=False),
+            sa.Column("ville", sa.String(100), nullable=False),
+            sa.Column("description", sa.Text(), nullable=False),
+            sa.Column("commentaire", sa.Text(), nullable=True),
+            sa.Column("categorie", sa.String(50), nullable=False),
+            sa.Column("gravite", sa.String(50), nullable=True),
+            sa.Column("status", sa.String(50), nullable=True),
+            sa.Column("latitude", sa.Float(), nullable=True),
+            sa.Column("longitude", sa.Float(), nullable=True),
+            sa.Column("duplicate_of", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.TIMESTAMP(), nullable=True),
+            sa.Column("updated_at", sa.TIMESTAMP(), nullable=True),
+            sa.Column("archived_at", sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        )
+    existing = {ix["name"] for ix in inspector.get_indexes("signalements_archive")}
+    for name, columns in ARCHIVE_INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "signalements_archive", columns)
+    if STATUS_INDEX not in {ix["name"] for ix in inspector.get_indexes("signalements")}:
+        op.create_index(STATUS_INDEX, "signalements", ["status", "updated_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(STATUS_INDEX, table_name="signalements")
+    for name in ARCHIVE_INDEXES:
+        op.drop_index(name, table_name="signalements_archive")
+    op.drop_table("signalements_archive")
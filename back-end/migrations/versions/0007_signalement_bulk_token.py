@@ -0,0 +1,41 @@
+"""Jeton de lot des signalements importés
+
+bulk_token identifie les lignes insérées par un même appel à POST
+/signalements/bulk : elles sont relues par ce jeton après l'INSERT
+multi-lignes (executemany ne renvoie pas les ids sur MySQL).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_signalements_bulk_token"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if "bulk_token" not in {column["name"] for column in inspector.get_columns("signalements")}:
+        with op.batch_alter_table("signalements") as batch:
+            batch.add_column(sa.Column("bulk_token", sa.String(32), nullable=True))
+    if INDEX not in {ix["name"] for ix in inspector.get_indexes("signalements")}:
+        op.create_index(INDEX, "signalements", ["bulk_token"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(INDEX, table_name="signalements")
+    with op.batch_alter_table("signalements") as batch:
+        batch.drop_column("bulk_token")
@@ -0,0 +1,41 @@
+"""Compteur de modifications des signalements
+
+version est incrémenté à chaque modification ; les ETags des signalements
+et des listes en sont dérivés (updated_at n'a que la résolution de la
+seconde) et PUT avec If-Match le compare dans l'UPDATE. La colonne est
+copiée dans signalements_archive.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 15:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("signalements", "signalements_archive")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        if "version" not in {column["name"] for column in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch:
+                batch.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("version")
@@ -0,0 +1,44 @@
+"""Versions partagées des caches
+
+Table cache_versions : une ligne par cache local aux processus (réponses
+des listes de signalements, principaux de get_current_user), incrémentée
+après chaque écriture et relue à chaque succès du cache, pour que les
+invalidations d'un worker atteignent les autres (app/core/cache_versions.py).
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAMES = ("signalements", "principals")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("cache_versions"):
+        op.create_table(
+            "cache_versions",
+            sa.Column("name", sa.String(50), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        )
+    table = sa.table("cache_versions", sa.column("name"), sa.column("version"))
+    existing = {name for (name,) in op.get_bind().execute(sa.select(table.c.name))}
+    op.bulk_insert(table, [{"name": name, "version": 0} for name in NAMES if name not in existing])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("cache_versions")
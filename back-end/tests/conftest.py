@@ -0,0 +1,132 @@
+import os
+import tempfile
+
+# Base SQLite jetable : les variables doivent être posées avant l'import de l'application
+_TMP = tempfile.mkdtemp(prefix="signalements-tests-")
+os.environ.update({
+    "DB_HOST": "localhost", "DB_PORT": "3306", "DB_USER": "test", "DB_PASSWORD": "test",
+    "DB_NAME": "test", "SECRET_KEY": "test",
+    "DB_URL": f"sqlite:///{os.path.join(_TMP, 'test.db')}",
+    "DB_POOL_PREWARM": "0",
+    "HASH_POOL_PREWARM": "false",
+    "HASH_POOL_SIZE": "1",
+    "JOB_WORKERS": "0",
+    "INDEX_REFRESH_INTERVAL": "0",
+    "LOG_LEVEL": "WARNING",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import app
+from app.core import login_guard
+from app.core.database import SessionLocal
+from app.core.principal_cache import principal_cache, token_cache
+from app.core.response_cache import invalidate_signalements
+from app.core.signalement_stats import signalement_stats
+from app.crud.signalement import rebuild_duplicate_index, rebuild_search_index, rebuild_spatial_index
+from app.models.admin import Admin
+from app.models.citizen import Citizen
+from app.utils.security import get_password_hash
+
+PASSWORD = "motdepasse"
+# Un seul hachage bcrypt pour toute la session
+PASSWORD_HASH = get_password_hash(PASSWORD)
+
+TABLES = ("jobs", "signalements_archive", "signalements", "citizen", "admin")
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_state(client):
+    """Tables vidées, index, compteurs et caches remis à zéro avant chaque test."""
+    session = SessionLocal()
+    try:
+        for table in TABLES:
+            session.execute(text(f"DELETE FROM {table}"))
+        session.commit()
+        rebuild_search_index(session)
+        rebuild_spatial_index(session)
+        rebuild_duplicate_index(session)
+        signalement_stats.reconcile(session)
+    finally:
+        session.close()
+    invalidate_signalements()
+    principal_cache.clear()
+    token_cache.clear()
+    for state in (login_guard.ip_buckets, login_guard.email_buckets, login_guard.unknown_emails):
+        state.clear()
+    client.cookies.clear()
+    yield
+
+
+@pytest.fixture
+def citizen(db):
+    citizen = Citizen(email="citoyen@example.com", password_hash=PASSWORD_HASH, numero_telephone="0600000000")
+    db.add(citizen)
+    db.commit()
+    return citizen.id
+
+
+@pytest.fixture
+def make_signalement(client, citizen):
+    """Créer un signalement par l'API ; les champs donnés remplacent les valeurs par défaut."""
+    def make(**fields):
+        payload = {
+            "citizen_id": citizen,
+            "titre": "Trou dans la chaussée",
+            "localisation": "Rue des Orangers",
+            "ville": "Casablanca",
+            "description": "Un trou profond gêne la circulation",
+            "categorie": "admin",
+            "gravite": "mineur",
+            "status": "nouveau",
+            **fields,
+        }
+        response = client.post("/signalements/", json=payload)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return make
+
+
+@pytest.fixture
+def admin(db):
+    admin = Admin(email="admin@example.com", password_hash=PASSWORD_HASH)
+    db.add(admin)
+    db.commit()
+    return admin.id
+
+
+def login(client, email, password=PASSWORD):
+    return client.post("/auth/login", data={"username": email, "password": password})
+
+
+@pytest.fixture
+def admin_headers(client, admin):
+    token = login(client, "admin@example.com").json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def citizen_headers(client, citizen):
+    token = login(client, "citoyen@example.com").json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def update_payload(signalement, **changes):
+    """Corps de PUT /signalements/{id} reprenant les valeurs d'un signalement renvoyé par l'API."""
+    fields = ("titre", "localisation", "ville", "description", "categorie", "gravite", "status", "commentaire")
+    return {**{name: signalement[name] for name in fields}, **changes}
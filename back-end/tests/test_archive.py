@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from app.core.jobs import PENDING
+from app.crud.signalement import ARCHIVE_JOB, archive_signalements, schedule_archive_job
+from app.models.job import Job
+from app.models.signalement import Signalement
+from app.models.signalement_archive import SignalementArchive
+from tests.conftest import update_payload
+
+LONG_AGO = datetime(2020, 1, 1)
+
+
+def _age(db, *ids):
+    db.query(Signalement).filter(Signalement.id.in_(ids)).update(
+        {Signalement.updated_at: LONG_AGO}, synchronize_session=False)
+    db.commit()
+
+
+def test_old_resolved_signalements_move_to_the_archive(client, db, make_signalement):
+    old = make_signalement(status="résolu")
+    client.put(f"/signalements/{old['id']}", json=update_payload(old, commentaire="Réparé"))
+    recent = make_signalement(status="résolu")
+    still_open = make_signalement(status="nouveau")
+    _age(db, old["id"], still_open["id"])
+
+    assert archive_signalements(db, datetime.utcnow() - timedelta(days=1), batch_size=10) == 1
+
+    archived = db.get(SignalementArchive, old["id"])
+    assert (archived.commentaire, archived.version) == ("Réparé", 2)
+    assert db.get(Signalement, old["id"]) is None
+
+    listed = {row["id"] for row in client.get("/signalements/").json()}
+    assert listed == {recent["id"], still_open["id"]}
+    everything = client.get("/signalements/", params={"include_archived": True}).json()
+    assert {row["id"] for row in everything} == listed | {old["id"]}
+    assert client.get(f"/signalements/{old['id']}").status_code == 404
+    detail = client.get(f"/signalements/{old['id']}", params={"include_archived": True})
+    assert detail.json()["commentaire"] == "Réparé"
+    assert client.get("/signalements/stats").json()["total"] == 2
+
+
+def test_originals_of_current_duplicates_are_kept(client, db, make_signalement):
+    original = make_signalement(status="résolu")
+    make_signalement()
+    db.query(Signalement).filter(Signalement.id != original["id"]).update(
+        {Signalement.duplicate_of: original["id"]}, synchronize_session=False)
+    _age(db, original["id"])
+
+    assert archive_signalements(db, datetime.utcnow(), batch_size=10) == 0
+
+
+def test_archive_job_is_scheduled_once(db):
+    schedule_archive_job(db)
+    db.commit()
+    schedule_archive_job(db)
+    db.commit()
+    assert db.query(Job).filter(Job.kind == ARCHIVE_JOB, Job.status == PENDING).count() == 1
+
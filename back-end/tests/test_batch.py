@@ -0,0 +1,103 @@
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Plusieurs tranches même avec quelques lignes
+    monkeypatch.setattr(settings, "BATCH_CHUNK_SIZE", 2)
+
+
+def _get(client, signalement):
+    return client.get(f"/signalements/{signalement['id']}")
+
+
+def test_patch_by_ids_reports_missing_ids(client, make_signalement, admin_headers):
+    rows = [make_signalement() for _ in range(3)]
+    etag = _get(client, rows[0]).headers["ETag"]
+
+    response = client.patch("/signalements/batch", json={
+        "ids": [row["id"] for row in rows] + [999999], "status": "résolu", "gravite": "urgent"},
+        headers=admin_headers)
+    assert response.json() == {"affected": 3, "not_found": [999999]}
+
+    for row in rows:
+        assert {k: _get(client, row).json()[k] for k in ("status", "gravite")} == {
+            "status": "résolu", "gravite": "urgent"}
+    assert _get(client, rows[0]).headers["ETag"] != etag
+    assert client.get("/signalements/stats").json()["status"] == {"résolu": 3}
+
+
+def test_patch_by_filters_only_touches_matching_rows(client, make_signalement, admin_headers):
+    casablanca = [make_signalement() for _ in range(3)]
+    rabat = make_signalement(ville="Rabat")
+
+    response = client.patch("/signalements/batch", json={"filters": {"ville": "casa"}, "status": "en_cours"},
+                            headers=admin_headers)
+    assert response.json() == {"affected": 3, "not_found": []}
+    assert {_get(client, row).json()["status"] for row in casablanca} == {"en_cours"}
+    assert _get(client, rabat).json()["status"] == "nouveau"
+    # Les listes en cache ne servent pas l'ancien status
+    search = client.get("/signalements/search", params={"status": "en_cours"}).json()
+    assert len(search) == 3
+
+
+def test_batch_delete_by_ids_and_filters(client, make_signalement, admin_headers):
+    first, second = make_signalement(), make_signalement()
+    urgent = [make_signalement(gravite="urgent") for _ in range(3)]
+
+    response = client.post("/signalements/batch-delete", json={"ids": [first["id"], 999999]},
+                           headers=admin_headers)
+    assert response.json() == {"affected": 1, "not_found": [999999]}
+    assert _get(client, first).status_code == 404
+
+    response = client.post("/signalements/batch-delete", json={"filters": {"gravite": "urgent"}},
+                           headers=admin_headers)
+    assert response.json() == {"affected": 3, "not_found": []}
+    assert [row["id"] for row in client.get("/signalements/").json()] == [second["id"]]
+    assert client.get("/signalements/search", params={"q": "trou"}).json()[0]["id"] == second["id"]
+    assert client.get("/signalements/stats").json()["total"] == 1
+    assert all(_get(client, row).status_code == 404 for row in urgent)
+
+
+def test_text_filters_target_what_search_returns(client, make_signalement, admin_headers):
+    lampadaire = make_signalement(titre="Lampadaire en panne", description="Éclairage public éteint")
+    eteint = make_signalement(titre="Feu éteint", description="Éclairage du carrefour", status="en_cours")
+    trou = make_signalement()
+    # Accents ignorés comme dans /search, là où un ILIKE ne trouverait rien
+    filters = {"q": "eclairage", "status": "nouveau"}
+    search = client.get("/signalements/search", params=filters).json()
+    assert [row["id"] for row in search] == [lampadaire["id"]]
+
+    response = client.patch("/signalements/batch", json={"filters": filters, "gravite": "urgent"},
+                            headers=admin_headers)
+    assert response.json() == {"affected": 1, "not_found": []}
+    assert {row["id"]: _get(client, row).json()["gravite"] for row in (lampadaire, eteint, trou)} == {
+        lampadaire["id"]: "urgent", eteint["id"]: "mineur", trou["id"]: "mineur"}
+
+    response = client.post("/signalements/batch-delete", json={"filters": {"titre": "lamp"}},
+                           headers=admin_headers)
+    assert response.json() == {"affected": 1, "not_found": []}
+    assert _get(client, lampadaire).status_code == 404
+
+
+@pytest.mark.parametrize("body, status_code", [
+    ({"ids": [1], "filters": {"ville": "Rabat"}, "status": "résolu"}, 422),
+    ({"filters": {"vile": "Rabat"}, "status": "résolu"}, 422),
+    ({"ids": [1]}, 422),
+    ({"filters": {}, "status": "résolu"}, 400),
+])
+def test_invalid_targets_are_rejected(client, admin_headers, body, status_code):
+    assert client.patch("/signalements/batch", json=body, headers=admin_headers).status_code == status_code
+
+
+def test_batch_operations_require_an_admin(client, make_signalement, citizen_headers):
+    created = make_signalement()
+    body = {"ids": [created["id"]], "status": "résolu"}
+    for headers in ({}, citizen_headers):
+        expected = 403 if headers else 401
+        assert client.patch("/signalements/batch", json=body, headers=headers).status_code == expected
+        assert client.post("/signalements/batch-delete", json={"ids": [created["id"]]},
+                           headers=headers).status_code == expected
+    assert _get(client, created).json()["status"] == "nouveau"
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.endpoints import compare, percentile
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _scenario(p95, rps, sql):
+    return {"p95_ms": p95, "requests_per_second": rps, "sql_per_request": sql}
+
+
+def test_percentile_picks_the_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 51
+    assert percentile(values, 0.99) == 100
+    assert percentile([], 0.5) is None
+
+
+def test_compare_flags_latency_throughput_and_sql_regressions():
+    baseline = {"scenarios": {
+        "stable": _scenario(10, 100, 1), "slower": _scenario(10, 100, 1),
+        "fewer_rps": _scenario(10, 100, 1), "more_sql": _scenario(10, 100, 1),
+    }}
+    results = {"scenarios": {
+        "stable": _scenario(11, 95, 1), "slower": _scenario(20, 100, 1),
+        "fewer_rps": _scenario(10, 50, 1), "more_sql": _scenario(10, 100, 2), "new": _scenario(5, 10, 1),
+    }}
+    assert compare(results, baseline, 0.25) == ["slower", "fewer_rps", "more_sql"]
+
+
+def test_suite_runs_end_to_end_on_sqlite(tmp_path):
+    output = tmp_path / "results.json"
+    # Workers de tâches actifs comme en production : l'archivage ne doit pas vider la base semée
+    env = {**os.environ, "DB_URL": "", "JOB_WORKERS": "1"}
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.endpoints", "--signalements", "50", "--citizens", "5",
+         "--requests", "4", "--concurrency", "2", "--database-url", f"sqlite:///{tmp_path / 'bench.db'}",
+         "--only", "GET /signalements/stats,GET /auth/me,GET /signalements/{id},PUT /signalements/{id}",
+         "--output", str(output)],
+        cwd=BACKEND_DIR, env=env, check=True, capture_output=True, timeout=300,
+    )
+    report = json.loads(output.read_text())
+    assert report["database"] == "sqlite"
+    assert set(report["scenarios"]) == {
+        "GET /signalements/stats", "GET /auth/me", "GET /signalements/{id}", "PUT /signalements/{id}"}
+    for scenario in report["scenarios"].values():
+        assert scenario["statuses"] == {"200": 4}
+
+
+def test_search_index_benchmark_runs_at_the_baseline_revisions(tmp_path):
+    # Base tenue aux révisions 0001/0002 : seules les colonnes d'origine sont lues
+    output = tmp_path / "search.json"
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.search_indexes", "--rows", "200", "--repeat", "2",
+         "--database-url", f"sqlite:///{tmp_path / 'search.db'}", "--output", str(output)],
+        cwd=BACKEND_DIR, env={**os.environ, "DB_URL": ""}, check=True, capture_output=True, timeout=300,
+    )
+    report = json.loads(output.read_text())
+    assert report["rows"] == 200
+    for shape in report["shapes"].values():
+        assert shape["before"]["plan"] and shape["after"]["plan"]
@@ -0,0 +1,51 @@
+import json
+
+from sqlalchemy import insert
+
+import app.crud.signalement as crud
+from app.core.search_index import search_index
+from app.models.signalement import Signalement
+
+
+def _row(citizen, titre, **fields):
+    return {"citizen_id": citizen, "titre": titre, "localisation": "Rue des Orangers", "ville": "Rabat",
+            "description": "Signalé par import", "categorie": "police", **fields}
+
+
+def test_bulk_json_array_reports_invalid_rows(client, citizen):
+    rows = [_row(citizen, "Feu rouge en panne"), {"titre": "incomplet"}, _row(citizen, "Nid de poule")]
+    response = client.post("/signalements/bulk", json=rows)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["received"], result["inserted"], result["failed"]) == (3, 2, 1)
+    assert result["errors"][0]["index"] == 1
+    assert client.get("/signalements/stats").json()["total"] == 2
+
+
+def test_bulk_ndjson_stream_in_several_batches(client, citizen):
+    body = "\n".join(json.dumps(_row(citizen, f"Signalement {i}")) for i in range(5))
+    response = client.post("/signalements/bulk?batch_size=2", content=body,
+                           headers={"Content-Type": "application/x-ndjson"})
+    assert response.json()["inserted"] == 5
+    assert len(client.get("/signalements/?limit=10").json()) == 5
+
+
+def test_concurrent_insert_is_not_taken_for_a_batch_row(db, citizen, monkeypatch):
+    enqueued = []
+    real_enqueue = crud.enqueue
+
+    def enqueue_after_foreign_insert(session, kind, payload, **kwargs):
+        # Une autre requête insère une ligne pendant le lot (id plus grand)
+        session.execute(insert(Signalement.__table__), [_row(citizen, "Créé ailleurs")])
+        enqueued.append(payload["ids"])
+        return real_enqueue(session, kind, payload, **kwargs)
+
+    monkeypatch.setattr(crud, "enqueue", enqueue_after_foreign_insert)
+    count, errors = crud.bulk_insert_signalements(db, [(0, _row(citizen, "Lampadaire")),
+                                                       (1, _row(citizen, "Poubelle"))])
+    assert (count, errors) == (2, [])
+    batch_ids = {s.id for s in db.query(Signalement).filter(Signalement.titre.in_(["Lampadaire", "Poubelle"]))}
+    assert enqueued == [sorted(batch_ids)]
+    foreign = db.query(Signalement).filter(Signalement.titre == "Créé ailleurs").one()
+    _, found = search_index.search([("ailleurs", None)])
+    assert foreign.id not in found
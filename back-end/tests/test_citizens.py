@@ -0,0 +1,37 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.database import async_engine
+
+
+def test_async_engine_uses_an_async_driver():
+    assert async_engine.dialect.is_async
+
+    async def ping():
+        async with async_engine.connect() as connection:
+            return (await connection.execute(text("SELECT 1"))).scalar()
+
+    assert asyncio.run(ping()) == 1
+
+
+def test_citizen_crud_over_async_routes(client):
+    created = client.post("/citizens/", json={
+        "email": "nadia@example.com", "password_hash": "x", "numero_telephone": "0611111111"})
+    assert created.status_code == 201, created.text
+    citizen_id = created.json()["id"]
+
+    assert client.get(f"/citizens/{citizen_id}").json()["email"] == "nadia@example.com"
+    assert [c["id"] for c in client.get("/citizens/").json()] == [citizen_id]
+
+    updated = client.put(f"/citizens/{citizen_id}", json={"numero_telephone": "0622222222"})
+    assert updated.json()["numero_telephone"] == "0622222222"
+
+    assert client.delete(f"/citizens/{citizen_id}").status_code == 204
+    assert client.get(f"/citizens/{citizen_id}").status_code == 404
+
+
+def test_duplicate_email_is_rejected(client):
+    payload = {"email": "nadia@example.com", "password_hash": "x"}
+    assert client.post("/citizens/", json=payload).status_code == 201
+    assert client.post("/citizens/", json=payload).status_code == 400
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import text
+
+from app.crud.signalement import SignalementConflict, update_signalement
+from app.models.signalement import Signalement
+from tests.conftest import update_payload
+
+
+def test_get_returns_304_for_current_etag(client, make_signalement):
+    created = make_signalement()
+    first = client.get(f"/signalements/{created['id']}")
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+    assert client.get(f"/signalements/{created['id']}", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_stale_if_match_within_the_same_second_is_rejected(client, make_signalement):
+    created = make_signalement()
+    etag = client.get(f"/signalements/{created['id']}").headers["ETag"]
+    # Deux modifications dans la même seconde : l'ETag doit changer quand même
+    first = client.put(f"/signalements/{created['id']}", json=update_payload(created, status="en_cours"),
+                       headers={"If-Match": etag})
+    assert first.status_code == 200
+    assert first.headers["ETag"] != etag
+    stale = client.put(f"/signalements/{created['id']}", json=update_payload(created, status="résolu"),
+                       headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.get(f"/signalements/{created['id']}").json()["status"] == "en_cours"
+
+
+def test_if_match_with_current_etag_succeeds_and_chains(client, make_signalement):
+    created = make_signalement()
+    etag = client.get(f"/signalements/{created['id']}").headers["ETag"]
+    for status in ("en_cours", "résolu"):
+        response = client.put(f"/signalements/{created['id']}", json=update_payload(created, status=status),
+                              headers={"If-Match": etag})
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+    assert client.get(f"/signalements/{created['id']}").headers["ETag"] == etag
+
+
+def test_collection_etag_changes_after_same_second_edit(client, make_signalement):
+    created = make_signalement()
+    etag = client.get("/signalements/").headers["ETag"]
+    client.put(f"/signalements/{created['id']}", json=update_payload(created, titre="Titre corrigé"))
+    response = client.get("/signalements/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["titre"] == "Titre corrigé"
+
+
+def test_search_etag_changes_after_batch_update(client, make_signalement, admin_headers):
+    created = make_signalement(status="nouveau")
+    etag = client.get("/signalements/search?status=nouveau").headers["ETag"]
+    client.patch("/signalements/batch", json={"ids": [created["id"]], "gravite": "urgent"},
+                 headers=admin_headers)
+    assert client.get("/signalements/search?status=nouveau", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_missing_signalement_is_404(client):
+    assert client.get("/signalements/999").status_code == 404
+
+
+def test_write_between_read_and_update_is_a_conflict(db, make_signalement):
+    created = make_signalement()
+
+    def precondition(current):
+        # Une autre écriture valide la ligne juste après sa lecture
+        db.execute(text("UPDATE signalements SET version = version + 1 WHERE id = :id"), {"id": current.id})
+        return True
+
+    with pytest.raises(SignalementConflict):
+        update_signalement(db, created["id"], {"status": "résolu"}, precondition=precondition)
+    assert db.query(Signalement.status).filter(Signalement.id == created["id"]).scalar() == "nouveau"
+
+
+def test_grouped_updates_bump_the_version(client, db, make_signalement):
+    original = make_signalement(titre="Original")
+    duplicate = make_signalement(titre="Doublon")
+    db.execute(text("UPDATE signalements SET duplicate_of = :o WHERE id = :d"),
+               {"o": original["id"], "d": duplicate["id"]})
+    db.commit()
+    etag = client.get(f"/signalements/{duplicate['id']}").headers["ETag"]
+    # La suppression de l'original détache le doublon : nouvelle version
+    client.delete(f"/signalements/{original['id']}")
+    assert client.get(f"/signalements/{duplicate['id']}").headers["ETag"] != etag
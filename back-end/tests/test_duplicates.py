@@ -0,0 +1,33 @@
+from app.core.jobs import job_queue
+
+
+def test_near_duplicate_is_linked_to_the_original(client, db, make_signalement):
+    original = make_signalement()
+    duplicate = make_signalement(titre="Trou dans la chaussée !",
+                                 description="Un trou profond gêne la circulation des voitures")
+    other_city = make_signalement(ville="Rabat")
+    other = make_signalement(titre="Lampadaire éteint", description="Plus aucun éclairage la nuit")
+
+    assert job_queue.run_pending(db) >= 1
+
+    def duplicate_of(signalement):
+        return client.get(f"/signalements/{signalement['id']}").json()["duplicate_of"]
+
+    assert duplicate_of(original) is None
+    assert duplicate_of(duplicate) == original["id"]
+    assert duplicate_of(other_city) is None
+    assert duplicate_of(other) is None
+
+    linked = client.get(f"/signalements/{original['id']}/duplicates", params={"fields": "id,duplicate_of"})
+    assert linked.json() == [{"id": duplicate["id"], "duplicate_of": original["id"]}]
+    assert client.get("/signalements/999999/duplicates").status_code == 404
+
+
+def test_deleting_the_original_unlinks_its_duplicates(client, db, make_signalement):
+    original = make_signalement()
+    duplicate = make_signalement()
+    job_queue.run_pending(db)
+    assert client.get(f"/signalements/{duplicate['id']}").json()["duplicate_of"] == original["id"]
+
+    assert client.delete(f"/signalements/{original['id']}").status_code == 200
+    assert client.get(f"/signalements/{duplicate['id']}").json()["duplicate_of"] is None
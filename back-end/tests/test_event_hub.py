@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import app.crud.signalement as crud
+from app.core.event_hub import RESYNC, EventHub
+from tests.conftest import update_payload
+
+
+def test_api_writes_are_published_and_replayed(client, monkeypatch, make_signalement):
+    hub = EventHub(replay_size=10)
+    monkeypatch.setattr(crud, "event_hub", hub)
+
+    created = make_signalement()
+    client.put(f"/signalements/{created['id']}", json=update_payload(created, status="résolu"))
+    client.delete(f"/signalements/{created['id']}")
+
+    _, backlog = hub.subscribe({}, last_event_id=f"{hub.epoch}-0")
+    assert [(e.kind, e.data["id"]) for e in backlog] == [
+        ("created", created["id"]), ("updated", created["id"]), ("deleted", created["id"])]
+    assert backlog[1].data["status"] == "résolu"
+
+    frame = hub.sse_frame(backlog[0])
+    assert frame.startswith(f"id: {hub.epoch}-1\nevent: created\ndata: {{")
+    assert frame.endswith("\n\n")
+
+
+def test_resume_from_an_unknown_or_expired_id_requires_resync():
+    hub = EventHub(replay_size=2)
+    for n in range(3):
+        hub.publish("created", {"id": n, "ville": "Rabat"})
+
+    assert hub.subscribe({}, last_event_id="autre-epoque-1")[1] is None
+    assert hub.subscribe({}, last_event_id=f"{hub.epoch}-0")[1] is None
+    assert [e.data["id"] for e in hub.subscribe({}, last_event_id=f"{hub.epoch}-1")[1]] == [1, 2]
+
+
+def test_dispatch_filters_and_replaces_overflow_with_resync():
+    async def scenario():
+        hub = EventHub(max_queue=2)
+        hub.bind(asyncio.get_running_loop())
+        fes, _ = hub.subscribe({"ville": ["Fès"], "categorie": None})
+        everyone, _ = hub.subscribe({})
+
+        def publish():
+            hub.publish("created", {"id": 1, "ville": "FES"})
+            hub.publish("created", {"id": 2, "ville": "Rabat"})
+
+        thread = threading.Thread(target=publish)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        assert [fes.queue.get_nowait().data["id"]] == [1]
+        assert everyone.queue.qsize() == 2
+
+        # File pleine : les événements en attente sont remplacés par un resync
+        hub.publish("created", {"id": 3, "ville": "Rabat"})
+        await asyncio.sleep(0)
+        assert everyone.queue.get_nowait() is RESYNC
+        assert everyone.queue.empty()
+
+        hub.unsubscribe(fes)
+        hub.unsubscribe(everyone)
+        assert len(hub) == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,41 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.crud.signalement import EXPORT_COLUMNS
+from app.utils.export import parquet_available
+
+
+def test_csv_export_streams_matching_rows(client, make_signalement):
+    make_signalement(titre="Trou", ville="Casablanca", commentaire='virgule, "guillemets"')
+    make_signalement(titre="Panne", ville="Rabat")
+    response = client.get("/signalements/export?format=csv&ville=Casa")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="signalements.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert [(r["titre"], r["commentaire"]) for r in rows] == [("Trou", 'virgule, "guillemets"')]
+
+
+def test_ndjson_export_is_newest_first(client, make_signalement):
+    ids = [make_signalement(titre=f"Signalement {i}")["id"] for i in range(3)]
+    response = client.get("/signalements/export?format=ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == sorted(ids, reverse=True)
+    assert "bulk_token" not in lines[0]
+
+
+def test_unknown_format_is_rejected(client):
+    assert client.get("/signalements/export?format=xlsx").status_code == 400
+
+
+@pytest.mark.skipif(not parquet_available(), reason="pyarrow n'est pas installé")
+def test_parquet_export(client, make_signalement):
+    import pyarrow.parquet as pq
+
+    make_signalement()
+    table = pq.read_table(io.BytesIO(client.get("/signalements/export?format=parquet").content))
+    assert table.num_rows == 1
+    assert table.column_names == list(EXPORT_COLUMNS)
@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.config import Settings, settings
+from app.core.response_cache import invalidate_signalements
+
+
+@pytest.mark.parametrize("url", [
+    "/signalements/",
+    "/signalements/search?ville=Casablanca",
+    "/citizens/",
+])
+def test_fast_path_matches_pydantic_output(client, make_signalement, monkeypatch, url):
+    make_signalement()
+    make_signalement(titre="Lampadaire éteint", commentaire="Signalé deux fois")
+
+    slow = client.get(url)
+    invalidate_signalements()
+    monkeypatch.setattr(settings, "FAST_JSON_LISTS", True)
+    fast = client.get(url)
+
+    assert fast.status_code == slow.status_code == 200
+    assert fast.json() == slow.json()
+    assert list(fast.json()[0]) == list(slow.json()[0])
+    assert fast.headers["content-type"] == "application/json"
+
+
+def test_fast_path_is_opt_in():
+    assert Settings.model_fields["FAST_JSON_LISTS"].default is False
+
+
+def test_openapi_schema_keeps_response_models(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    for path in ("/signalements/", "/signalements/search", "/citizens/"):
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["type"] == "array"
+        assert "$ref" in schema["items"]
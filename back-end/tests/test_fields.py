@@ -0,0 +1,31 @@
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_list_returns_only_requested_fields(client, make_signalement, monkeypatch, fast):
+    monkeypatch.setattr(settings, "FAST_JSON_LISTS", fast)
+    created = make_signalement()
+
+    rows = client.get("/signalements/", params={"fields": "titre, id"}).json()
+    assert rows == [{"id": created["id"], "titre": created["titre"]}]
+
+    rows = client.get("/signalements/search", params={"ville": "casa", "fields": "ville,status"}).json()
+    assert rows == [{"ville": "Casablanca", "status": "nouveau"}]
+
+
+def test_cursor_works_without_id_and_created_at_fields(client, make_signalement):
+    ids = [make_signalement(titre=f"Trou n°{n}")["id"] for n in range(3)]
+
+    first = client.get("/signalements/", params={"fields": "titre", "limit": 2})
+    assert [set(row) for row in first.json()] == [{"titre"}, {"titre"}]
+    rest = client.get("/signalements/", params={"fields": "id", "limit": 2,
+                                                "cursor": first.headers["X-Next-Cursor"]})
+    assert [row["id"] for row in rest.json()] == [min(ids)]
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/signalements/", params={"fields": "id,password_hash"})
+    assert response.status_code == 400
+    assert "password_hash" in response.json()["detail"]
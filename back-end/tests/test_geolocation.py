@@ -0,0 +1,49 @@
+from tests.conftest import update_payload
+
+MAARIF = (33.5835, -7.6325)
+
+
+def _coordinates(client, signalement_id):
+    body = client.get(f"/signalements/{signalement_id}").json()
+    return body["latitude"], body["longitude"]
+
+
+def test_creation_geocodes_known_places(client, make_signalement):
+    created = make_signalement(localisation="Boulevard du Maârif")
+    assert (created["latitude"], created["longitude"]) == MAARIF
+
+
+def test_status_only_update_keeps_coordinates(client, make_signalement):
+    # Coordonnées saisies pour un lieu absent du gazetteer
+    created = make_signalement(latitude=33.6, longitude=-7.5)
+
+    response = client.put(f"/signalements/{created['id']}", json=update_payload(created, status="en_cours"))
+    assert response.status_code == 200, response.text
+    assert _coordinates(client, created["id"]) == (33.6, -7.5)
+
+
+def test_place_change_regeocodes_without_erasing(client, make_signalement):
+    created = make_signalement(latitude=33.6, longitude=-7.5)
+
+    client.put(f"/signalements/{created['id']}", json=update_payload(created, localisation="Rue inconnue"))
+    assert _coordinates(client, created["id"]) == (33.6, -7.5)
+
+    client.put(f"/signalements/{created['id']}", json=update_payload(created, localisation="Maârif"))
+    assert _coordinates(client, created["id"]) == MAARIF
+
+
+def test_nearby_orders_by_distance(client, make_signalement):
+    near = make_signalement(localisation="Maârif")
+    far = make_signalement(localisation="Médina")
+    make_signalement(localisation="Tour Hassan", ville="Rabat")
+
+    response = client.get("/signalements/nearby", params={"lat": MAARIF[0], "lon": MAARIF[1], "radius": 5000})
+    assert response.status_code == 200, response.text
+    rows = response.json()
+    assert [row["id"] for row in rows] == [near["id"], far["id"]]
+    assert rows[0]["distance_m"] == 0
+    assert response.headers["X-Total-Count"] == "2"
+
+    by_place = client.get("/signalements/nearby", params={"place": "Maârif", "ville": "Casablanca", "radius": 100})
+    assert [row["id"] for row in by_place.json()] == [near["id"]]
+    assert client.get("/signalements/nearby", params={"place": "Atlantide"}).status_code == 404
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+
+from app.core import jobs
+from app.core.jobs import DONE, FAILED, HANDLERS, PENDING, enqueue, job_queue, utcnow
+from app.models.job import Job
+
+KIND = "tests.flaky"
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Gestionnaire de test : échoue tant que payload["failures"] n'est pas épuisé."""
+    seen = []
+
+    def handler(db, payload):
+        seen.append(payload)
+        if len(seen) <= payload["failures"]:
+            raise RuntimeError("indisponible")
+
+    monkeypatch.setitem(HANDLERS, KIND, handler)
+    return seen
+
+
+def _job(db, job_id):
+    db.expire_all()
+    return db.get(Job, job_id)
+
+
+def _make_ready(db, job_id):
+    db.query(Job).filter(Job.id == job_id).update({Job.run_at: utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+
+def test_enqueue_follows_the_transaction(db, calls):
+    enqueue(db, KIND, {"failures": 0})
+    db.rollback()
+    assert job_queue.run_pending(db) == 0
+
+    enqueue(db, KIND, {"failures": 0})
+    db.commit()
+    assert job_queue.run_pending(db) == 1
+    assert calls == [{"failures": 0}]
+    assert db.query(Job.status).scalar() == DONE
+
+
+def test_failed_attempt_is_retried_later(db, calls):
+    job = enqueue(db, KIND, {"failures": 1})
+    db.commit()
+    job_id = job.id
+
+    assert job_queue.run_pending(db) == 1
+    job = _job(db, job_id)
+    assert (job.status, job.attempts) == (PENDING, 1)
+    assert job.last_error == "RuntimeError: indisponible"
+    assert job.run_at > utcnow()
+    # Pas encore prête : le délai de reprise n'est pas écoulé
+    assert job_queue.run_pending(db) == 0
+
+    _make_ready(db, job_id)
+    assert job_queue.run_pending(db) == 1
+    job = _job(db, job_id)
+    assert (job.status, job.attempts, job.last_error) == (DONE, 2, None)
+
+
+def test_job_fails_after_max_attempts(db, calls):
+    job = enqueue(db, KIND, {"failures": 5}, max_attempts=2)
+    db.commit()
+    job_id = job.id
+
+    job_queue.run_pending(db)
+    _make_ready(db, job_id)
+    job_queue.run_pending(db)
+    job = _job(db, job_id)
+    assert (job.status, job.attempts) == (FAILED, 2)
+    assert job.finished_at is not None
+
+
+def test_expired_lease_is_reclaimed(db, calls):
+    job = enqueue(db, KIND, {"failures": 0})
+    db.commit()
+    job_id = job.id
+
+    claimed = jobs.claim(db, 10)
+    assert [row.id for row in claimed] == [job_id]
+    # Worker arrêté avant la fin : la tâche n'est reprise qu'après son bail
+    assert jobs.claim(db, 10) == []
+    db.query(Job).filter(Job.id == job_id).update({Job.locked_until: utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+    assert job_queue.run_pending(db) == 1
+    # La fin tardive du premier worker ne touche plus la tâche reprise
+    jobs._finish(db, claimed[0], {Job.status: FAILED})
+    job = _job(db, job_id)
+    assert (job.status, job.attempts) == (DONE, 2)
+
+
+def test_retry_delay_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(jobs.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(jobs.settings, "JOB_RETRY_BASE_DELAY", 2.0)
+    monkeypatch.setattr(jobs.settings, "JOB_RETRY_MAX_DELAY", 10.0)
+    assert [jobs.retry_delay(n) for n in (1, 2, 3, 4)] == [2.0, 4.0, 8.0, 10.0]
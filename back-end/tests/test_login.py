@@ -0,0 +1,42 @@
+import asyncio
+
+import app.api.auth as auth
+from app.utils.security import HashingPoolBusy, get_password_hash, verify_password_async
+from tests.conftest import login
+
+
+def test_login_returns_a_token_for_valid_credentials(client, citizen):
+    response = login(client, "citoyen@example.com")
+    assert response.status_code == 200, response.text
+    assert response.json()["role"] == "citizen"
+    token = response.json()["access_token"]
+    me = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.json() == {"id": citizen, "email": "citoyen@example.com", "role": "citizen"}
+
+
+def test_login_rejects_a_wrong_password(client, citizen):
+    assert login(client, "citoyen@example.com", "mauvais").status_code == 401
+
+
+def test_admin_takes_precedence(client, admin):
+    assert login(client, "admin@example.com").json()["role"] == "admin"
+
+
+def test_verification_runs_in_the_hash_pool():
+    hashed = get_password_hash("secret")
+
+    async def verify():
+        return await asyncio.gather(verify_password_async("secret", hashed),
+                                    verify_password_async("autre", hashed))
+
+    assert asyncio.run(verify()) == [True, False]
+
+
+def test_saturated_hash_pool_answers_503(client, citizen, monkeypatch):
+    async def busy(*args):
+        raise HashingPoolBusy("saturated")
+
+    monkeypatch.setattr(auth, "verify_password_async", busy)
+    response = login(client, "citoyen@example.com")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
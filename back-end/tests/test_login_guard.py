@@ -0,0 +1,53 @@
+from app.core import login_guard
+from app.core.config import settings
+from app.utils.rate_limit import TokenBuckets
+from tests.conftest import login
+
+
+def test_email_burst_answers_429_before_checking_the_password(client, citizen, monkeypatch):
+    monkeypatch.setattr(login_guard, "email_buckets", TokenBuckets(3, 1 / 60.0, 100))
+
+    assert [login(client, "citoyen@example.com", "mauvais").status_code for _ in range(3)] == [401] * 3
+    rejected = login(client, "Citoyen@Example.com ")
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    # Les autres emails ne sont pas concernés
+    assert login(client, "autre@example.com").status_code == 401
+
+
+def test_success_gives_the_email_its_tokens_back(client, citizen, monkeypatch):
+    monkeypatch.setattr(login_guard, "email_buckets", TokenBuckets(2, 1 / 60.0, 100))
+
+    assert login(client, "citoyen@example.com", "mauvais").status_code == 401
+    assert login(client, "citoyen@example.com").status_code == 200
+    assert login(client, "citoyen@example.com", "mauvais").status_code == 401
+    assert login(client, "citoyen@example.com", "mauvais").status_code == 401
+    assert login(client, "citoyen@example.com").status_code == 429
+
+
+def test_ip_burst_applies_across_emails(client, monkeypatch):
+    monkeypatch.setattr(login_guard, "ip_buckets", TokenBuckets(2, 1 / 60.0, 100))
+    assert [login(client, f"inconnu{n}@example.com").status_code for n in range(3)] == [401, 401, 429]
+
+
+def test_unknown_email_is_remembered_until_the_account_exists(client, db):
+    assert login(client, "nouveau@example.com").status_code == 401
+    assert login_guard.is_unknown("nouveau@example.com")
+
+    created = client.post("/citizens/", json={"email": "nouveau@example.com", "password_hash": "x"})
+    assert created.status_code == 201
+    assert not login_guard.is_unknown("nouveau@example.com")
+
+
+def test_admission_can_be_disabled(client, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_ADMISSION", False)
+    monkeypatch.setattr(login_guard, "ip_buckets", TokenBuckets(1, 1 / 60.0, 100))
+    assert [login(client, "inconnu@example.com").status_code for _ in range(3)] == [401] * 3
+
+
+def test_unknown_email_is_cached_as_typed(client, citizen):
+    # Email absent tel quel (comparaison sensible à la casse sous SQLite)
+    assert login(client, "Citoyen@example.com").status_code == 401
+    assert login_guard.is_unknown("Citoyen@example.com")
+    assert not login_guard.is_unknown("citoyen@example.com")
+    assert login(client, "citoyen@example.com").status_code == 200
@@ -0,0 +1,40 @@
+import re
+
+from app.core.metrics import Histogram
+
+
+def _sample(body, metric, **labels):
+    """Valeur d'un échantillon du format texte Prometheus (labels dans l'ordre donné)."""
+    label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{re.escape(metric)}\{{{re.escape(label_text)}[,}}].* ([0-9.e+-]+)$", body, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_requests_are_counted_by_route_template(client, make_signalement):
+    created = make_signalement()
+    before = _sample(client.get("/metrics").text, "http_requests_total",
+                     method="GET", route="/signalements/{id}", status="200")
+    client.get(f"/signalements/{created['id']}")
+    client.get(f"/signalements/{created['id']}")
+    body = client.get("/metrics").text
+    assert _sample(body, "http_requests_total", method="GET", route="/signalements/{id}", status="200") == before + 2
+    assert f'route="/signalements/{created["id"]}"' not in body
+
+
+def test_sql_statements_are_recorded_per_request(client, make_signalement):
+    make_signalement()
+    client.get("/signalements/")
+    body = client.get("/metrics").text
+    assert _sample(body, "http_request_db_statements_count", method="GET", route="/signalements/") >= 1
+    assert _sample(body, "db_statements_total", engine="sync") > 0
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, ("/x",))
+    lines = "\n".join(histogram.collect())
+    assert 'test_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/x",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{route="/x",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{route="/x"} 3' in lines
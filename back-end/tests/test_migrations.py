@@ -0,0 +1,72 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect
+
+from app.core.database import Base
+from app.core.init_db import ensure_schema, get_alembic_config
+
+SEARCH_INDEXES = {
+    "ix_signalements_created_at_id",
+    "ix_signalements_status_created_at",
+    "ix_signalements_categorie_created_at",
+    "ix_signalements_gravite_created_at",
+    "ix_signalements_citizen_created_at",
+    "ix_signalements_status_gravite_created_at",
+}
+
+
+@pytest.fixture
+def scratch_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scratch.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _migrate(engine, revision, downgrade=False):
+    config = get_alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        (command.downgrade if downgrade else command.upgrade)(config, revision)
+
+
+def _index_names(engine, table="signalements"):
+    return {ix["name"] for ix in inspect(engine).get_indexes(table)}
+
+
+def test_upgrade_creates_composite_search_indexes(scratch_engine):
+    _migrate(scratch_engine, "head")
+    assert SEARCH_INDEXES <= _index_names(scratch_engine)
+
+
+def test_downgrade_drops_search_indexes(scratch_engine):
+    _migrate(scratch_engine, "0002")
+    _migrate(scratch_engine, "0001", downgrade=True)
+    assert not SEARCH_INDEXES & _index_names(scratch_engine)
+
+
+def test_upgrade_keeps_existing_index(scratch_engine):
+    _migrate(scratch_engine, "0001")
+    with scratch_engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE INDEX ix_signalements_status_created_at ON signalements (status, created_at, id)")
+    _migrate(scratch_engine, "head")
+    assert SEARCH_INDEXES <= _index_names(scratch_engine)
+
+
+def test_ensure_schema_is_a_no_op_at_head(client):
+    assert ensure_schema() is False
+
+
+def test_upgrade_keeps_tables_created_before_migrations(scratch_engine):
+    # Base créée par create_all avant la première migration Alembic
+    Base.metadata.create_all(scratch_engine)
+    _migrate(scratch_engine, "head")
+    assert {"jobs", "signalements_archive", "alembic_version"} <= set(inspect(scratch_engine).get_table_names())
+    assert "ix_signalements_status_updated_at" in _index_names(scratch_engine)
+
+
+def test_cache_versions_are_seeded(scratch_engine):
+    _migrate(scratch_engine, "head")
+    with scratch_engine.connect() as connection:
+        rows = dict(connection.exec_driver_sql("SELECT name, version FROM cache_versions").all())
+    assert rows == {"signalements": 0, "principals": 0}
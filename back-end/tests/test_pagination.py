@@ -0,0 +1,39 @@
+from sqlalchemy import text
+
+
+def _follow(client, url):
+    ids, pages = [], 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        ids.extend(row["id"] for row in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"/signalements/?limit=2&cursor={cursor}" if cursor else None
+        pages += 1
+        assert pages < 20, "la pagination ne se termine pas"
+    return ids
+
+
+def test_cursor_pagination_returns_every_row_once(client, make_signalement):
+    created = [make_signalement(titre=f"Signalement {i}")["id"] for i in range(5)]
+    assert _follow(client, "/signalements/?limit=2") == sorted(created, reverse=True)
+
+
+def test_cursor_pagination_with_tied_timestamps(client, db, make_signalement):
+    created = [make_signalement(titre=f"Signalement {i}")["id"] for i in range(5)]
+    # Même created_at pour toutes les lignes, comme après un import en masse
+    db.execute(text("UPDATE signalements SET created_at = '2026-01-15 10:00:00'"))
+    db.commit()
+    assert _follow(client, "/signalements/?limit=2") == sorted(created, reverse=True)
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/signalements/?cursor=not-a-cursor").status_code == 400
+
+
+def test_stream_mode_returns_ndjson(client, make_signalement):
+    make_signalement()
+    make_signalement()
+    response = client.get("/signalements/?stream=true")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(response.text.strip().splitlines()) == 2
@@ -0,0 +1,47 @@
+from sqlalchemy import text
+
+from app.utils.cache import TTLCache
+
+
+def test_current_user_is_served_from_cache(client, db, citizen, citizen_headers):
+    assert client.get("/auth/me", headers=citizen_headers).json()["email"] == "citoyen@example.com"
+    # Modification hors de l'application : le principal en cache reste servi
+    db.execute(text("UPDATE citizen SET email = 'autre@example.com' WHERE id = :id"), {"id": citizen})
+    db.commit()
+    assert client.get("/auth/me", headers=citizen_headers).json()["email"] == "citoyen@example.com"
+
+
+def test_citizen_update_invalidates_cached_principal(client, citizen, citizen_headers):
+    client.get("/auth/me", headers=citizen_headers)
+    client.put(f"/citizens/{citizen}", json={"email": "nouveau@example.com"})
+    assert client.get("/auth/me", headers=citizen_headers).json()["email"] == "nouveau@example.com"
+
+
+def test_deleted_citizen_is_rejected(client, citizen, citizen_headers):
+    client.get("/auth/me", headers=citizen_headers)
+    assert client.delete(f"/citizens/{citizen}").status_code == 204
+    assert client.get("/auth/me", headers=citizen_headers).status_code == 401
+
+
+def test_deletion_by_another_worker_is_seen_immediately(client, db, citizen, citizen_headers):
+    assert client.get("/auth/me", headers=citizen_headers).status_code == 200
+
+    # Autre worker : suppression puis incrément de la version partagée, sans toucher ce cache
+    db.execute(text("DELETE FROM citizen WHERE id = :id"), {"id": citizen})
+    db.execute(text("UPDATE cache_versions SET version = version + 1 WHERE name = 'principals'"))
+    db.commit()
+    assert client.get("/auth/me", headers=citizen_headers).status_code == 401
+
+
+def test_fill_after_concurrent_invalidation_is_ignored():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate(("citizen", 1))
+    assert cache.set(("citizen", 1), "périmé", generation=generation) is False
+    assert cache.get(("citizen", 1)) is None
+
+
+def test_entries_expire():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("jeton", "payload", ttl=0)
+    assert cache.get("jeton") is None
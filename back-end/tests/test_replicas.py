@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Les réplicas sont lus à l'import de app.core.database : scénario exécuté
+# dans un processus à part, avec un réplica injoignable suivi d'une copie
+# du primaire sans les écritures faites ensuite
+SCRIPT = r"""
+import json, os, shutil, sys
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.core.database import SessionLocal, engine
+
+primary, replica = sys.argv[1], sys.argv[2]
+result = {}
+with TestClient(app) as client:
+    db = SessionLocal()
+    db.execute(text("INSERT INTO citizen (email, password_hash) VALUES ('r@example.com', 'x')"))
+    db.commit()
+    db.close()
+    engine.dispose()
+    shutil.copyfile(primary, replica)
+
+    created = client.post("/signalements/", json={
+        "citizen_id": 1, "titre": "Trou", "localisation": "Rue A", "ville": "Rabat",
+        "description": "Profond", "categorie": "admin"})
+    result["cookie"] = "db_primary_until" in created.headers.get("set-cookie", "")
+    result["sticky_list"] = len(client.get("/signalements/").json())
+    client.cookies.clear()
+    result["replica_list"] = len(client.get("/signalements/?limit=50").json())
+    result["primary_detail"] = client.get("/signalements/%d" % created.json()["id"]).status_code
+print(json.dumps(result))
+"""
+
+
+def test_reads_go_to_replicas_except_after_own_writes(tmp_path):
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    env = {
+        **os.environ,
+        "DB_URL": f"sqlite:///{primary}",
+        "DB_REPLICA_URLS": f"sqlite:///{tmp_path}/absent/replica.db,sqlite:///{replica}",
+    }
+    completed = subprocess.run([sys.executable, "-c", SCRIPT, str(primary), str(replica)],
+                               cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=300)
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    # Le client qui vient d'écrire lit le primaire, les autres le réplica (sans la ligne)
+    assert result == {"cookie": True, "sticky_list": 1, "replica_list": 0, "primary_detail": 200}
+
+
+def test_sticky_cookie_must_be_unexpired():
+    import time
+
+    from app.core.database import STICKY_COOKIE, _sticky_from_cookie
+
+    def scope(value):
+        return {"headers": [(b"cookie", f"autre=1; {STICKY_COOKIE}={value}".encode())]}
+
+    assert _sticky_from_cookie(scope(time.time() + 5)) is True
+    assert _sticky_from_cookie(scope(time.time() - 5)) is False
+    assert _sticky_from_cookie(scope("invalide")) is False
+    assert _sticky_from_cookie({"headers": []}) is False
@@ -0,0 +1,44 @@
+from sqlalchemy import text
+
+from app.core.response_cache import response_cache, search_cache_key
+
+
+def test_list_is_served_from_cache_until_a_write(client, db, make_signalement):
+    make_signalement(titre="Premier")
+    assert len(client.get("/signalements/").json()) == 1
+    hits = response_cache.hits
+
+    # Écriture hors API : la réponse en cache reste servie
+    db.execute(text("UPDATE signalements SET titre = 'Modifié en base'"))
+    db.commit()
+    assert client.get("/signalements/").json()[0]["titre"] == "Premier"
+    assert response_cache.hits == hits + 1
+
+    # Une écriture par l'API vide le cache
+    make_signalement(titre="Second")
+    assert {row["titre"] for row in client.get("/signalements/").json()} == {"Modifié en base", "Second"}
+
+
+def test_write_from_another_worker_invalidates_the_cache(client, db, make_signalement):
+    make_signalement(titre="Premier")
+    client.get("/signalements/")
+
+    # Autre worker : modification puis incrément de la version partagée, sans toucher ce cache
+    db.execute(text("UPDATE signalements SET titre = 'Modifié ailleurs'"))
+    db.execute(text("UPDATE cache_versions SET version = version + 1 WHERE name = 'signalements'"))
+    db.commit()
+    assert client.get("/signalements/").json()[0]["titre"] == "Modifié ailleurs"
+
+
+def test_search_key_ignores_parameter_order_and_spaces():
+    assert (search_cache_key({"ville": " Rabat ", "status": "nouveau"}, 0, 10)
+            == search_cache_key({"status": "nouveau", "ville": "Rabat"}, 0, 10))
+    assert search_cache_key({"ville": "Rabat"}, 0, 10) != search_cache_key({"ville": "Rabat"}, 10, 10)
+
+
+def test_cache_stats_require_an_admin(client, citizen_headers, admin_headers):
+    for path in ("/signalements/cache-stats", "/auth/cache-stats", "/auth/login-stats"):
+        assert client.get(path).status_code == 401
+        assert client.get(path, headers=citizen_headers).status_code == 403
+        assert client.get(path, headers=admin_headers).status_code == 200
+    assert "responses" in client.get("/signalements/cache-stats", headers=admin_headers).json()
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.core.search_index import search_index
+from app.crud.signalement import refresh_indexes
+
+
+def _titles(response):
+    assert response.status_code == 200, response.text
+    return {row["titre"] for row in response.json()}
+
+
+def test_field_filters_match_substrings(client, make_signalement):
+    make_signalement(titre="Trou dans la chaussée", ville="Casablanca")
+    make_signalement(titre="Lampadaire en panne", ville="Rabat")
+    assert _titles(client.get("/signalements/search?titre=tro")) == {"Trou dans la chaussée"}
+    assert _titles(client.get("/signalements/search?ville=Casa")) == {"Trou dans la chaussée"}
+    assert _titles(client.get("/signalements/search?description=profond")) == {
+        "Trou dans la chaussée", "Lampadaire en panne"}
+
+
+def test_field_criteria_are_ranked_by_the_index(client, make_signalement):
+    make_signalement(titre="Trou", description="Petit trou devant l'école")
+    make_signalement(titre="Lampadaire", description="Trou, trou et encore trou dans la chaussée")
+    # Accents et pluriels ignorés, termes limités à leur champ
+    assert _titles(client.get("/signalements/search?description=ecoles")) == {"Trou"}
+    assert _titles(client.get("/signalements/search?titre=trou")) == {"Trou"}
+    ranked = client.get("/signalements/search?description=trou").json()
+    assert [row["titre"] for row in ranked] == ["Lampadaire", "Trou"]
+    combined = client.get("/signalements/search?q=chaussee&titre=lamp&ville=casa").json()
+    assert [row["titre"] for row in combined] == ["Lampadaire"]
+
+
+def test_field_criteria_fall_back_to_sql_with_archives(client, make_signalement):
+    make_signalement(titre="Trou dans la chaussée")
+    response = client.get("/signalements/search?titre=chaussée&include_archived=true")
+    assert _titles(response) == {"Trou dans la chaussée"}
+
+
+def test_free_text_uses_index_with_stemming(client, make_signalement):
+    make_signalement(titre="Trous dans la chaussée")
+    make_signalement(titre="Lampadaire en panne", description="Éclairage public éteint")
+    assert _titles(client.get("/signalements/search?q=trou")) == {"Trous dans la chaussée"}
+    assert _titles(client.get("/signalements/search?q=eclairage")) == {"Lampadaire en panne"}
+
+
+def test_free_text_combined_with_exact_filter(client, make_signalement):
+    make_signalement(titre="Trou rue A", status="nouveau")
+    make_signalement(titre="Trou rue B", status="en_cours")
+    assert _titles(client.get("/signalements/search?q=trou&status=en_cours")) == {"Trou rue B"}
+
+
+def test_refresh_picks_up_writes_from_other_workers(client, db, make_signalement):
+    kept = make_signalement(titre="Trou ancien")
+    removed = make_signalement(titre="Trou supprimé")
+    since = refresh_indexes(db, None)
+    assert since is not None
+
+    # Écritures d'un autre processus : la base change, pas les index de celui-ci
+    db.execute(text("DELETE FROM signalements WHERE id = :id"), {"id": removed["id"]})
+    db.execute(text(
+        "INSERT INTO signalements (citizen_id, titre, localisation, ville, description, categorie, gravite, "
+        "status, latitude, longitude) VALUES (:citizen, 'Égout bouché', 'Rue X', 'Rabat', 'Odeurs', 'admin', "
+        "'mineur', 'nouveau', 34.02, -6.84)"
+    ), {"citizen": kept["citizen_id"]})
+    db.commit()
+    assert len(search_index) == 2
+
+    refresh_indexes(db, since)
+    assert _titles(client.get("/signalements/search?q=egout")) == {"Égout bouché"}
+    assert _titles(client.get("/signalements/search?q=trou")) == {"Trou ancien"}
+    nearby = client.get("/signalements/nearby?lat=34.02&lon=-6.84&radius=100")
+    assert [row["titre"] for row in nearby.json()] == ["Égout bouché"]
+
+
+def test_refresh_without_changes_keeps_watermark(db, make_signalement):
+    make_signalement()
+    since = refresh_indexes(db, None)
+    assert refresh_indexes(db, since) == since
+    assert refresh_indexes(db, since + timedelta(days=1)) == since
+    assert isinstance(since, datetime)
@@ -0,0 +1,98 @@
+import json
+import logging
+import queue
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.database import engine as app_engine
+from app.core.logging_config import DroppingQueueHandler, JsonFormatter, instrument_sql_logging, log_event
+
+
+@pytest.fixture
+def sql_records(caplog):
+    caplog.set_level(logging.INFO, logger="app.sql")
+    return caplog
+
+
+def _instrumented_engine(monkeypatch, **overrides):
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    engine = create_engine(app_engine.url)
+    instrument_sql_logging(engine, "test")
+    return engine
+
+
+def test_sampled_statements_are_logged_with_fields(monkeypatch, sql_records):
+    engine = _instrumented_engine(monkeypatch, SQL_LOG_SAMPLE_RATE=1.0, SQL_SLOW_QUERY_MS=60000)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    record = next(r for r in sql_records.records if r.getMessage() == "sql")
+    assert record.fields["engine"] == "test"
+    assert record.fields["statement"] == "SELECT 1"
+    assert record.fields["duration_ms"] >= 0
+
+
+def test_unsampled_fast_statements_are_not_logged(monkeypatch, sql_records):
+    engine = _instrumented_engine(monkeypatch, SQL_LOG_SAMPLE_RATE=0.0, SQL_SLOW_QUERY_MS=60000)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert not [r for r in sql_records.records if r.name == "app.sql"]
+
+
+def test_slow_select_is_logged_with_its_plan(monkeypatch, sql_records):
+    engine = _instrumented_engine(monkeypatch, SQL_LOG_SAMPLE_RATE=0.0, SQL_SLOW_QUERY_MS=0,
+                                  SQL_EXPLAIN_INTERVAL=0)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT id FROM signalements WHERE status = 'nouveau'"))
+    deadline = time.monotonic() + 5
+    slow = []
+    while not slow and time.monotonic() < deadline:
+        slow = [r for r in sql_records.records if r.getMessage() == "slow query"]
+        time.sleep(0.05)
+    assert slow, "requête lente non journalisée"
+    assert "plan" in slow[0].fields
+
+
+def test_replica_queries_are_explained_on_the_replica(monkeypatch, sql_records, tmp_path):
+    for name, value in {"SQL_LOG_SAMPLE_RATE": 0.0, "SQL_SLOW_QUERY_MS": 0, "SQL_EXPLAIN_INTERVAL": 0}.items():
+        monkeypatch.setattr(settings, name, value)
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    with replica.begin() as conn:
+        conn.execute(text("CREATE TABLE seulement_ici (id INTEGER PRIMARY KEY)"))
+    instrument_sql_logging(replica, "replica-test", explain_engine=replica)
+
+    with replica.connect() as conn:
+        conn.execute(text("SELECT id FROM seulement_ici"))
+    deadline = time.monotonic() + 5
+    slow = []
+    while not slow and time.monotonic() < deadline:
+        slow = [r for r in sql_records.records
+                if r.getMessage() == "slow query" and r.fields["engine"] == "replica-test"]
+        time.sleep(0.05)
+    assert slow, "requête lente non journalisée"
+    assert "plan_error" not in slow[0].fields
+    assert "seulement_ici" in slow[0].fields["plan"]
+
+
+def test_json_formatter_merges_structured_fields():
+    logger = logging.getLogger("test.json")
+    record = logger.makeRecord("test.json", logging.INFO, __file__, 1, "login failed", (), None,
+                               extra={"fields": {"email": "a@example.com"}})
+    data = json.loads(JsonFormatter().format(record))
+    assert (data["message"], data["level"], data["email"]) == ("login failed", "INFO", "a@example.com")
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    logger = logging.getLogger("test.dropping")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        for _ in range(3):
+            log_event(logger, "event", logging.WARNING)
+    finally:
+        logger.removeHandler(handler)
+    assert handler.dropped == 2
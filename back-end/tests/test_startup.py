@@ -0,0 +1,27 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.database import engine, prewarm_async_pools, prewarm_pools
+from app.core.init_db import ensure_schema
+from app.core.startup import startup_report
+
+
+def test_schema_check_is_a_noop_at_head(client):
+    # Le démarrage du client a déjà migré la base de test
+    assert ensure_schema() is False
+
+
+def test_startup_report_times_each_phase(client):
+    report = startup_report()
+    assert {"schema", "search_index", "spatial_index", "duplicate_index", "schemas"} <= set(report["phases_ms"])
+    assert report["total_ms"] >= max(report["phases_ms"].values())
+
+
+def test_prewarm_opens_configured_connections(client, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_PREWARM", 2)
+    assert prewarm_pools() == 2
+    assert engine.pool.checkedin() >= 2
+    assert asyncio.run(prewarm_async_pools()) == 2
+
+    monkeypatch.setattr(settings, "DB_POOL_PREWARM", 0)
+    assert prewarm_pools() == 0
@@ -0,0 +1,41 @@
+from sqlalchemy import text
+
+from app.core.signalement_stats import signalement_stats
+from tests.conftest import update_payload
+
+
+def _stats(client):
+    response = client.get("/signalements/stats")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_counters_follow_writes(client, make_signalement):
+    first = make_signalement(status="nouveau", ville="Casablanca")
+    make_signalement(status="nouveau", ville="Rabat", gravite="urgent")
+    stats = _stats(client)
+    assert stats["total"] == 2
+    assert stats["status"] == {"nouveau": 2}
+    assert stats["ville"] == {"Casablanca": 1, "Rabat": 1}
+    assert stats["gravite"] == {"mineur": 1, "urgent": 1}
+
+    client.put(f"/signalements/{first['id']}", json=update_payload(first, status="en_cours"))
+    assert _stats(client)["status"] == {"nouveau": 1, "en_cours": 1}
+
+    client.delete(f"/signalements/{first['id']}")
+    stats = _stats(client)
+    assert stats["total"] == 1
+    assert stats["ville"] == {"Rabat": 1}
+
+
+def test_reconcile_corrects_out_of_band_writes(client, db, make_signalement):
+    make_signalement(status="nouveau")
+    db.execute(text("UPDATE signalements SET status = 'résolu'"))
+    db.commit()
+    assert _stats(client)["status"] == {"nouveau": 1}
+
+    assert signalement_stats.reconcile(db) is True
+    assert signalement_stats.last_drift == 2
+    stats = _stats(client)
+    assert stats["status"] == {"résolu": 1}
+    assert stats["reconciled_at"] is not None
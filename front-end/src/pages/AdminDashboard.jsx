@@ -5,6 +5,7 @@ const AdminDashboard = () => {
   const [activeTab, setActiveTab] = useState('signalements');
   const [signalements, setSignalements] = useState([]);
   const [citizens, setCitizens] = useState([]);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
   const [filterStatus, setFilterStatus] = useState('');
@@ -17,6 +18,8 @@ const AdminDashboard = () => {
 
   // API Base URL
   const API_BASE = 'http://127.0.0.1:8000';
+  // Taille maximale d'une page de /signalements/
+  const PAGE_SIZE = 500;
 
   // Fetch data based on active tab
   useEffect(() => {
@@ -28,10 +31,21 @@ const AdminDashboard = () => {
     setError(null);
     try {
       if (activeTab === 'signalements') {
-        const response = await fetch(`${API_BASE}/signalements/`);
-        if (!response.ok) throw new Error('Erreur lors du chargement des signalements');
-        const data = await response.json();
+        // Liste paginée par curseur : les pages sont suivies jusqu'à la dernière
+        const data = [];
+        let cursor = null;
+        do {
+          const params = new URLSearchParams({ limit: PAGE_SIZE });
+          if (cursor) params.set('cursor', cursor);
+          const response = await fetch(`${API_BASE}/signalements/?${params}`);
+          if (!response.ok) throw new Error('Erreur lors du chargement des signalements');
+          data.push(...(await response.json()));
+          cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
         setSignalements(data);
+        // Compteurs calculés côté serveur (la liste est paginée)
+        const statsResponse = await fetch(`${API_BASE}/signalements/stats`);
+        if (statsResponse.ok) setStats(await statsResponse.json());
       } else {
         const response = await fetch(`${API_BASE}/citizens/`);
         if (!response.ok) throw new Error('Erreur lors du chargement des citoyens');
@@ -209,7 +223,7 @@ const AdminDashboard = () => {
             </svg>
             <div className="ml-4">
               <p className="text-sm font-medium text-gray-600">Total Signalements</p>
-              <p className="text-2xl font-bold text-gray-900">{signalements.length}</p>
+              <p className="text-2xl font-bold text-gray-900">{stats ? stats.total : signalements.length}</p>
             </div>
           </div>
         </div>
@@ -232,7 +246,9 @@ const AdminDashboard = () => {
             <div className="ml-4">
               <p className="text-sm font-medium text-gray-600">En Cours</p>
               <p className="text-2xl font-bold text-gray-900">
-                {signalements.filter((s) => s.status === 'en_cours').length}
+                {stats
+                  ? stats.status.en_cours || 0
+                  : signalements.filter((s) => s.status === 'en_cours').length}
               </p>
             </div>
           </div>
@@ -245,7 +261,9 @@ const AdminDashboard = () => {
             <div className="ml-4">
               <p className="text-sm font-medium text-gray-600">Critiques</p>
               <p className="text-2xl font-bold text-gray-900">
-                {signalements.filter((s) => s.gravite === 'critique').length}
+                {stats
+                  ? stats.gravite.critique || 0
+                  : signalements.filter((s) => s.gravite === 'critique').length}
               </p>
             </div>
           </div>
@@ -33,6 +33,8 @@ const CitizenDashboard = () => {
   // API base URLs
   const API_BASE = "http://127.0.0.1:8000";
   const SIGNALEMENT_API = `${API_BASE}/signalements`;
+  // Taille maximale d'une page de /signalements/search
+  const PAGE_SIZE = 500;
   const CITIZEN_API = `${API_BASE}/citizens`;
 
   // Mock data for fallback
@@ -119,23 +121,28 @@ const CitizenDashboard = () => {
     setLoading(true);
     try {
       const token = localStorage.getItem("token");
-      const response = await fetch(`${SIGNALEMENT_API}/`, {
-        headers: {
-          Authorization: `Bearer ${token}`,
-          "Content-Type": "application/json",
-          Accept: "application/json",
-        },
-      });
-      if (!response.ok) {
-        if (response.status === 401) {
-          navigate("/login");
-          return;
+      // Signalements du citoyen filtrés côté serveur, page par page (la liste générale est paginée)
+      const userSignalements = [];
+      for (let skip = 0; ; skip += PAGE_SIZE) {
+        const params = new URLSearchParams({ citizen_id: userId, skip, limit: PAGE_SIZE });
+        const response = await fetch(`${SIGNALEMENT_API}/search?${params}`, {
+          headers: {
+            Authorization: `Bearer ${token}`,
+            "Content-Type": "application/json",
+            Accept: "application/json",
+          },
+        });
+        if (!response.ok) {
+          if (response.status === 401) {
+            navigate("/login");
+            return;
+          }
+          throw new Error("Failed to fetch signalements");
         }
-        throw new Error("Failed to fetch signalements");
+        const page = await response.json();
+        userSignalements.push(...page);
+        if (page.length < PAGE_SIZE) break;
       }
-      const data = await response.json();
-      // Filter signalements to show only those where citizen_id matches userId
-      const userSignalements = data.filter((signalement) => signalement.citizen_id === userId);
       setSignalements(userSignalements);
     } catch (error) {
       console.error("Erreur lors du chargement des signalements:", error);